@@ -0,0 +1,88 @@
+import os
+
+import click
+
+from benchmarks.runner import (DEFAULT_ROUNDS,
+                               DEFAULT_THRESHOLD,
+                               Results,
+                               compare,
+                               comparison_table,
+                               environment_mismatch,
+                               format_time,
+                               run_benchmarks)
+from benchmarks.suite import create_benchmarks, workspace
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def parse_thresholds(values):
+    thresholds = {}
+    for value in values:
+        name, _, threshold = value.partition("=")
+        try:
+            thresholds[name] = float(threshold)
+        except ValueError:
+            raise click.BadParameter(f"Expected NAME=THRESHOLD, got {value}", param_hint="--limit")
+    return thresholds
+
+
+@click.command(help="Runs the benchmark suite, NAMES select benchmarks [Default: all]")
+@click.option("--rounds", 'rounds', default=DEFAULT_ROUNDS, type=click.IntRange(min=1),
+              help="Timed rounds of every benchmark")
+@click.option("--output", 'output', default=None, type=click.Path(dir_okay=False),
+              help="Write results as JSON")
+@click.option("--baseline", 'baseline', default=DEFAULT_BASELINE, type=click.Path(dir_okay=False),
+              help="Stored results to compare with")
+@click.option("--save-baseline", 'save_baseline', is_flag=True, default=False,
+              help="Store the results as the new baseline")
+@click.option("--threshold", 'threshold', default=DEFAULT_THRESHOLD, type=click.FloatRange(min=0),
+              help="Relative slowdown of the median time that fails the run, 0.25 = 25% slower")
+@click.option("--limit", 'limits', multiple=True, metavar="NAME=THRESHOLD",
+              help="Threshold of a single benchmark, can be repeated")
+@click.option("--list", 'list_only', is_flag=True, default=False, help="List benchmarks and exit")
+@click.argument('names', nargs=-1)
+def main(rounds, output, baseline, save_baseline, threshold, limits, list_only, names):
+    limits = parse_thresholds(limits)
+    with workspace() as root:
+        benchmarks = create_benchmarks(root)
+        unknown = set(names) - {benchmark.name for benchmark in benchmarks}
+        if unknown:
+            raise click.BadParameter(f"Unknown benchmarks: {', '.join(sorted(unknown))}", param_hint="NAMES")
+        if list_only:
+            listed = [f"{benchmark.name:<20} {benchmark.description}" for benchmark in benchmarks]
+        elif names:
+            benchmarks = [benchmark for benchmark in benchmarks if benchmark.name in names]
+
+        def progress(name, measurement):
+            click.echo(f"{name:<20} {format_time(measurement.median):>9}", err=True)
+
+        # Measured functions print into the discarded stdout of the workspace, progress goes to stderr
+        results = None if list_only else run_benchmarks(benchmarks, rounds=rounds, progress=progress)
+
+    if list_only:
+        click.echo("\n".join(listed))
+        return
+
+    thresholds = {benchmark.name: benchmark.threshold for benchmark in benchmarks if benchmark.threshold is not None}
+    thresholds.update(limits)
+    stored = Results.load(baseline) if os.path.isfile(baseline) and not save_baseline else None
+    if stored:
+        mismatch = environment_mismatch(results, stored)
+        if mismatch:
+            click.secho(mismatch, fg="yellow", err=True)
+    comparisons = compare(results, stored, thresholds, default_threshold=threshold)
+    click.echo(comparison_table(comparisons))
+
+    if output:
+        results.save(output)
+    if save_baseline:
+        results.save(baseline)
+        click.secho(f"Baseline saved: {baseline}", fg="green", err=True)
+    regressions = [item.name for item in comparisons if item.regressed]
+    if regressions:
+        click.secho(f"Regressed: {', '.join(regressions)}", fg="red", err=True)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main(prog_name="python -m benchmarks")
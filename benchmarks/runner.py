@@ -0,0 +1,192 @@
+import json
+import platform
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+RESULTS_VERSION = 1
+# Relative slowdown of the median time that is reported as a regression, 0.25 = 25% slower
+DEFAULT_THRESHOLD = 0.25
+# Timed rounds of every benchmark, the first round is a warmup and is not recorded
+DEFAULT_ROUNDS = 7
+
+
+@dataclass
+class Benchmark:
+    """
+    Benchmark of a hot path
+    :arg
+        name: Benchmark name, key of the results
+        func: Measured function, called with the return value of `setup`
+        setup: Called before every call of func and not timed, I.E creating a fresh directory
+        number: Calls of func per round
+        threshold: Regression threshold of the benchmark, overrides the default threshold
+        description: Short description
+    """
+    name: str
+    func: Callable[..., Any]
+    setup: Optional[Callable[[], Any]] = None
+    number: int = 1
+    threshold: Optional[float] = None
+    description: str = ""
+
+    def run_round(self) -> float:
+        """Runs a round, Returns seconds per call"""
+        total = 0.0
+        if self.setup is None:
+            start = time.perf_counter()
+            for _ in range(self.number):
+                self.func()
+            total = time.perf_counter() - start
+        else:
+            for _ in range(self.number):
+                argument = self.setup()
+                start = time.perf_counter()
+                self.func(argument)
+                total += time.perf_counter() - start
+        return total / self.number
+
+
+@dataclass
+class Measurement:
+    """Timing of a benchmark, seconds per call"""
+    median: float
+    min: float
+    mean: float
+    stdev: float
+    rounds: int
+    number: int
+
+    @classmethod
+    def from_times(cls, times: List[float], number: int) -> "Measurement":
+        return cls(median=statistics.median(times), min=min(times), mean=statistics.mean(times),
+                   stdev=statistics.stdev(times) if len(times) > 1 else 0.0, rounds=len(times), number=number)
+
+
+@dataclass
+class Comparison:
+    """Measurement compared to the baseline, change is the relative change of the median time"""
+    name: str
+    current: Measurement
+    baseline: Optional[Measurement] = None
+    threshold: float = DEFAULT_THRESHOLD
+
+    @property
+    def change(self) -> Optional[float]:
+        if self.baseline is None or not self.baseline.median:
+            return None
+        return self.current.median / self.baseline.median - 1
+
+    @property
+    def regressed(self) -> bool:
+        return self.change is not None and self.change > self.threshold
+
+    @property
+    def status(self) -> str:
+        if self.change is None:
+            return "new"
+        if self.regressed:
+            return "REGRESSED"
+        if self.change < -self.threshold:
+            return "improved"
+        return "ok"
+
+
+@dataclass
+class Results:
+    """Results of a benchmark run, stored as JSON"""
+    benchmarks: Dict[str, Measurement] = field(default_factory=dict)
+    python: str = platform.python_version()
+    implementation: str = platform.python_implementation()
+    system: str = platform.platform()
+    created: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict:
+        return {
+            "version": RESULTS_VERSION,
+            "python": self.python,
+            "implementation": self.implementation,
+            "system": self.system,
+            "created": self.created,
+            "benchmarks": {name: vars(measurement) for name, measurement in self.benchmarks.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Results":
+        if data.get("version") != RESULTS_VERSION:
+            raise ValueError(f"Unsupported benchmark results version: {data.get('version')}")
+        return cls(benchmarks={name: Measurement(**values) for name, values in data["benchmarks"].items()},
+                   python=data.get("python", ""), implementation=data.get("implementation", ""),
+                   system=data.get("system", ""), created=data.get("created", 0.0))
+
+    def save(self, location: str) -> None:
+        with open(location, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+            file.write("\n")
+
+    @classmethod
+    def load(cls, location: str) -> "Results":
+        with open(location, "r") as file:
+            return cls.from_dict(json.load(file))
+
+
+def measure(benchmark: Benchmark, rounds: int = DEFAULT_ROUNDS) -> Measurement:
+    """Times a benchmark, the warmup round fills caches I.E compiled templates and is not recorded"""
+    benchmark.run_round()
+    return Measurement.from_times([benchmark.run_round() for _ in range(rounds)], benchmark.number)
+
+
+def run_benchmarks(benchmarks: List[Benchmark], rounds: int = DEFAULT_ROUNDS,
+                   progress: Optional[Callable[[str, Measurement], None]] = None) -> Results:
+    """Runs benchmarks in order, progress is called after each benchmark"""
+    results = Results()
+    for benchmark in benchmarks:
+        results.benchmarks[benchmark.name] = measure(benchmark, rounds)
+        if progress:
+            progress(benchmark.name, results.benchmarks[benchmark.name])
+    return results
+
+
+def compare(results: Results, baseline: Optional[Results], thresholds: Dict[str, float],
+            default_threshold: float = DEFAULT_THRESHOLD) -> List[Comparison]:
+    """
+    Compares results with the baseline
+    :param results: Current results
+    :param baseline: Stored results, benchmarks that are not in the baseline are new
+    :param thresholds: Regression threshold per benchmark
+    :param default_threshold: Threshold of benchmarks without their own threshold
+    :return: List[Comparison]
+    """
+    return [Comparison(name=name, current=measurement,
+                       baseline=baseline.benchmarks.get(name) if baseline else None,
+                       threshold=thresholds.get(name, default_threshold))
+            for name, measurement in results.benchmarks.items()]
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def comparison_table(comparisons: List[Comparison]) -> str:
+    """Table of median times against the baseline"""
+    width = max([len(item.name) for item in comparisons] + [9])
+    lines = [f"{'Benchmark':<{width}}  {'Median':>9}  {'Min':>9}  {'Baseline':>9}  {'Change':>8}  Status"]
+    for item in comparisons:
+        baseline = format_time(item.baseline.median) if item.baseline else "-"
+        change = f"{item.change:+.1%}" if item.change is not None else "-"
+        lines.append(f"{item.name:<{width}}  {format_time(item.current.median):>9}  "
+                     f"{format_time(item.current.min):>9}  {baseline:>9}  {change:>8}  {item.status}")
+    return "\n".join(lines)
+
+
+def environment_mismatch(results: Results, baseline: Results) -> Optional[str]:
+    """Describes the difference of Python versions, timings of different interpreters are not comparable"""
+    if (results.implementation, results.python) != (baseline.implementation, baseline.python):
+        return (f"Baseline was recorded with {baseline.implementation} {baseline.python}, "
+                f"current run uses {results.implementation} {results.python}")
+    return None
+
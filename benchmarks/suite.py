@@ -0,0 +1,112 @@
+import contextlib
+import io
+import itertools
+import os
+import tempfile
+from typing import Iterator, List
+from unittest import mock
+
+from benchmarks.runner import Benchmark
+from django_cli.cli import cli
+from django_cli.const import CONFIG_CACHE_ENV, CONFIG_FILE_NAME
+from django_cli.core.yaml_file import dump
+from django_cli.setup_project.handler import ProjectInitializer, create_state
+from django_cli.setup_project.model import SetupProjectState
+
+# Project config of the benchmarks, libraries with linked files, a database and a cache
+CONFIG = {
+    "name": "Benchmark Project",
+    "author": "django-cli",
+    "description": "Benchmark",
+    "libraries": ["djangorestframework", "celery", "django-channels", "whitenoise", "django-filter"],
+    "database": {"engine": "postgresql", "name": "benchmark", "user": "user", "password": "password",
+                 "host": "localhost", "port": "5432"},
+    "cache": {"backend": "redis", "location": "redis://localhost:6379"},
+    "env": {"SECRET_KEY": "benchmark"},
+}
+
+
+@contextlib.contextmanager
+def workspace() -> Iterator[str]:
+    """
+    Temporary working directory of the benchmarks,
+    Library installation is stubbed out, config cache is disabled and messages of the measured functions are discarded
+    """
+    cwd = os.getcwd()
+    cache = os.environ.get(CONFIG_CACHE_ENV)
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        # Benchmarks that parse config files select their cache, nothing is written into the cache of the user
+        os.environ[CONFIG_CACHE_ENV] = ""
+        try:
+            with mock.patch.object(SetupProjectState, "install_libraries", return_value=True), \
+                    mock.patch.object(SetupProjectState, "get_project_requirements", return_value=[]), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                yield directory
+        finally:
+            os.chdir(cwd)
+            if cache is None:
+                os.environ.pop(CONFIG_CACHE_ENV, None)
+            else:
+                os.environ[CONFIG_CACHE_ENV] = cache
+
+
+def create_benchmarks(root: str) -> List[Benchmark]:
+    """
+    Benchmarks of the generator hot paths, files are written under root
+    :param root: Working directory of the benchmarks, See `workspace`
+    :return: List[Benchmark]
+    """
+    fixture = os.path.join(root, "fixture")
+    os.makedirs(fixture)
+    config_file = os.path.join(fixture, CONFIG_FILE_NAME)
+    with open(config_file, "w") as file:
+        file.write(dump(CONFIG))
+    config_cache = os.path.join(root, "config-cache")
+    state = create_state(CONFIG)
+    settings = next(file for file in state.get_project_files() if file["name"] == "settings")
+    counter = itertools.count()
+
+    def uncached():
+        os.environ[CONFIG_CACHE_ENV] = ""
+        return config_file
+
+    def cached():
+        os.environ[CONFIG_CACHE_ENV] = config_cache
+        return config_file
+
+    def project_directory():
+        # startproject needs an empty directory with the config file
+        directory = os.path.join(root, "projects", str(next(counter)))
+        os.makedirs(directory)
+        with open(os.path.join(directory, CONFIG_FILE_NAME), "w") as file:
+            file.write(dump(CONFIG))
+        os.environ[CONFIG_CACHE_ENV] = ""
+        return directory
+
+    def start_project(directory):
+        os.chdir(directory)
+        try:
+            cli.main(["startproject"], prog_name="django-cli", standalone_mode=False)
+        finally:
+            os.chdir(root)
+
+    return [
+        Benchmark("yaml_parse", ProjectInitializer.get_yaml_config, setup=uncached, number=50,
+                  description="get_yaml_config, config cache disabled"),
+        Benchmark("yaml_parse_cached", ProjectInitializer.get_yaml_config, setup=cached, number=50,
+                  description="get_yaml_config, parsed config cache hit"),
+        Benchmark("yaml_dump", state.create_setup_yaml, number=50,
+                  description="create_setup_yaml, setup.yaml data and dump"),
+        Benchmark("render_template", lambda: state.set_py_from_template("settings.template", "settings.py",
+                                                                        data=settings["data"]),
+                  number=200, description="set_py_from_template of settings.py"),
+        Benchmark("render_python_files", state.render_python_files, number=50,
+                  description="Every python file rendered in memory"),
+        Benchmark("create_python_file", state.create_python_file, number=20,
+                  description="create_python_file, rendered and written"),
+        Benchmark("create_data_set", lambda: ProjectInitializer().create_data_set(CONFIG), number=50,
+                  description="create_data_set, config data into project state"),
+        Benchmark("startproject", start_project, setup=project_directory, number=3, threshold=0.5,
+                  description="End to end startproject with the installer stubbed out"),
+    ]
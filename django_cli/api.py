@@ -0,0 +1,53 @@
+"""
+Python API for in-process project generation
+
+Functions of this module have no side effects, they do not read or write the working directory,
+do not prompt or print and keep no state between calls, so they can be called from many threads.
+`$VAR` values of the config are read from the process environment.
+"""
+import io
+from typing import Dict, Mapping
+
+from django_cli.const import MANIFEST_FILE
+from django_cli.core.filemap import write_archive
+from django_cli.core.manifest import manifest_bytes
+from django_cli.setup_project.handler import create_state, ConfigError
+from django_cli.setup_project.model import SetupProjectState
+
+__all__ = ["generate", "generate_archive", "build_state", "ConfigError"]
+
+
+def build_state(config: Mapping) -> SetupProjectState:
+    """
+    Creates project state from config, config is not modified
+    :param config: Same structure as setup.yaml
+    :raises ConfigError: If config is invalid
+    """
+    return create_state({str(k).lower(): v for k, v in config.items()}, strict=True)
+
+
+def generate(config: Mapping, setup_files: bool = True) -> Dict[str, bytes]:
+    """
+    Renders project of the config
+    :param config: Same structure as setup.yaml
+    :param setup_files: Include setup.yaml and .env files
+    :raises ConfigError: If config is invalid
+    :return: Relative path -> content, directories end with `/` and have empty content
+    """
+    state = build_state(config)
+    files = state.render_project(setup_files=setup_files)
+    files[MANIFEST_FILE] = manifest_bytes(state.get_manifest(files, setup_files=setup_files))
+    return files
+
+
+def generate_archive(config: Mapping, archive: str = "gz") -> bytes:
+    """
+    Renders project of the config into an archive
+    :param config: Same structure as setup.yaml
+    :param archive: `zip` or tar compression [`gz`, `bz2`, `xz`, ``]
+    :raises ConfigError: If config is invalid
+    :return: Archive content
+    """
+    stream = io.BytesIO()
+    write_archive(generate(config), stream, archive)
+    return stream.getvalue()
@@ -1,19 +1,73 @@
+"""
+Command line entry point,
+Only click and constants are imported at module level so `--help` and shell completion stay fast,
+commands import the modules they need when they run
+"""
+import os
+
 import click
-from dotenv import load_dotenv
 
-from django_cli.const import DEFAULT_ENV_FILE
-from django_cli.setup_project.handler import ProjectInitializer
-import os
+from django_cli.const import (DEFAULT_ENV_FILE,
+                              DEFAULT_WHEELHOUSE,
+                              DEFAULT_SOCKET,
+                              CONFIG_FILE_NAME,
+                              YAML_PARSE_ERROR_MSG,
+                              FILE_EXIST_ERROR,
+                              LOG_SUCCESS_PROJECT_COMPLETE,
+                              LOG_SUCCESS_PROJECT_ARCHIVED)
 
-from django_cli.utils import error
+# Same as `django_cli.core.filemap.STDOUT_ARCHIVE`
+STDOUT_ARCHIVE = "-"
 
 
 @click.group()
-def cli():
+@click.option("--profile", 'profile', is_flag=True, default=False,
+              help="Print a timing table of steps, hooks and subprocesses to stderr")
+@click.option("--profile-trace", 'trace', default=None, type=click.Path(dir_okay=False),
+              help="Write a Chrome trace event JSON file, implies --profile")
+@click.option("--profile-stats", 'stats', default=None, type=click.Path(dir_okay=False),
+              help="Write cProfile stats of the main and step threads, implies --profile")
+@click.option("--output", 'output', default="text", type=click.Choice(["text", "jsonl"]),
+              help="Output Format, `jsonl` writes one JSON event per line to stdout, terminal output goes to stderr")
+@click.pass_context
+def cli(ctx, profile, trace, stats, output):
     """Django Cli"""
+    if output == "jsonl":
+        import time
+        from django_cli.core.events import start_events, stop_events, emit
+
+        start = time.perf_counter()
+        start_events(click.get_text_stream("stdout"))
+        emit("command_start", command=ctx.invoked_subcommand)
+
+        def finish_events():
+            emit("command_end", command=ctx.invoked_subcommand, seconds=round(time.perf_counter() - start, 6))
+            stop_events()
+
+        ctx.call_on_close(finish_events)
+    if profile or trace or stats:
+        from django_cli.core.profiler import start_profiling
+
+        start_profiling(stats=bool(stats))
+        ctx.call_on_close(lambda: finish_profiling(ctx.invoked_subcommand or "django-cli", trace, stats))
+
+
+def finish_profiling(command, trace, stats):
+    """Prints timing table and writes trace and cProfile files of the profiled command"""
+    from django_cli.core.profiler import stop_profiling
+
+    profiler = stop_profiling(command)
+    click.echo(profiler.table(), err=True)
+    if trace:
+        profiler.write_trace(trace)
+    if stats:
+        profiler.dump_stats(stats)
 
 
 def load_cli_env(env):
+    from dotenv import load_dotenv
+    from django_cli.utils import error
+
     try:
         load_dotenv(dotenv_path=f"{os.getcwd()}/{env}")
     except FileNotFoundError:
@@ -21,25 +75,228 @@ def load_cli_env(env):
             error("Invalid env file")
 
 
+def load_project_env():
+    """Loads .env of the project, `$` values of setup.yaml are read from it, variables that are set are kept"""
+    from dotenv import load_dotenv
+    from django_cli.setup_project.model import ENV_FILE
+
+    location = os.path.join(os.getcwd(), ENV_FILE)
+    if os.path.isfile(location):
+        load_dotenv(dotenv_path=location)
+
+
+def echo_report(event, report):
+    """Prints a JSON report, with `--output jsonl` the report is a single event of the stream"""
+    import json
+    from django_cli.core.events import events_enabled, emit
+
+    if events_enabled():
+        emit(event, **report)
+    else:
+        click.echo(json.dumps(report, indent=2))
+
+
 @cli.command('generate', help="Generates YAML File")
 @click.option("--env", 'env', default=DEFAULT_ENV_FILE, help="Target Environment File")
 @click.argument('name', required=False)
 def make_generate(name, env):
+    from django_cli.setup_project.handler import ProjectInitializer
+
     load_cli_env(env)
     ProjectInitializer(project_name=name).generate()
 
 
+def validate_archive(ctx, param, value):
+    from django_cli.core.filemap import archive_format
+
+    if value:
+        try:
+            archive_format(value)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+    return value
+
+
+def wheelhouse_options(func):
+    """Wheelhouse install options shared by commands that install libraries"""
+    func = click.option("--offline", 'offline', is_flag=True, default=False,
+                        help="Install only from the wheelhouse, fails if a wheel is missing")(func)
+    func = click.option("--wheelhouse", 'wheelhouse', default=None,
+                        help=f"Wheelhouse Directory [Default: {DEFAULT_WHEELHOUSE}]")(func)
+    return func
+
+
 @cli.command('startproject', help="Starts Django Project")
 @click.option("--env", 'env', default=DEFAULT_ENV_FILE, help="Target Environment File")
+@click.option("--update", 'update', is_flag=True, default=False,
+              help="Regenerate existing project, only files whose output changed are written")
+@click.option("--force", 'force', is_flag=True, default=False,
+              help="Overwrite files that were edited by hand when updating")
+@click.option("--resume", 'resume', is_flag=True, default=False,
+              help="Continue an interrupted run, completed steps whose inputs did not change are skipped")
+@click.option("--archive", 'archive', default=None, callback=validate_archive,
+              help="Stream project into an archive [.tar.gz, .zip, ...] instead of the working directory, "
+                   "`-` writes a tar.gz to stdout")
+@wheelhouse_options
 @click.argument('name', required=False)
-def start_project(name, env):
+def start_project(name, env, update, force, resume, archive, wheelhouse, offline):
+    from django_cli.core.events import events_enabled
+    from django_cli.setup_project.handler import ProjectInitializer
+    from django_cli.utils import log_to_stderr
+
+    if archive == STDOUT_ARCHIVE and events_enabled():
+        raise click.UsageError("--archive - can not be used with --output jsonl, stdout carries the events")
+    if archive and update:
+        raise click.UsageError("--archive can not be used with --update")
+    if resume and (archive or update):
+        raise click.UsageError("--resume can not be used with --archive or --update")
+    log_to_stderr(archive == STDOUT_ARCHIVE)
+    load_cli_env(env)
+    load_project_env()
+    ProjectInitializer(project_name=name).start_project(update=update, force=force, archive=archive, resume=resume,
+                                                        wheelhouse=wheelhouse, offline=offline)
+
+
+@cli.command('batch', help="Generates projects from a multi document YAML file or a directory of specs")
+@click.option("--env", 'env', default=DEFAULT_ENV_FILE, help="Target Environment File")
+@click.option("--out", 'out', default=".", type=click.Path(file_okay=False),
+              help="Output Directory, each project is created in its own directory")
+@click.option("--workers", 'workers', default=None, type=int, help="Number of worker processes [Default: CPU count]")
+@click.argument('spec', type=click.Path(exists=True))
+@click.pass_context
+def batch(ctx, spec, env, out, workers):
+    from django_cli.setup_project.batch import run_batch, load_specs, log_batch_summary
+
+    load_cli_env(env)
+    os.makedirs(out, exist_ok=True)
+    results = run_batch(load_specs(spec), out, workers=workers)
+    log_batch_summary(results)
+    if not all(result.ok for result in results):
+        ctx.exit(1)
+
+
+@cli.command('validate', help="Validates setup.yaml specs, directories are searched recursively")
+@click.option("--workers", 'workers', default=None, type=int, help="Number of worker processes [Default: CPU count]")
+@click.option("--format", 'output_format', default="text", type=click.Choice(["text", "json"]),
+              help="Output Format, `json` writes a machine readable report to stdout")
+@click.option("--strict", 'strict', is_flag=True, default=False, help="Warnings fail validation")
+@click.argument('paths', nargs=-1, type=click.Path(exists=True))
+@click.pass_context
+def validate(ctx, paths, workers, output_format, strict):
+    from django_cli.setup_project.validate import validate_paths, validation_report, log_validation_summary
+
+    results = validate_paths(paths or [CONFIG_FILE_NAME], workers=workers)
+    report = validation_report(results, strict=strict)
+    if output_format == "json":
+        echo_report("validation_report", report)
+    else:
+        log_validation_summary(results)
+    if not report["ok"]:
+        ctx.exit(1)
+
+
+@cli.command('bench-project', help="Measures cold start of the project of a setup.yaml, database is replaced "
+                                    "with sqlite and cache with local memory")
+@click.option("--env", 'env', default=DEFAULT_ENV_FILE, help="Target Environment File")
+@click.option("--repeat", 'repeat', default=10, type=click.IntRange(min=1), help="Number of cold starts per project")
+@click.option("--path", 'path', default="/admin/login/", help="Path of the first request")
+@click.option("--per-library", 'per_library', is_flag=True, default=False,
+              help="Also measure a project without libraries and a project per library")
+@click.option("--format", 'output_format', default="text", type=click.Choice(["text", "json"]),
+              help="Output Format, `json` writes a machine readable report to stdout")
+@click.argument('spec', type=click.Path(exists=True, dir_okay=False), default=CONFIG_FILE_NAME)
+@click.pass_context
+def bench_project(ctx, spec, env, repeat, path, per_library, output_format):
+    from django_cli.setup_project.bench import bench_libraries, log_bench_summary
+    from django_cli.setup_project.handler import ProjectInitializer
+
+    load_cli_env(env)
+    config = ProjectInitializer.get_yaml_config(spec)
+    if not config:
+        raise click.ClickException(YAML_PARSE_ERROR_MSG)
+    results = bench_libraries(config, repeat=repeat, path=path, per_library=per_library)
+    if output_format == "json":
+        echo_report("bench_report", {"repeat": repeat, "path": path,
+                                     "results": [result.to_dict() for result in results]})
+    else:
+        log_bench_summary(results)
+    if not all(result.ok for result in results):
+        ctx.exit(1)
+
+
+@cli.command('serve', help="Serves generation requests over a local Unix socket")
+@click.option("--env", 'env', default=DEFAULT_ENV_FILE, help="Target Environment File")
+@click.option("--socket", 'socket', default=None, help=f"Unix Socket Path [Default: {DEFAULT_SOCKET}]")
+def serve_generator(env, socket):
+    from django_cli.server import serve, ServerError
+
     load_cli_env(env)
-    ProjectInitializer(project_name=name).start_project()
+    try:
+        serve(socket)
+    except ServerError as e:
+        raise click.ClickException(str(e))
+
+
+@cli.command('client', help="Generates project of a spec using the generator server")
+@click.option("--socket", 'socket', default=None, help=f"Unix Socket Path [Default: {DEFAULT_SOCKET}]")
+@click.option("--archive", 'archive', default=None, callback=validate_archive,
+              help="Write project into an archive, `-` writes a tar.gz to stdout")
+@click.option("--out", 'out', default=".", type=click.Path(file_okay=False), help="Project Root Directory")
+@click.argument('spec', type=click.Path(exists=True, dir_okay=False), default=CONFIG_FILE_NAME)
+def generator_client(socket, archive, out, spec):
+    from django_cli.core.filemap import archive_format, commit_file_map
+    from django_cli.server import request, FILES_OUTPUT
+    from django_cli.setup_project.handler import ProjectInitializer
+    from django_cli.core.events import events_enabled
+    from django_cli.utils import success, log_to_stderr
+
+    if archive == STDOUT_ARCHIVE and events_enabled():
+        raise click.UsageError("--archive - can not be used with --output jsonl, stdout carries the events")
+    log_to_stderr(archive == STDOUT_ARCHIVE)
+    config = ProjectInitializer.get_yaml_config(spec)
+    if not config:
+        raise click.ClickException(YAML_PARSE_ERROR_MSG)
+    try:
+        response = request(config, output=archive_format(archive) if archive else FILES_OUTPUT, path=socket)
+    except OSError as e:
+        raise click.ClickException(f"Unable to connect to the generator server: {e}")
+    if not response["ok"]:
+        raise click.ClickException(response["error"])
+    if archive:
+        with click.open_file(archive, "wb", atomic=archive != STDOUT_ARCHIVE) as stream:
+            stream.write(response["archive"])
+        success(LOG_SUCCESS_PROJECT_ARCHIVED)
+        return
+    os.makedirs(out, exist_ok=True)
+    try:
+        commit_file_map(response["files"], out)
+    except FileExistsError:
+        raise click.ClickException(FILE_EXIST_ERROR)
+    success(LOG_SUCCESS_PROJECT_COMPLETE)
 
 
 @cli.command('install', help="Install Libraries that are in setup.yaml and requirements file")
 @click.option("--env", 'env', default=DEFAULT_ENV_FILE, help="Target Environment File")
-def install_libraries(env):
+@click.option("--batch/--no-batch", 'batched', default=True,
+              help="Install all libraries in one pip call [Default: batch]")
+@click.option("--skip-installed/--no-skip-installed", 'skip_satisfied', default=True,
+              help="Skip libraries that are already installed at a compatible version")
+@wheelhouse_options
+def install_libraries(env, batched, skip_satisfied, wheelhouse, offline):
+    from django_cli.setup_project.handler import ProjectInitializer
+
     load_cli_env(env)
-    load_dotenv()
-    ProjectInitializer().install_libraries()
+    load_project_env()
+    ProjectInitializer().install_libraries(batched=batched, skip_satisfied=skip_satisfied,
+                                           wheelhouse=wheelhouse, offline=offline)
+
+
+@cli.command('wheelhouse', help="Builds wheels of libraries into the local wheelhouse")
+@click.option("--wheelhouse", 'wheelhouse', default=None,
+              help=f"Wheelhouse Directory [Default: {DEFAULT_WHEELHOUSE}]")
+@click.option("--workers", 'workers', default=4, type=int, help="Number of wheels to build concurrently")
+@click.argument('libraries', nargs=-1)
+def make_wheelhouse(libraries, wheelhouse, workers):
+    from django_cli.setup_project.installer import fill_wheelhouse
+
+    fill_wheelhouse(libraries, wheelhouse=wheelhouse, workers=workers)
@@ -10,6 +10,12 @@ DJANGO_STORAGES = "django-storages"
 CORSHEADER = "django-cors-headers"
 CHANNELS_REDIS = "channels_redis"
 
+# Libs every generated project depends on
+PROJECT_LIBRARIES = [
+    "django",
+    "python-dotenv"
+]
+
 # Libs to install (ask user)
 LIBRARIES_OPTIONAL = [
     DJANGO_REST_FRAMEWORK,
@@ -88,6 +94,24 @@ DATABASE_DRIVERS = {
     COCKROACH_DB: "django-cockroachdb"
 }
 
+# Drivers of database engines when the native connection pool is enabled
+DATABASE_POOL_DRIVERS = {
+    POSTGRES: "psycopg[binary,pool]"
+}
+
+# Connection settings of database engines, `database.performance` of setup.yaml overrides them
+# An engine supports the settings it has an entry for, pool sizes are used when `pool` is enabled
+DATABASE_PERFORMANCE = {
+    POSTGRES: {"conn_max_age": 60, "conn_health_checks": True, "disable_server_side_cursors": False,
+               "pool": False, "pool_min_size": 2, "pool_max_size": 10},
+    MYSQL: {"conn_max_age": 60, "conn_health_checks": True},
+    MARIA_DB: {"conn_max_age": 60, "conn_health_checks": True},
+    ORACLE: {"conn_max_age": 60, "conn_health_checks": True},
+    MSSQL: {"conn_max_age": 60, "conn_health_checks": True},
+    SQLITE: {"conn_max_age": 0, "conn_health_checks": False},
+    COCKROACH_DB: {"conn_max_age": 60, "conn_health_checks": True, "disable_server_side_cursors": False},
+}
+
 DBEngine = {
     POSTGRES: 'django.db.backends.postgresql',
     MYSQL: 'django.db.backends.mysql',
@@ -111,3 +135,16 @@ CACHE_BACKED = {
     FILE_BASED_CACHE: 'django.core.cache.backends.filebased.FileBasedCache',
     LOC_MEM_CACHE: 'django.core.cache.backends.locmem.LocMemCache'
 }
+
+# Client libraries of cache backends
+CACHE_DRIVERS = {
+    PY_MEM_CACHE: "pymemcache",
+    REDIS: "redis",
+}
+
+# OPTIONS of cache backends, `cache.option` of setup.yaml is merged over them
+# Redis connections wait for a free connection of a bounded pool, pymemcache clients are pooled per process
+CACHE_OPTIONS = {
+    REDIS: {"pool_class": "redis.BlockingConnectionPool", "max_connections": 50},
+    PY_MEM_CACHE: {"use_pooling": True, "max_pool_size": 10, "no_delay": True},
+}
@@ -6,5 +6,22 @@ CONFIG_FILE_NAME = "setup.yaml"
 USE_TEMPLATE_CONFIRMATION = f"Do you want to use the current {CONFIG_FILE_NAME}?"
 FILE_EXIST_ERROR = "Project with Source Directory already exists"
 LOG_SUCCESS_PROJECT_COMPLETE = "Project successfully generated"
+LOG_SUCCESS_PROJECT_UPDATED = "Project successfully updated"
+LOG_SUCCESS_PROJECT_ARCHIVED = "Project successfully archived"
+LOG_RUN_RESUME = "run `django-cli startproject --resume` to finish the project"
 DEFAULT_ENV_FILE = 'cli.env'
-DEFAULT_REQUIREMENT_FILE = 'requirements.txt'
\ No newline at end of file
+DEFAULT_REQUIREMENT_FILE = 'requirements.txt'
+LOG_LIBRARIES_SATISFIED = "All libraries are already installed"
+WHEELHOUSE_ENV = "DJANGO_CLI_WHEELHOUSE"
+DEFAULT_WHEELHOUSE = "~/.cache/django-cli/wheelhouse"
+OFFLINE_WHEEL_MISSING = "Offline install failed, wheels are missing from the wheelhouse"
+LOG_WHEELHOUSE_READY = "Wheelhouse is ready"
+INSTALL_FAILED = "Library installation failed"
+STATE_DIR = ".django-cli"
+MANIFEST_FILE = f"{STATE_DIR}/manifest.json"
+LOG_MODIFIED_BY_USER = "Modified by hand, skipped"
+LOG_PROJECT_UP_TO_DATE = "Project is up to date"
+DEFAULT_SOCKET = "~/.cache/django-cli/server.sock"
+CONFIG_CACHE_ENV = "DJANGO_CLI_CONFIG_CACHE"
+DEFAULT_CONFIG_CACHE = "~/.cache/django-cli/config"
+JOURNAL_FILE = f"{STATE_DIR}/journal.json"
@@ -2,6 +2,8 @@ import abc
 from dataclasses import dataclass
 from typing import Callable, List
 
+from django_cli.core.profiler import span, HOOK
+
 
 def register(foreign_decorator: Callable) -> Callable:
     """
@@ -31,17 +33,19 @@ def register(foreign_decorator: Callable) -> Callable:
 @dataclass
 class TaskQueue:
     """
-    Stores functions/callables in a queue and executes them serially
+    Stores functions/callables in a queue and executes them serially, in the order of the queue
     :arg
         queue (list[Callable]): Function Queue
     """
     queue: List[Callable]
 
     def dequeue(self, *args, **kwargs) -> None:
-        self.queue.pop()(*args, **kwargs)
+        func = self.queue.pop(0)
+        with span(getattr(func, "__qualname__", repr(func)), HOOK):
+            func(*args, **kwargs)
 
     def execute(self, *args, **kwargs):
-        for q in self.queue:
+        while self.queue:
             self.dequeue(*args, **kwargs)
 
 
@@ -0,0 +1,85 @@
+import json
+import threading
+import time
+from typing import IO, List, Optional
+
+# Buffered lines are written once they reach this size in characters
+BUFFER_SIZE = 64 * 1024
+# Seconds after which buffered lines are written, even if no other event follows
+FLUSH_INTERVAL = 0.5
+
+
+class EventWriter:
+    """
+    Writes events as JSON lines into a text stream,
+    Lines are buffered and written in chunks, at most `flush_interval` seconds late,
+    a timer writes lines of a quiet period I.E `task_start` of a long pip install
+    """
+
+    def __init__(self, stream: IO[str], buffer_size: int = BUFFER_SIZE, flush_interval: float = FLUSH_INTERVAL):
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.lines: List[str] = []
+        self.size = 0
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+        self.timer: Optional[threading.Timer] = None
+
+    def emit(self, event: str, **data) -> None:
+        """Writes an event, I.E `emit("file_written", path="manage.py", bytes=663)`"""
+        line = json.dumps({"event": event, "time": round(time.time(), 6), **data}, default=str, separators=(",", ":"))
+        with self.lock:
+            self.lines.append(line)
+            self.size += len(line) + 1
+            elapsed = time.monotonic() - self.last_flush
+            if self.size >= self.buffer_size or elapsed >= self.flush_interval:
+                self._flush()
+            elif self.timer is None:
+                self.timer = threading.Timer(self.flush_interval - elapsed, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def _flush(self) -> None:
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if self.lines:
+            self.stream.write("\n".join(self.lines) + "\n")
+            self.stream.flush()
+        self.lines = []
+        self.size = 0
+        self.last_flush = time.monotonic()
+
+    def flush(self) -> None:
+        with self.lock:
+            self._flush()
+
+
+_writer: Optional[EventWriter] = None
+
+
+def start_events(stream: IO[str], **kwargs) -> EventWriter:
+    """Starts emitting events of the process into the stream, accepts same keyword arguments as `EventWriter`"""
+    global _writer
+    _writer = EventWriter(stream, **kwargs)
+    return _writer
+
+
+def stop_events() -> None:
+    """Writes buffered events and stops emitting events"""
+    global _writer
+    writer, _writer = _writer, None
+    if writer is not None:
+        writer.flush()
+
+
+def events_enabled() -> bool:
+    return _writer is not None
+
+
+def emit(event: str, **data) -> None:
+    """Emits an event when the event stream is enabled, otherwise it does nothing"""
+    writer = _writer
+    if writer is not None:
+        writer.emit(event, **data)
@@ -0,0 +1,141 @@
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+from typing import Dict, List, BinaryIO
+
+from django_cli.core.events import emit
+
+# Relative POSIX path -> content, directory paths end with `/` and have empty content
+FileMap = Dict[str, bytes]
+
+STAGING_PREFIX = ".django-cli-"
+
+# Archive extension -> format, `zip` or tarfile compression
+ARCHIVE_FORMATS = {
+    ".zip": "zip",
+    ".tar.gz": "gz",
+    ".tgz": "gz",
+    ".tar.bz2": "bz2",
+    ".tar.xz": "xz",
+    ".tar": "",
+}
+STDOUT_ARCHIVE = "-"
+EXECUTABLE_FILES = ("manage.py",)
+
+
+def is_directory(path: str) -> bool:
+    return path.endswith("/")
+
+
+def top_level_entries(files: FileMap) -> List[str]:
+    """Returns top level files and directories of the file map, directories end with `/`"""
+    entries = []
+    for path in files:
+        head, sep, _ = path.partition("/")
+        entry = head + "/" if sep else head
+        if entry not in entries:
+            entries.append(entry)
+    return entries
+
+
+def write_file_map(files: FileMap, root: str) -> None:
+    """Writes every file and directory of the file map under root"""
+    for path, content in files.items():
+        location = os.path.join(root, *path.rstrip("/").split("/"))
+        if is_directory(path):
+            os.makedirs(location, exist_ok=True)
+            continue
+        os.makedirs(os.path.dirname(location), exist_ok=True)
+        with open(location, "wb") as file:
+            file.write(content)
+
+
+def check_file_map(files: FileMap, target: str = ".") -> None:
+    """
+    Checks if the file map can be committed into target
+    :raises FileExistsError: If a top level directory already exists in target
+    """
+    for entry in top_level_entries(files):
+        if is_directory(entry) and os.path.exists(os.path.join(target, entry)):
+            raise FileExistsError(os.path.join(target, entry))
+
+
+def commit_file_map(files: FileMap, target: str = ".") -> None:
+    """
+    Writes the file map into a temporary sibling directory and moves it into place,
+    Top level directories are moved with an atomic rename, top level files replace existing ones
+    Nothing is written to target if rendering or staging fails
+    :raises FileExistsError: If a top level directory already exists in target
+    """
+    entries = top_level_entries(files)
+    check_file_map(files, target)
+
+    staging = tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=target)
+    try:
+        write_file_map(files, staging)
+        # Directories first, a conflict leaves existing files untouched
+        for entry in sorted(entries, key=lambda item: not is_directory(item)):
+            name = entry.rstrip("/")
+            if is_directory(entry):
+                os.rename(os.path.join(staging, name), os.path.join(target, name))
+            else:
+                os.replace(os.path.join(staging, name), os.path.join(target, name))
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    for path, content in files.items():
+        if not is_directory(path):
+            emit("file_written", path=path, bytes=len(content))
+
+
+def archive_format(name: str) -> str:
+    """
+    Returns archive format from the archive file name, `-` (stdout) is a gzip tar stream
+    :raises ValueError: If the extension is not supported
+    """
+    if name == STDOUT_ARCHIVE:
+        return "gz"
+    for extension, archive in ARCHIVE_FORMATS.items():
+        if name.endswith(extension):
+            return archive
+    raise ValueError(f"Unsupported archive format, use one of {', '.join(ARCHIVE_FORMATS)}")
+
+
+def _file_mode(path: str) -> int:
+    if is_directory(path) or path.rsplit("/", 1)[-1] in EXECUTABLE_FILES:
+        return 0o755
+    return 0o644
+
+
+def write_archive(files: FileMap, stream: BinaryIO, archive: str = "gz") -> None:
+    """
+    Streams the file map into a zip or tar archive, Files are never written to disk
+    Stream does not need to be seekable, I.E stdout
+    :param files: File map
+    :param stream: Binary output stream
+    :param archive: `zip` or tar compression [`gz`, `bz2`, `xz`, `` (no compression)]
+    """
+    now = time.time()
+    if archive == "zip":
+        with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+            for path, content in files.items():
+                info = zipfile.ZipInfo(path, date_time=time.localtime(now)[:6])
+                info.external_attr = (_file_mode(path) | (0o040000 if is_directory(path) else 0o100000)) << 16
+                info.compress_type = zipfile.ZIP_DEFLATED
+                zip_file.writestr(info, content)
+        return
+
+    with tarfile.open(fileobj=stream, mode=f"w|{archive}") as tar_file:
+        for path, content in files.items():
+            info = tarfile.TarInfo(path.rstrip("/"))
+            info.mtime = int(now)
+            info.mode = _file_mode(path)
+            if is_directory(path):
+                info.type = tarfile.DIRTYPE
+                tar_file.addfile(info)
+            else:
+                info.size = len(content)
+                tar_file.addfile(info, io.BytesIO(content))
@@ -0,0 +1,54 @@
+import json
+import threading
+from typing import Any, Dict, Optional
+
+from django_cli.core.manifest import atomic_write, value_hash
+
+JOURNAL_VERSION = 1
+
+
+class Journal:
+    """
+    Completed steps of a scheduler run and the hash of their inputs,
+    Journal is written after every completed step so an interrupted run can be resumed
+    :arg
+        location: Journal file
+        steps: Step name -> {"hash": input hash, "seconds": run time}
+    """
+
+    def __init__(self, location: str, steps: Optional[Dict[str, dict]] = None):
+        self.location = location
+        self.steps = dict(steps or {})
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, location: str) -> "Journal":
+        """Reads journal, an empty journal is returned if it does not exist or is unreadable"""
+        try:
+            with open(location, "r") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return cls(location)
+        if not isinstance(data, dict) or data.get("version") != JOURNAL_VERSION:
+            return cls(location)
+        return cls(location, data.get("steps") or {})
+
+    def is_done(self, name: str, inputs: Any) -> bool:
+        """Checks if the step was completed with the same inputs"""
+        return self.steps.get(name, {}).get("hash") == value_hash(inputs)
+
+    def _write(self) -> None:
+        content = json.dumps({"version": JOURNAL_VERSION, "steps": self.steps}, indent=2, sort_keys=True) + "\n"
+        atomic_write(self.location, content.encode())
+
+    def record(self, name: str, inputs: Any, seconds: float = 0.0) -> None:
+        """Records a completed step"""
+        with self.lock:
+            self.steps[name] = {"hash": value_hash(inputs), "seconds": round(seconds, 3)}
+            self._write()
+
+    def forget(self, name: str) -> None:
+        """Removes record of a step that is running again, a failure must not leave the previous record behind"""
+        with self.lock:
+            if self.steps.pop(name, None) is not None:
+                self._write()
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Iterable
+
+from django_cli.core.events import emit
+from django_cli.core.filemap import FileMap, is_directory
+
+MANIFEST_VERSION = 1
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def value_hash(value: Any) -> str:
+    """Hash of a JSON serializable value, independent of dictionary order"""
+    return content_hash(json.dumps(value, sort_keys=True, default=str).encode())
+
+
+def file_hash(location: str) -> Optional[str]:
+    """Hash of a file on disk, None if it does not exist"""
+    try:
+        with open(location, "rb") as file:
+            return content_hash(file.read())
+    except (FileNotFoundError, IsADirectoryError):
+        return None
+
+
+def build_manifest(files: FileMap, dependencies: Dict[str, List[str]], fields: Dict[str, str]) -> dict:
+    """
+    Creates manifest of a rendered file map
+    :param files: Rendered file map
+    :param dependencies: State fields each file depends on
+    :param fields: Hash of each state field
+    :return: dict
+    """
+    return {
+        "version": MANIFEST_VERSION,
+        "fields": dict(fields),
+        "files": {
+            path: {"hash": content_hash(content), "depends": list(dependencies.get(path, []))}
+            for path, content in files.items() if not is_directory(path)
+        }
+    }
+
+
+def manifest_bytes(manifest: dict) -> bytes:
+    return (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode()
+
+
+def read_manifest(location: str) -> dict:
+    """Reads manifest, an empty manifest is returned if it does not exist or is unreadable"""
+    try:
+        with open(location, "r") as file:
+            manifest = json.load(file)
+    except (FileNotFoundError, ValueError):
+        return {"version": MANIFEST_VERSION, "fields": {}, "files": {}}
+    manifest.setdefault("fields", {})
+    manifest.setdefault("files", {})
+    return manifest
+
+
+def changed_fields(manifest: dict, fields: Dict[str, str]) -> List[str]:
+    """State fields whose hash differs from the manifest"""
+    recorded = manifest.get("fields", {})
+    return sorted(name for name in set(recorded) | set(fields) if recorded.get(name) != fields.get(name))
+
+
+def atomic_write(location: str, content: bytes) -> None:
+    """Writes file through a temporary file in the same directory and replaces it"""
+    directory = os.path.dirname(location) or "."
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=directory, prefix=".django-cli-")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(content)
+        os.replace(temporary, location)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+@dataclass
+class UpdateReport:
+    """
+    Result of an incremental update
+    :arg
+        added: Files that did not exist
+        updated: Files whose output changed
+        removed: Files that are no longer generated
+        unchanged: Files whose output did not change
+        modified: Files edited by hand, they are not overwritten
+        reasons: State fields that caused a file to change
+    """
+    added: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    reasons: Dict[str, List[str]] = field(default_factory=dict)
+    manifest: dict = field(default_factory=dict)
+
+    @property
+    def written(self) -> List[str]:
+        return self.added + self.updated + self.removed
+
+
+def update_file_map(files: FileMap,
+                    target: str,
+                    manifest: dict,
+                    dependencies: Dict[str, List[str]],
+                    fields: Dict[str, str],
+                    force: bool = False,
+                    preserve: Iterable[str] = ()) -> UpdateReport:
+    """
+    Writes only files whose rendered output changed,
+    A file is edited by hand when its content differs from the hash recorded in the manifest,
+    such files are reported and kept unless `force`
+    :param files: Rendered file map
+    :param target: Project root directory
+    :param manifest: Manifest of the previous generation, see `read_manifest`
+    :param dependencies: State fields each file depends on
+    :param fields: Hash of each state field
+    :param force: Overwrite files edited by hand
+    :param preserve: Files that are not part of the file map but must be kept along with their records
+    :return: UpdateReport, `manifest` of the report is the manifest of the new state
+    """
+    report = UpdateReport()
+    preserve = set(preserve)
+    recorded_files = manifest.get("files", {})
+    changed = set(changed_fields(manifest, fields))
+    new_manifest = build_manifest(files, dependencies, fields)
+
+    for path, content in files.items():
+        location = os.path.join(target, *path.rstrip("/").split("/"))
+        if is_directory(path):
+            os.makedirs(location, exist_ok=True)
+            continue
+        current = file_hash(location)
+        new = content_hash(content)
+        recorded = recorded_files.get(path, {}).get("hash")
+        if current == new:
+            report.unchanged.append(path)
+            continue
+        if current is not None and current != recorded and not force:
+            # Edited by hand, keep the previous record so the file stays flagged
+            report.modified.append(path)
+            if path in recorded_files:
+                new_manifest["files"][path] = recorded_files[path]
+            else:
+                new_manifest["files"].pop(path, None)
+            continue
+        atomic_write(location, content)
+        emit("file_written", path=path, bytes=len(content))
+        (report.added if current is None else report.updated).append(path)
+        report.reasons[path] = sorted(changed & set(dependencies.get(path, [])))
+
+    for path, record in recorded_files.items():
+        if path in preserve:
+            new_manifest["files"][path] = record
+            continue
+        if path in files:
+            continue
+        location = os.path.join(target, *path.split("/"))
+        current = file_hash(location)
+        if current is None:
+            continue
+        if current != record.get("hash") and not force:
+            report.modified.append(path)
+            new_manifest["files"][path] = record
+            continue
+        os.remove(location)
+        emit("file_removed", path=path)
+        report.removed.append(path)
+
+    report.manifest = new_manifest
+    return report
@@ -0,0 +1,171 @@
+import contextlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
+
+COMMAND = "command"
+HOOK = "hook"
+STEP = "step"
+SUBPROCESS = "subprocess"
+
+# Width of the name column of the timing table
+NAME_WIDTH = 60
+
+
+@dataclass
+class Span:
+    """
+    Timed section of a profiled run
+    :arg
+        name: I.E step title or command line
+        category: command, hook, step or subprocess
+        start: Seconds since the profiler started
+        seconds: Duration
+        thread: Thread identifier
+        thread_name: Thread name
+        args: Extra data, I.E exit code of a subprocess
+    """
+    name: str
+    category: str
+    start: float = 0.0
+    seconds: float = 0.0
+    thread: int = 0
+    thread_name: str = ""
+    args: dict = field(default_factory=dict)
+
+
+class Profiler:
+    """
+    Collects spans from every thread,
+    With `stats` the main thread and every step thread is profiled with cProfile
+    """
+
+    def __init__(self, stats: bool = False):
+        self.origin = time.perf_counter()
+        self.spans: List[Span] = []
+        self.lock = threading.Lock()
+        self.stats = stats
+        self.profiles = []
+        if stats:
+            self.main_profile = self._start_profile()
+
+    def now(self) -> float:
+        return time.perf_counter() - self.origin
+
+    def _start_profile(self):
+        import cProfile
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is active, I.E Python 3.12+ allows a single cProfile at a time
+            return None
+        with self.lock:
+            self.profiles.append(profile)
+        return profile
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str, **args) -> Iterator[Span]:
+        """Times the body of the `with` block, step threads are profiled with cProfile when enabled"""
+        thread = threading.current_thread()
+        item = Span(name=name, category=category, start=self.now(), thread=thread.ident or 0,
+                    thread_name=thread.name, args=dict(args))
+        profile = None
+        if self.stats and category == STEP and thread is not threading.main_thread():
+            profile = self._start_profile()
+        try:
+            yield item
+        finally:
+            if profile is not None:
+                profile.disable()
+            item.seconds = self.now() - item.start
+            with self.lock:
+                self.spans.append(item)
+
+    def finish(self, name: str) -> Span:
+        """Stops profiling and records the root span of the run"""
+        if self.stats and self.main_profile is not None:
+            self.main_profile.disable()
+        thread = threading.main_thread()
+        root = Span(name=name, category=COMMAND, start=0.0, seconds=self.now(), thread=thread.ident or 0,
+                    thread_name=thread.name)
+        with self.lock:
+            self.spans.insert(0, root)
+        return root
+
+    def sorted_spans(self) -> List[Span]:
+        with self.lock:
+            return sorted(self.spans, key=lambda item: (item.start, -item.seconds))
+
+    def table(self) -> str:
+        """Timing table of spans in start order"""
+        lines = [f"{'Name':<{NAME_WIDTH}}  {'Category':<10}  {'Start':>9}  {'Duration':>9}"]
+        for item in self.sorted_spans():
+            name = item.name if len(item.name) <= NAME_WIDTH else item.name[:NAME_WIDTH - 3] + "..."
+            lines.append(f"{name:<{NAME_WIDTH}}  {item.category:<10}  {item.start:>8.3f}s  {item.seconds:>8.3f}s")
+        return "\n".join(lines)
+
+    def trace_events(self) -> dict:
+        """Spans as Chrome trace events, open with chrome://tracing or https://ui.perfetto.dev"""
+        pid = os.getpid()
+        events = []
+        threads = {}
+        for item in self.sorted_spans():
+            threads.setdefault(item.thread, item.thread_name)
+            events.append({"name": item.name, "cat": item.category, "ph": "X", "pid": pid, "tid": item.thread,
+                           "ts": round(item.start * 1e6, 3), "dur": round(item.seconds * 1e6, 3),
+                           "args": item.args})
+        events += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": thread, "args": {"name": name}}
+                   for thread, name in threads.items()]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, location: str) -> None:
+        with open(location, "w") as file:
+            json.dump(self.trace_events(), file, default=str)
+
+    def dump_stats(self, location: str) -> None:
+        """Writes merged cProfile stats of the profiled threads, read with `pstats` or snakeviz"""
+        import pstats
+
+        profiles = [profile for profile in self.profiles if profile.getstats()]
+        if not profiles:
+            return
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(location)
+
+
+_active: Optional[Profiler] = None
+
+
+def start_profiling(stats: bool = False) -> Profiler:
+    """Starts collecting spans of the process"""
+    global _active
+    _active = Profiler(stats=stats)
+    return _active
+
+
+def stop_profiling(name: str) -> Optional[Profiler]:
+    """Stops collecting spans, Returns the profiler with the root span of the run"""
+    global _active
+    profiler, _active = _active, None
+    if profiler is not None:
+        profiler.finish(name)
+    return profiler
+
+
+def active_profiler() -> Optional[Profiler]:
+    return _active
+
+
+def span(name: str, category: str, **args):
+    """Times the body of the `with` block when profiling, otherwise it does nothing"""
+    profiler = _active
+    if profiler is None:
+        return contextlib.nullcontext(Span(name=name, category=category))
+    return profiler.span(name, category, **args)
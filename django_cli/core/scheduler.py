@@ -0,0 +1,242 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from django_cli.core.events import emit
+from django_cli.core.profiler import span, STEP
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+RESUMED = "resumed"
+FAILED = "failed"
+SKIPPED = "skipped"
+CANCELLED = "cancelled"
+
+# Steps in these states never run their dependents
+UNSUCCESSFUL = (FAILED, SKIPPED, CANCELLED)
+# Steps in these states let their dependents run
+COMPLETE = (DONE, RESUMED)
+
+_context = threading.local()
+
+
+def cancel_event() -> Optional[threading.Event]:
+    """Cancel event of the scheduler running the current step, None outside of a step"""
+    return getattr(_context, "cancel", None)
+
+
+class SchedulerError(Exception):
+    """Raised when steps depend on unknown steps or on each other"""
+
+
+@dataclass
+class Step:
+    """
+    Unit of work of a scheduler
+    :arg
+        name: Unique step name
+        func: Callable without arguments, its return value is kept in the step result
+        depends: Names of steps that must finish before this step starts
+        title: Human readable title
+        inputs: JSON serializable inputs of a step whose work is persisted, I.E files or installed libraries,
+            A step with inputs is recorded in the journal and is resumed while its inputs do not change,
+            A step without inputs keeps its work in memory and runs whenever a step depending on it runs
+            A step that returns `False` finished without completing its work, it is not recorded
+    """
+    name: str
+    func: Callable[[], Any]
+    depends: Sequence[str] = ()
+    title: str = ""
+    inputs: Any = None
+
+
+@dataclass
+class StepResult:
+    """
+    Result of a step
+    :arg
+        name: Step name
+        title: Step title
+        status: pending, running, done, resumed (done in a previous run), failed,
+            skipped (a dependency did not finish) or cancelled
+        value: Return value of the step
+        error: Exception raised by the step
+        started: Start time, `time.perf_counter`
+        seconds: Run time
+    """
+    name: str
+    title: str = ""
+    status: str = PENDING
+    value: Any = None
+    error: Optional[BaseException] = field(default=None, repr=False)
+    started: float = 0.0
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status in COMPLETE
+
+
+def topological_order(steps: Dict[str, Step]) -> List[str]:
+    """
+    Orders steps so every step comes after its dependencies, ties keep the order of steps
+    :raises SchedulerError: If a step depends on an unknown step or steps form a cycle
+    """
+    order = []
+    visiting = []
+    visited = set()
+
+    def visit(name: str) -> None:
+        if name in visited:
+            return
+        if name in visiting:
+            cycle = visiting[visiting.index(name):] + [name]
+            raise SchedulerError(f"Steps form a cycle: {' -> '.join(cycle)}")
+        visiting.append(name)
+        for dependency in steps[name].depends:
+            if dependency not in steps:
+                raise SchedulerError(f"Step `{name}` depends on unknown step `{dependency}`")
+            visit(dependency)
+        visiting.pop()
+        visited.add(name)
+        order.append(name)
+
+    for step_name in steps:
+        visit(step_name)
+    return order
+
+
+class Scheduler:
+    """
+    Runs steps of a dependency graph in a thread pool, a step starts as soon as its dependencies are done
+    Dependents of a failed step are skipped, with `fail_fast` steps that did not start are cancelled as well
+    Running steps are cancelled cooperatively, `execute` kills subprocesses of a cancelled step
+    Steps that are done in the journal with the same inputs are resumed instead of running again
+    """
+
+    def __init__(self, steps: Iterable[Step], workers: Optional[int] = None, fail_fast: bool = True, journal=None):
+        self.steps: Dict[str, Step] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise SchedulerError(f"Duplicate step `{step.name}`")
+            self.steps[step.name] = step
+        self.order = topological_order(self.steps)
+        self.results = {name: StepResult(name=name, title=step.title) for name, step in self.steps.items()}
+        self.workers = workers or max(1, len(self.steps))
+        self.fail_fast = fail_fast
+        self.cancel_event = threading.Event()
+        self.listeners: List[Callable[[StepResult], None]] = []
+        # `django_cli.core.journal.Journal`
+        self.journal = journal
+
+    def add_listener(self, listener: Callable[[StepResult], None]) -> None:
+        """Listener is called with the step result whenever a step changes state, from the step thread"""
+        self.listeners.append(listener)
+
+    def cancel(self) -> None:
+        """Cancels steps that did not start and signals running steps to stop"""
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def _set_status(self, result: StepResult, status: str) -> None:
+        result.status = status
+        if status == RUNNING:
+            emit("task_start", task=result.name, title=result.title)
+        else:
+            emit("task_end", task=result.name, title=result.title, status=status, seconds=round(result.seconds, 6),
+                 error=str(result.error) if result.error else None)
+        for listener in self.listeners:
+            listener(result)
+
+    def resumed_steps(self) -> List[str]:
+        """
+        Steps that were completed in the journal with the same inputs and do not need to run,
+        A step runs again when a dependency with inputs runs again,
+        A step without inputs is resumed when every step depending on it is resumed
+        """
+        if self.journal is None:
+            return []
+        resumed = set()
+        for name in self.order:
+            step = self.steps[name]
+            dependencies = all(dependency in resumed or self.steps[dependency].inputs is None
+                               for dependency in step.depends)
+            if step.inputs is not None and dependencies and self.journal.is_done(name, step.inputs):
+                resumed.add(name)
+        for name in reversed(self.order):
+            dependents = [other for other in self.steps.values() if name in other.depends]
+            if self.steps[name].inputs is None and dependents and all(item.name in resumed for item in dependents):
+                resumed.add(name)
+        return [name for name in self.order if name in resumed]
+
+    def _run_step(self, step: Step) -> None:
+        result = self.results[step.name]
+        _context.cancel = self.cancel_event
+        if self.journal is not None and step.inputs is not None:
+            self.journal.forget(step.name)
+        result.started = time.perf_counter()
+        self._set_status(result, RUNNING)
+        try:
+            with span(step.title or step.name, STEP, step=step.name):
+                result.value = step.func()
+            status = DONE
+        except BaseException as e:
+            result.error = e
+            status = CANCELLED if self.cancelled else FAILED
+        finally:
+            _context.cancel = None
+            result.seconds = time.perf_counter() - result.started
+        if status == DONE and self.journal is not None and step.inputs is not None and result.value is not False:
+            self.journal.record(step.name, step.inputs, result.seconds)
+        self._set_status(result, status)
+
+    def _start_ready(self, pending: List[str], running: dict, executor: ThreadPoolExecutor) -> None:
+        for name in list(pending):
+            statuses = [self.results[dependency].status for dependency in self.steps[name].depends]
+            if any(status in UNSUCCESSFUL for status in statuses):
+                pending.remove(name)
+                self._set_status(self.results[name], SKIPPED)
+            elif self.cancelled:
+                pending.remove(name)
+                self._set_status(self.results[name], CANCELLED)
+            elif all(status in COMPLETE for status in statuses):
+                pending.remove(name)
+                running[executor.submit(self._run_step, self.steps[name])] = name
+
+    def run(self) -> Dict[str, StepResult]:
+        """
+        Runs every step and waits for them to finish
+        :raises: Exception of the first failed step, in step order, once every running step finished
+        :return: Step results mapped by step name
+        """
+        resumed = self.resumed_steps()
+        for name in resumed:
+            self._set_status(self.results[name], RESUMED)
+        pending = [name for name in self.order if name not in resumed]
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                while pending or running:
+                    self._start_ready(pending, running, executor)
+                    if not running:
+                        break
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name = running.pop(future)
+                        if self.results[name].status == FAILED and self.fail_fast:
+                            self.cancel()
+            except BaseException:
+                # I.E KeyboardInterrupt, running steps are signaled and awaited by the executor
+                self.cancel()
+                raise
+
+        for name in self.order:
+            if self.results[name].status == FAILED:
+                raise self.results[name].error
+        return self.results
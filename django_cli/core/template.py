@@ -0,0 +1,96 @@
+import functools
+import pathlib
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Tuple
+
+TEMPLATE_DIR = pathlib.Path(__file__).resolve().parent.parent / "template"
+TEMPLATE_EXTENSION = ".template"
+
+# `$NAME` placeholder, lowercase names such as `*$py.class` are literal text
+PLACEHOLDER = re.compile(r"\$([A-Z][A-Z0-9_]*)")
+
+# Placeholders that can be used in templates
+TEMPLATE_VARIABLES = frozenset({
+    "PROJECT_NAME",
+    "INSTALLED_APPS",
+    "MIDDLEWARES",
+    "EXTRA",
+    "CACHE",
+    "TEMPLATE_LOADERS",
+    "REPLICA_DATABASES",
+    "DATABASE_ROUTERS",
+    "REPLICAS",
+    "STATIC_SETTINGS",
+    "MEDIA_SETTINGS",
+    "TEMPLATE_SETTINGS",
+    "CONFIG_PATHS",
+    "CONFIG_VARS",
+})
+
+
+class TemplateError(Exception):
+    """Raised when a template is missing or uses an unknown placeholder"""
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """
+    Template parsed into literal and placeholder segments
+    :arg
+        name: Template file name
+        literals: Literal text, there is always one more literal than placeholders
+        placeholders: Placeholder names, placeholder `i` sits between literal `i` and `i + 1`
+    """
+    name: str
+    literals: Tuple[str, ...]
+    placeholders: Tuple[str, ...]
+
+    @property
+    def variables(self) -> FrozenSet[str]:
+        return frozenset(self.placeholders)
+
+    def render(self, data: Dict[str, str]) -> str:
+        """
+        Renders template in a single pass, substituted values are never scanned again
+        Placeholders without data are kept as they are
+        """
+        parts = [self.literals[0]]
+        for name, literal in zip(self.placeholders, self.literals[1:]):
+            parts.append(data[name] if name in data else f"${name}")
+            parts.append(literal)
+        return "".join(parts)
+
+
+def compile_source(name: str, source: str, variables: FrozenSet[str] = TEMPLATE_VARIABLES) -> CompiledTemplate:
+    """
+    Compiles template source
+    :raises TemplateError: If the template uses a placeholder that is not in variables
+    """
+    segments = PLACEHOLDER.split(source)
+    placeholders = tuple(segments[1::2])
+    unknown = sorted(set(placeholders) - variables)
+    if unknown:
+        raise TemplateError(f"Unknown placeholder in {name}: {', '.join('$' + item for item in unknown)}")
+    return CompiledTemplate(name=name, literals=tuple(segments[0::2]), placeholders=placeholders)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_template(name: str, variables: FrozenSet[str] = TEMPLATE_VARIABLES) -> CompiledTemplate:
+    """
+    Compiles a template of the template directory, compiled template is cached for the life of the process
+    :param name: Template file name, I.E `settings.template`
+    :param variables: Known placeholders
+    :raises TemplateError: If template does not exist or uses an unknown placeholder
+    """
+    try:
+        with open(TEMPLATE_DIR / name, "r", encoding="utf-8") as file:
+            source = file.read()
+    except FileNotFoundError:
+        raise TemplateError(f"Template not found: {name}")
+    return compile_source(name, source, variables)
+
+
+def compile_all() -> Dict[str, CompiledTemplate]:
+    """Compiles every template of the template directory"""
+    return {path.name: compile_template(path.name) for path in sorted(TEMPLATE_DIR.glob(f"*{TEMPLATE_EXTENSION}"))}
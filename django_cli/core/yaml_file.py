@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+from typing import Any, List, Optional, IO
+
+import yaml
+
+from django_cli.const import CONFIG_CACHE_ENV, DEFAULT_CONFIG_CACHE
+from django_cli.core.manifest import atomic_write
+
+# libyaml bindings are used when PyYAML was built with them
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+CACHE_VERSION = 1
+# Number of parsed files kept in the cache
+CACHE_SIZE = 256
+
+
+def load(stream: IO) -> Any:
+    """Parses a single YAML document"""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def load_all(stream: IO) -> List[Any]:
+    """Parses every document of a multi document YAML stream"""
+    return list(yaml.load_all(stream, Loader=SafeLoader))
+
+
+def dump(data: Any, **kwargs) -> str:
+    """Serializes data into YAML, keys keep their order unless `sort_keys`"""
+    kwargs.setdefault("sort_keys", False)
+    return yaml.dump(data, Dumper=SafeDumper, **kwargs)
+
+
+def normalize_config(document: Any) -> Any:
+    """Lowercases top level keys of a config document, other documents are returned as they are"""
+    if isinstance(document, dict):
+        return {str(k).lower(): v for k, v in document.items()}
+    return document
+
+
+def cache_dir() -> Optional[str]:
+    """Parsed config cache directory, `DJANGO_CLI_CONFIG_CACHE` overrides it, an empty value disables the cache"""
+    location = os.environ.get(CONFIG_CACHE_ENV, DEFAULT_CONFIG_CACHE)
+    return os.path.expanduser(location) if location else None
+
+
+def _cache_location(directory: str, file_name: str) -> str:
+    key = hashlib.sha256(os.path.abspath(file_name).encode()).hexdigest()
+    return os.path.join(directory, f"{key}.json")
+
+
+def _read_entry(location: str) -> dict:
+    try:
+        with open(location, "r") as file:
+            entry = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return entry if isinstance(entry, dict) and entry.get("version") == CACHE_VERSION else {}
+
+
+def _prune(directory: str) -> None:
+    """Removes least recently written entries above the cache size"""
+    try:
+        entries = [entry for entry in os.scandir(directory) if entry.name.endswith(".json")]
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in entries[CACHE_SIZE:]:
+            os.remove(entry.path)
+    except OSError:
+        pass
+
+
+def _write_entry(directory: str, location: str, entry: dict) -> None:
+    try:
+        content = json.dumps(entry)
+        # Values JSON can not represent as they are, I.E dates or integer keys, are not cached
+        if json.loads(content)["documents"] != entry["documents"]:
+            return
+        atomic_write(location, content.encode())
+    except (TypeError, ValueError, OSError):
+        return
+    _prune(directory)
+
+
+def load_config_file(file_name: str) -> List[Any]:
+    """
+    Parses every document of a YAML config file, top level keys of dictionary documents are lowercased
+    Parsed documents are cached by file hash and modification time, an unchanged file is not parsed again
+    Only the file itself is cached, `$VAR` references are expanded later so secrets are never written to the cache
+    :param file_name: YAML file
+    :return: List of documents
+    :raises OSError: If the file can not be read
+    :raises yaml.YAMLError: If the file is not valid YAML
+    """
+    directory = cache_dir()
+    stat = os.stat(file_name)
+    location = _cache_location(directory, file_name) if directory else None
+    entry = _read_entry(location) if location else {}
+    if entry and entry.get("mtime") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+        return entry["documents"]
+
+    with open(file_name, "rb") as file:
+        content = file.read()
+    digest = hashlib.sha256(content).hexdigest()
+    if entry.get("hash") == digest:
+        documents = entry["documents"]
+    else:
+        documents = [normalize_config(document) for document in yaml.load_all(content, Loader=SafeLoader)]
+    if location:
+        _write_entry(directory, location, {"version": CACHE_VERSION, "hash": digest, "mtime": stat.st_mtime_ns,
+                                           "size": stat.st_size, "documents": documents})
+    return documents
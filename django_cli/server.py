@@ -0,0 +1,170 @@
+"""
+Generator daemon, keeps compiled templates and config tables in memory
+and serves generation requests over a local Unix socket
+
+Protocol: one JSON document per line, a connection can send many requests
+    request  -> {"config": {...setup.yaml...}, "output": "files" | "gz" | "zip" | "bz2" | "xz" | ""}
+    response <- {"ok": true, "files": {"path": "<base64>"}} | {"ok": true, "archive": "<base64>"}
+                | {"ok": false, "error": "..."}
+"""
+import base64
+import errno
+import json
+import os
+import socket
+import socketserver
+import stat
+from typing import Optional
+
+from django_cli.api import generate, generate_archive, ConfigError
+from django_cli.config import LIBRARIES_OPTIONAL
+from django_cli.const import DEFAULT_SOCKET
+from django_cli.core.filemap import ARCHIVE_FORMATS
+from django_cli.core.template import compile_all
+from django_cli.utils import success
+
+FILES_OUTPUT = "files"
+MAX_REQUEST_SIZE = 16 * 1024 * 1024
+
+
+class ServerError(RuntimeError):
+    """Raised when the generator server can not be bound to its socket"""
+
+
+def socket_path(path: Optional[str] = None) -> str:
+    return os.path.expanduser(path or DEFAULT_SOCKET)
+
+
+def handle_request(request: dict) -> dict:
+    """Generates project of a request, it never raises"""
+    output = request.get("output", FILES_OUTPUT)
+    config = request.get("config")
+    if not isinstance(config, dict):
+        return {"ok": False, "error": "Request config must be an object"}
+    if output != FILES_OUTPUT and output not in ARCHIVE_FORMATS.values():
+        return {"ok": False, "error": f"Unsupported output: {output}"}
+    try:
+        if output == FILES_OUTPUT:
+            files = generate(config)
+            return {"ok": True, "files": {path: base64.b64encode(content).decode() for path, content in files.items()}}
+        return {"ok": True, "archive": base64.b64encode(generate_archive(config, output)).decode()}
+    except ConfigError as e:
+        return {"ok": False, "error": str(e)}
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+
+class GeneratorHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        while True:
+            line = self.rfile.readline(MAX_REQUEST_SIZE + 1)
+            if not line:
+                return
+            if len(line) > MAX_REQUEST_SIZE:
+                self.respond({"ok": False, "error": "Request is too large"})
+                return
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                self.respond({"ok": False, "error": f"Invalid JSON request: {e}"})
+                continue
+            self.respond(handle_request(request) if isinstance(request, dict)
+                         else {"ok": False, "error": "Request must be an object"})
+
+    def respond(self, response: dict):
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+        self.wfile.flush()
+
+
+class GeneratorServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Handles every connection in its own thread"""
+    daemon_threads = True
+    # Unix socket clients fail with EAGAIN instead of waiting when the listen backlog is full
+    request_queue_size = 128
+
+
+def warm_up() -> None:
+    """Compiles templates and renders a throwaway project so every code path is loaded before the first request"""
+    compile_all()
+    generate({"name": "warm_up", "libraries": LIBRARIES_OPTIONAL})
+
+
+def remove_stale_socket(path: str) -> None:
+    """
+    Removes socket file of a server that is not running anymore
+    :raises ServerError: If the path is not a socket or a server accepts connections on it
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ServerError(f"{path} exists and is not a socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(path)
+        except OSError as e:
+            if e.errno != errno.ECONNREFUSED:
+                raise ServerError(f"Unable to check socket {path}: {e}")
+        else:
+            raise ServerError(f"Generator server is already running on {path}")
+    os.remove(path)
+
+
+def create_server(path: Optional[str] = None) -> GeneratorServer:
+    """
+    Creates generator server bound to a Unix socket that only the current user can access
+    A stale socket file of a previous server is replaced
+    :raises ServerError: If a server is running on the socket or the path is not a socket
+    """
+    path = socket_path(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    remove_stale_socket(path)
+    warm_up()
+    # Socket is created without group and other permissions, there is no window to connect before chmod
+    umask = os.umask(0o077)
+    try:
+        server = GeneratorServer(path, GeneratorHandler)
+    finally:
+        os.umask(umask)
+    os.chmod(path, 0o600)
+    return server
+
+
+def serve(path: Optional[str] = None) -> None:
+    """Serves generation requests until interrupted"""
+    server = create_server(path)
+    # Socket of a newer server on the same path is kept
+    inode = os.stat(server.server_address).st_ino
+    success(f"Serving on {server.server_address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            if os.stat(server.server_address).st_ino == inode:
+                os.remove(server.server_address)
+        except FileNotFoundError:
+            pass
+
+
+def request(config: dict, output: str = FILES_OUTPUT, path: Optional[str] = None,
+            timeout: Optional[float] = None) -> dict:
+    """
+    Sends a generation request to the server, file contents and archives are decoded
+    :return: {"ok": True, "files": {path: bytes}} | {"ok": True, "archive": bytes} | {"ok": False, "error": str}
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path(path))
+        client.sendall(json.dumps({"config": config, "output": output}).encode() + b"\n")
+        with client.makefile("rb") as stream:
+            response = json.loads(stream.readline())
+    if "files" in response:
+        response["files"] = {name: base64.b64decode(content) for name, content in response["files"].items()}
+    if "archive" in response:
+        response["archive"] = base64.b64decode(response["archive"])
+    return response
@@ -0,0 +1,170 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+
+import yaml
+
+from django_cli.core.template import compile_all
+from django_cli.core.yaml_file import load_config_file
+from django_cli.const import YAML_PARSE_ERROR_MSG
+from django_cli.setup_project.handler import create_state
+from django_cli.utils import success, error, log
+
+SPEC_EXTENSIONS = (".yaml", ".yml")
+
+
+@dataclass
+class BatchSpec:
+    """
+    Project spec of a batch
+    :arg
+        source: Spec file and document index, I.E `services.yaml#2`
+        config: Parsed config, None if the document could not be parsed
+        error: Parse error
+    """
+    source: str
+    config: Optional[dict] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchResult:
+    """
+    Result of a generated project
+    :arg
+        source: Spec source
+        name: Project name
+        target: Project root directory
+        ok: Project was generated
+        error: Failure reason
+        files: Number of written files
+        seconds: Generation time
+    """
+    source: str
+    name: str = ""
+    target: str = ""
+    ok: bool = False
+    error: str = ""
+    files: int = 0
+    seconds: float = 0.0
+
+
+def spec_files(path: str) -> List[str]:
+    """Returns spec files, a directory is searched recursively"""
+    if not os.path.isdir(path):
+        return [path]
+    files = []
+    for root, _, names in os.walk(path):
+        files += [os.path.join(root, name) for name in names if name.endswith(SPEC_EXTENSIONS)]
+    return sorted(files)
+
+
+def load_specs(path: str) -> List[BatchSpec]:
+    """
+    Loads project specs from a multi document YAML file or a directory of YAML files
+    :param path: Spec file or directory
+    :return: List[BatchSpec]
+    """
+    specs = []
+    for file_name in spec_files(path):
+        try:
+            documents = load_config_file(file_name)
+        except (OSError, yaml.YAMLError) as e:
+            specs.append(BatchSpec(source=file_name, error=f"{YAML_PARSE_ERROR_MSG}- {e}"))
+            continue
+        for index, document in enumerate(documents):
+            if document is None:
+                continue
+            source = f"{file_name}#{index + 1}" if len(documents) > 1 else file_name
+            if not isinstance(document, dict):
+                specs.append(BatchSpec(source=source, error=YAML_PARSE_ERROR_MSG))
+                continue
+            specs.append(BatchSpec(source=source, config=document))
+    return specs
+
+
+def project_directory(config: dict) -> str:
+    """Directory name of a project, same as the normalized project name"""
+    return str(config.get("name") or "").replace(" ", "_")
+
+
+def valid_project_name(name: str) -> bool:
+    """
+    Normalized project name is the Python package of the project and its directory under the output directory,
+    An identifier never contains path separators or `..`
+    """
+    return name.replace(" ", "_").isidentifier()
+
+
+def generate_project(spec: BatchSpec, target: str) -> BatchResult:
+    """Generates project of a spec into target directory, it never raises"""
+    start = time.perf_counter()
+    result = BatchResult(source=spec.source, name=str((spec.config or {}).get("name") or ""), target=target)
+    try:
+        state = create_state(spec.config, strict=True)
+        os.makedirs(target, exist_ok=True)
+        result.files = len(state.write_project(target))
+        result.ok = True
+    except FileExistsError as e:
+        result.error = f"Project already exists: {e}"
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _generate(args) -> BatchResult:
+    return generate_project(*args)
+
+
+def run_batch(specs: List[BatchSpec], out: str, workers: Optional[int] = None) -> List[BatchResult]:
+    """
+    Generates projects of specs in parallel, each project into `out/<project name>`
+    Templates are compiled once before the pool starts and once per worker at most
+    :param specs: Project specs
+    :param out: Output directory
+    :param workers: Number of worker processes, defaults to the number of CPUs
+    :return: List[BatchResult], in the order of specs
+    """
+    compile_all()
+    results = [None] * len(specs)
+    jobs = []
+    targets = {}
+    for index, spec in enumerate(specs):
+        if spec.error:
+            results[index] = BatchResult(source=spec.source, error=spec.error)
+            continue
+        directory = project_directory(spec.config)
+        if not directory:
+            results[index] = BatchResult(source=spec.source, error="Project name is required")
+            continue
+        if not valid_project_name(directory):
+            results[index] = BatchResult(source=spec.source, name=str(spec.config["name"]),
+                                         error=f"Invalid project name `{spec.config['name']}`, "
+                                               f"it must be a Python identifier, spaces are replaced with `_`")
+            continue
+        if directory in targets:
+            results[index] = BatchResult(source=spec.source, name=spec.config["name"],
+                                         error=f"Duplicate project name, also used by {targets[directory]}")
+            continue
+        targets[directory] = spec.source
+        jobs.append((index, (spec, os.path.join(out, directory))))
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers, initializer=compile_all) as executor:
+            for (index, _), result in zip(jobs, executor.map(_generate, [job for _, job in jobs])):
+                results[index] = result
+    return results
+
+
+def log_batch_summary(results: List[BatchResult]) -> None:
+    """Logs per project result and totals"""
+    for result in results:
+        if result.ok:
+            success(f"OK      {result.name} -> {result.target} [{result.files} files, {result.seconds:.3f}s]")
+        else:
+            error(f"FAILED  {result.name or result.source} - {result.error}")
+    failed = len([result for result in results if not result.ok])
+    log(f"{len(results) - failed} generated, {failed} failed")
@@ -0,0 +1,227 @@
+import copy
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from django_cli.config import SQLITE, LOC_MEM_CACHE
+from django_cli.core.filemap import commit_file_map
+from django_cli.setup_project.handler import create_state
+from django_cli.setup_project.model import SetupProjectState
+from django_cli.utils import execute, log, success, error
+
+# Phases of a cold start in the order they run, `process` is the wall time of the whole process
+PHASES = ["settings_import", "django_setup", "wsgi_import", "asgi_import", "first_request", "check", "process"]
+PERCENTILES = [50, 90, 99]
+BASELINE = "baseline"
+
+# Runs in a fresh interpreter inside the source directory of the generated project,
+# django-cli is not imported so it does not add to the measured process
+SAMPLE_SCRIPT = """
+import importlib
+import io
+import json
+import os
+import sys
+import time
+
+root, settings_module, path = sys.argv[1:4]
+from dotenv import load_dotenv
+load_dotenv(os.path.join(root, ".env"), override=True)
+os.environ["DJANGO_SETTINGS_MODULE"] = settings_module
+package = settings_module.rpartition(".")[0]
+timings = {}
+
+
+def timed(phase, func):
+    start = time.perf_counter()
+    result = func()
+    timings[phase] = time.perf_counter() - start
+    return result
+
+
+timed("settings_import", lambda: importlib.import_module(settings_module))
+timed("django_setup", lambda: importlib.import_module("django").setup())
+timed("wsgi_import", lambda: importlib.import_module(package + ".wsgi"))
+timed("asgi_import", lambda: importlib.import_module(package + ".asgi"))
+from django.test import Client
+from django.core.management import call_command
+response = timed("first_request", lambda: Client().get(path))
+timed("check", lambda: call_command("check", stdout=io.StringIO()))
+print(json.dumps({"timings": timings, "status": response.status_code}))
+"""
+
+
+class BenchError(RuntimeError):
+    """Raised when a generated project fails to start"""
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Percentile with linear interpolation between the closest ranks"""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+@dataclass
+class BenchResult:
+    """
+    Cold start measurements of a generated project
+    :arg
+        name: `baseline`, a library or the project name
+        libraries: Libraries of the project
+        samples: Seconds of each phase, one dict per started process
+        status: Status code of the first request
+        error: Failure reason, the project could not be generated or started
+    """
+    name: str
+    libraries: List[str] = field(default_factory=list)
+    samples: List[Dict[str, float]] = field(default_factory=list)
+    status: Optional[int] = None
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Percentiles of each phase, I.E `{"process": {"p50": 0.41, "p90": 0.45, "p99": 0.46}}`"""
+        return {phase: {f"p{q}": percentile([sample[phase] for sample in self.samples], q) for q in PERCENTILES}
+                for phase in PHASES if self.samples and all(phase in sample for sample in self.samples)}
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "libraries": self.libraries, "ok": self.ok, "error": self.error,
+                "status": self.status, "runs": len(self.samples), "summary": self.summary()}
+
+
+def bench_config(config: dict, libraries: Optional[List[str]] = None) -> dict:
+    """
+    Project config of a benchmark, database is replaced with sqlite without replicas and cache with local memory
+    so the project starts without external services
+    :param config: setup.yaml data
+    :param libraries: Replaces libraries of the config
+    """
+    config = copy.deepcopy(dict(config))
+    config.pop("required", None)
+    config["database"] = {"engine": SQLITE, "name": "db.sqlite3"}
+    config.pop("replicas", None)
+    # Sessions, cache middleware, prefixes and timeouts are kept, they are part of the measured project
+    if config.get("cache"):
+        config["cache"] = local_cache(config["cache"])
+    if config.get("caches"):
+        config["caches"] = [local_cache(cache) for cache in config["caches"]]
+    if libraries is not None:
+        config["libraries"] = list(libraries)
+    return config
+
+
+def local_cache(cache: dict) -> dict:
+    """Cache config with a local memory backend, cache settings of the config are kept"""
+    if not isinstance(cache, dict):
+        return cache
+    cache = {key: value for key, value in dict(cache).items() if key not in ("backend", "location", "option")}
+    return {**cache, "backend": LOC_MEM_CACHE}
+
+
+def run_sample(target: str, settings_module: str, path: str) -> dict:
+    """
+    Starts the generated project once in a new interpreter
+    :raises BenchError: If the project fails to start
+    :return: Seconds of each phase and the first request status code
+    """
+    source = os.path.join(target, SetupProjectState.SOURCE_FOLDER)
+    start = time.perf_counter()
+    result = execute([sys.executable, "-c", SAMPLE_SCRIPT, os.path.abspath(target), settings_module, path],
+                     cwd=source, echo=False)
+    seconds = time.perf_counter() - start
+    if not result.ok or not result.stdout:
+        message = result.stderr[-1] if result.stderr else f"Exited with code {result.returncode}"
+        if message.startswith("ModuleNotFoundError"):
+            message += ", install libraries of the project into this environment"
+        raise BenchError(message)
+    sample = json.loads(result.stdout[-1])
+    sample["timings"]["process"] = seconds
+    return sample
+
+
+def bench_project(config: dict, name: str, repeat: int, path: str,
+                  libraries: Optional[List[str]] = None) -> BenchResult:
+    """
+    Generates the project of a config into a temporary directory and starts it `repeat` times
+    :param config: setup.yaml data
+    :param name: Result name
+    :param repeat: Number of cold starts
+    :param path: Path of the first request
+    :param libraries: Replaces libraries of the config, See `bench_config`
+    :return: BenchResult, it never raises
+    """
+    config = bench_config(config, libraries)
+    result = BenchResult(name=name, libraries=list(config.get("libraries") or []))
+    with tempfile.TemporaryDirectory() as target:
+        try:
+            state = create_state(config, strict=True)
+            commit_file_map(state.render_project(), target)
+            settings_module = f"{state.normalize_name()}.settings"
+            for _ in range(repeat):
+                sample = run_sample(target, settings_module, path)
+                result.samples.append(sample["timings"])
+                result.status = sample["status"]
+        except Exception as e:
+            result.error = str(e) if isinstance(e, BenchError) else f"{type(e).__name__}: {e}"
+    return result
+
+
+def bench_libraries(config: dict, repeat: int, path: str, per_library: bool = False) -> List[BenchResult]:
+    """
+    Measures cold start of the project,
+    With `per_library` a project without libraries and a project per library are measured too
+    :return: List[BenchResult], the project is the last result
+    """
+    libraries = list(config.get("libraries") or [])
+    variants = []
+    if per_library:
+        variants = [(BASELINE, [])] + [(library, [library]) for library in libraries]
+    variants.append((str(config.get("name") or "project"), None))
+
+    results = []
+    for name, variant in variants:
+        log(f"Starting {name} {repeat} times", err=True)
+        results.append(bench_project(config, name, repeat, path, variant))
+    return results
+
+
+def bench_table(results: List[BenchResult]) -> str:
+    """Percentile table of each result in milliseconds, differences are against the baseline median"""
+    baseline = next((result for result in results if result.name == BASELINE and result.ok), None)
+    base = baseline.summary() if baseline else {}
+    lines = []
+    for result in results:
+        libraries = f" [{', '.join(result.libraries)}]" if result.libraries else ""
+        lines.append(f"{result.name}{libraries}")
+        if not result.ok:
+            lines.append(f"    {result.error}")
+            continue
+        lines.append(f"    {'Phase':<16}{'p50':>10}{'p90':>10}{'p99':>10}{'vs base':>10}")
+        for phase, values in result.summary().items():
+            delta = ""
+            if base and result is not baseline:
+                delta = f"{(values['p50'] - base[phase]['p50']) * 1000:+.1f}"
+            lines.append(f"    {phase:<16}" + "".join(f"{values[f'p{q}'] * 1000:>10.1f}" for q in PERCENTILES)
+                         + f"{delta:>10}")
+        lines.append(f"    First request status: {result.status}")
+    return "\n".join(lines)
+
+
+def log_bench_summary(results: List[BenchResult]) -> None:
+    """Logs the percentile table and failed projects"""
+    log(bench_table(results))
+    for result in results:
+        if result.ok:
+            success(f"{result.name}: {len(result.samples)} runs")
+        else:
+            error(f"{result.name}: {result.error}")
@@ -1,23 +1,134 @@
+import copy
 import os
 from typing import Optional
 
+import click
 import yaml
 
-from django_cli.config import DATABASE_DRIVERS, LINKED_LIBRARY
+from django_cli.config import CACHE_DRIVERS
 from django_cli.const import (GENERATE_LOG_SUCCESS_MSG,
                               YAML_PARSE_ERROR_MSG,
                               FILE_NOT_FOUND,
                               CONFIG_FILE_NAME,
-                              LOG_SUCCESS_PROJECT_COMPLETE, DEFAULT_REQUIREMENT_FILE)
+                              LOG_SUCCESS_PROJECT_COMPLETE, DEFAULT_REQUIREMENT_FILE,
+                              LOG_SUCCESS_PROJECT_UPDATED, LOG_SUCCESS_PROJECT_ARCHIVED,
+                              FILE_EXIST_ERROR, LOG_RUN_RESUME)
 from django_cli.core.BaseCommand import BaseCommand, pre_execute
+from django_cli.core.filemap import archive_format, STDOUT_ARCHIVE
+from django_cli.core.yaml_file import load_config_file
 from django_cli.setup_project.model import (SetupProjectState,
                                             DBConfig,
+                                            ReplicaConfig,
                                             CacheConfig,
+                                            CacheAliasConfig,
                                             DefaultDBConfig)
+from django_cli.setup_project.resolver import resolve_libraries, LibraryCycleError
 from django_cli.setup_project.prompt import PromptConfig
 from django_cli.utils import error, success
 
 
+class ConfigError(ValueError):
+    """Raised when project config data is invalid"""
+
+
+def create_state(dict_data: dict, strict: bool = False) -> SetupProjectState:
+    """
+    Creates Project State from YAML / CLI config data, config data is not modified
+    :param dict_data: dict
+    :param strict: Raise ConfigError for invalid config data instead of logging the error and using defaults
+    :return: SetupProjectState
+    """
+    dict_data = copy.deepcopy(dict(dict_data))
+    # Default Dataset
+    database_config = copy.deepcopy(DefaultDBConfig)
+    cache_config = None
+    replica_configs = []
+    cache_configs = []
+    # Dictionary Dataset
+    dict_data.pop("required", None)
+    db: Optional[dict] = dict_data.pop("database", None)
+    cache: Optional[dict] = dict_data.pop("cache", None)
+    replicas: Optional[list] = dict_data.pop("replicas", None) or []
+    caches: Optional[list] = dict_data.pop("caches", None) or []
+    libraries: Optional[list] = dict_data.get("libraries") or []
+
+    if strict and not dict_data.get("name"):
+        raise ConfigError("Invalid Config Data - Project name is required")
+
+    # If Database exists in dictionary, Create Database Config
+    try:
+        # Create Database Config
+        if db:
+            database_config = DBConfig(**db)
+        # Create Cache Config
+        if cache:
+            cache_config = CacheConfig(**cache)
+        # Create Replica Configs, fields of the primary database are the defaults
+        for replica in replicas:
+            if not isinstance(replica, dict):
+                raise TypeError(f"replicas must be a list of database configs, got `{replica}`")
+            replica_configs.append(ReplicaConfig(**{**copy.deepcopy(database_config.get_dict()), **replica}))
+        # Create Cache Alias Configs, backend and location of the default cache are the defaults
+        for cache_alias in caches:
+            if not isinstance(cache_alias, dict):
+                raise TypeError(f"caches must be a list of cache configs, got `{cache_alias}`")
+            defaults = {key: getattr(cache_config, key) for key in ("backend", "location")} if cache_config else {}
+            cache_configs.append(CacheAliasConfig(**{"alias": cache_alias.get("alias"), **defaults, **cache_alias}))
+    except TypeError as t:
+        if strict:
+            raise ConfigError("Invalid Config Data - {}".format(t.__str__()))
+        error("Invalid Config Data - {}".format(t.__str__()))
+
+    # Django returns pooled connections to the pool after each request, they can not be persistent too
+    performance = database_config.performance
+    if performance and performance.pool and performance.conn_max_age:
+        message = "Invalid Config Data - database.performance.conn_max_age can not be used with pool"
+        if strict:
+            raise ConfigError(message)
+        error(message)
+
+    # Database driver is resolved for the primary database engine
+    engines = {replica.get_engine_name() for replica in replica_configs} - {database_config.get_engine_name()}
+    if engines:
+        message = f"Invalid Config Data - replicas must use the engine of the database, got {', '.join(engines)}"
+        if strict:
+            raise ConfigError(message)
+        error(message)
+
+    # Django requires a default cache, sessions and pages are stored in a single cache
+    messages = []
+    if cache_configs and not cache_config:
+        messages.append("caches can not be used without cache")
+    aliases = [cache.alias.lower() for cache in cache_configs]
+    if len(set(aliases)) != len(aliases):
+        messages.append("caches.alias must be unique")
+    for flag in ("sessions", "middleware"):
+        if len([cache for cache in [cache_config, *cache_configs] if cache and getattr(cache, flag)]) > 1:
+            messages.append(f"cache.{flag} can be enabled for a single cache")
+    for message in messages:
+        if strict:
+            raise ConfigError(f"Invalid Config Data - {message}")
+        error(f"Invalid Config Data - {message}")
+    if cache_configs and not cache_config:
+        cache_configs = []
+
+    # Client libraries of cache backends are installed with the libraries
+    cache_drivers = [CACHE_DRIVERS[cache.get_backend_name()] for cache in [cache_config, *cache_configs]
+                     if cache and cache.get_backend_name() in CACHE_DRIVERS]
+
+    # Linked libraries and database driver are required by the selected libraries
+    try:
+        resolution = resolve_libraries(libraries + cache_drivers, engine=database_config.get_engine_name(),
+                                       pool=bool(database_config.get_performance().get("pool")))
+    except LibraryCycleError as e:
+        raise ConfigError(f"Invalid Config Data - {e}")
+    required = [lib for lib in resolution.installable if lib not in libraries]
+
+    # Set State
+    return SetupProjectState(**dict_data, database=database_config, replicas=replica_configs, cache=cache_config,
+                             caches=cache_configs, required=required)
+
+
 class ProjectInitializer(BaseCommand):
     state = None
 
@@ -31,56 +142,24 @@ class ProjectInitializer(BaseCommand):
         :param dict_data: dict
         :return:
         """
-        # Default Dataset
-        database_config = DefaultDBConfig
-        cache_config = None
-        # Dictionary Dataset
-        dict_data.pop("required", None)
-        required = []
-        db: Optional[dict] = dict_data.pop("database", None)
-        cache: Optional[dict] = dict_data.pop("cache", None)
-        libraries: Optional[list] = dict_data.get("libraries", [])
-
-        # Add required library to the required library list
-        required = required + [LINKED_LIBRARY[item] for item in libraries if item in LINKED_LIBRARY]
-
-        # If Database exists in dictionary, Create Database Config
-        try:
-            # Create Database Config
-            if db:
-                database_config = DBConfig(**db)
-                required += [val for key, val in DATABASE_DRIVERS.items() if key == database_config.engine]
-            # Create Cache Config
-            if cache:
-                cache_config = CacheConfig(**cache)
-        except TypeError as t:
-            error("Invalid Config Data - {}".format(t.__str__()))
-
-        # Set State
-        required = set(required)
-        self.state = SetupProjectState(**dict_data, database=database_config, cache=cache_config,
-                                       required=list(required))
+        self.state = create_state(dict_data)
 
     @staticmethod
     def get_yaml_config(file_name):
-        # Parse YAML File
+        # Parse YAML File, Keys are lowercased
         try:
-            with open(file_name, 'r') as stream:
-                try:
-                    # Safe Load
-                    parsed_yaml = yaml.safe_load(stream)
-                    if parsed_yaml:
-                        parsed_yaml = {k.lower(): v for k, v in parsed_yaml.items()}
-                    else:
-                        raise yaml.YAMLError
-                    # Return parsed yaml
-                    return parsed_yaml
-                except yaml.YAMLError or AttributeError:
-                    error(YAML_PARSE_ERROR_MSG)
-                    return {}
+            documents = load_config_file(file_name)
         except FileNotFoundError:
             error(FILE_NOT_FOUND)
             return {}
+        except yaml.YAMLError:
+            error(YAML_PARSE_ERROR_MSG)
+            return {}
+        # A config file is a single non empty mapping
+        if len(documents) != 1 or not isinstance(documents[0], dict) or not documents[0]:
+            error(YAML_PARSE_ERROR_MSG)
+            return {}
+        return documents[0]
 
     @pre_execute()
     def enquire(self):
@@ -104,12 +183,33 @@ class ProjectInitializer(BaseCommand):
         success(GENERATE_LOG_SUCCESS_MSG)
 
     @BaseCommand.execute
-    def start_project(self):
-        """Starts Django Project"""
-        self.state.create_project()
+    def start_project(self, update=False, force=False, archive=None, resume=False, **install_options):
+        """
+        Starts Django Project
+        :param update: Regenerate existing project, only changed files are written
+        :param force: Overwrite files that were edited by hand in update mode
+        :param archive: Archive file name or `-` for stdout, project is archived instead of written to disk
+        :param resume: Continue an interrupted run, steps that are done with the same inputs are skipped
+        """
+        if archive:
+            with click.open_file(archive, "wb", atomic=archive != STDOUT_ARCHIVE) as stream:
+                self.state.archive_project(stream, archive_format(archive))
+            success(LOG_SUCCESS_PROJECT_ARCHIVED)
+            return
+        if update:
+            self.state.update_project(force=force, **install_options)
+            success(LOG_SUCCESS_PROJECT_UPDATED)
+            return
+        failed = self.state.create_project(resume=resume, **install_options)
+        if failed is not None and isinstance(failed.error, FileExistsError):
+            raise click.ClickException(FILE_EXIST_ERROR)
+        if failed is not None:
+            reason = f" - {failed.error}" if failed.error else ""
+            raise click.ClickException(f"{failed.title or failed.name} did not finish{reason}, "
+                                       f"{LOG_RUN_RESUME}")
         success(LOG_SUCCESS_PROJECT_COMPLETE)
 
     @BaseCommand.execute
-    def install_libraries(self, req_file=DEFAULT_REQUIREMENT_FILE):
+    def install_libraries(self, req_file=DEFAULT_REQUIREMENT_FILE, **install_options):
         """Install Libraries"""
-        self.state.install_libraries(req_file=req_file)
+        self.state.install_libraries(req_file=req_file, **install_options)
@@ -0,0 +1,299 @@
+import os
+import re
+from typing import Iterable, List, Optional, Dict
+
+import click
+from packaging.requirements import Requirement, InvalidRequirement
+from packaging.utils import parse_wheel_filename, InvalidWheelFilename
+from packaging.version import Version
+
+from django_cli.config import LIBRARIES_OPTIONAL
+from django_cli.const import (DEFAULT_REQUIREMENT_FILE,
+                              LOG_LIBRARIES_SATISFIED,
+                              WHEELHOUSE_ENV,
+                              DEFAULT_WHEELHOUSE,
+                              OFFLINE_WHEEL_MISSING,
+                              LOG_WHEELHOUSE_READY,
+                              INSTALL_FAILED)
+from django_cli.utils import (execute,
+                              execute_many,
+                              pip_name,
+                              log,
+                              success,
+                              error,
+                              CommandError,
+                              CommandResult)
+from django_cli.setup_project.resolver import default_resolver
+
+try:
+    from importlib import metadata
+except ImportError:  # pragma: no cover
+    import importlib_metadata as metadata
+
+REQUIREMENT_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+
+class OfflineInstallError(click.ClickException):
+    """Raised when an offline install needs a wheel that is not in the wheelhouse"""
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a distribution name (PEP 503), `Django_Filter` -> `django-filter`"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def requirement_name(requirement: str) -> Optional[str]:
+    """
+    Returns the normalized project name of a requirement specifier
+    :param requirement: str, I.E `django>=3.2`, `celery[redis]`
+    :return: Optional[str]
+    """
+    if requirement.strip().startswith(("-", "#")):
+        return None
+    match = REQUIREMENT_NAME.match(requirement)
+    return normalize_name(match.group(1)) if match else None
+
+
+def read_requirements(req_file: str = DEFAULT_REQUIREMENT_FILE) -> List[str]:
+    """Returns requirement lines of a requirements file, without comments and blank lines"""
+    if not os.path.isfile(req_file):
+        return []
+    with open(req_file, "r") as file:
+        lines = [line.split(" #")[0].strip() for line in file.readlines()]
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def merge_requirements(libraries: Iterable[str], pinned: Iterable[str] = ()) -> List[str]:
+    """
+    Merges libraries into a single install list,
+    Duplicate libraries and libraries that are already pinned are removed
+    :param libraries: Libraries to install
+    :param pinned: Requirements that will be installed from the requirements file
+    :return: List[str]
+    """
+    seen = {requirement_name(req) for req in pinned}
+    merged = []
+    for lib in libraries:
+        name = requirement_name(lib)
+        if not name or name in seen:
+            continue
+        seen.add(name)
+        merged.append(lib)
+    return merged
+
+
+def installed_distributions() -> Dict[str, "metadata.Distribution"]:
+    """Returns installed distributions mapped by their normalized name, first one on sys.path wins"""
+    distributions = {}
+    for dist in metadata.distributions():
+        name = dist.metadata["Name"]
+        if name:
+            distributions.setdefault(normalize_name(name), dist)
+    return distributions
+
+
+def _matches(requirement: Requirement, installed: Dict[str, "metadata.Distribution"]) -> bool:
+    dist = installed.get(normalize_name(requirement.name))
+    return dist is not None and requirement.specifier.contains(dist.version, prereleases=True)
+
+
+def is_satisfied(requirement: str, installed: Dict[str, "metadata.Distribution"]) -> bool:
+    """
+    Checks if a requirement is already installed at a compatible version,
+    Requested extras are satisfied when their dependencies are installed as well
+    :param requirement: Requirement specifier
+    :param installed: Installed distributions, see `installed_distributions`
+    :return: bool
+    """
+    try:
+        req = Requirement(requirement)
+    except InvalidRequirement:
+        return False
+    # Requirement is not meant for this environment
+    if req.marker and not req.marker.evaluate():
+        return True
+    if not _matches(req, installed):
+        return False
+    dist = installed[normalize_name(req.name)]
+    for extra in req.extras:
+        for dependency in dist.requires or []:
+            dep = Requirement(dependency)
+            if dep.marker and dep.marker.evaluate({"extra": extra}) and not _matches(dep, installed):
+                return False
+    return True
+
+
+def freeze_requirements(libraries: Iterable[str],
+                        installed: Optional[Dict[str, "metadata.Distribution"]] = None) -> List[str]:
+    """
+    Returns pinned requirements of the libraries and their transitive dependencies,
+    Only dependencies that apply to the current environment and the requested extras are followed
+    Libraries that are not installed are kept unpinned
+    :param libraries: Root requirement specifiers
+    :param installed: Installed distributions, see `installed_distributions`
+    :return: List[str], sorted by name
+    """
+    installed = installed_distributions() if installed is None else installed
+    pinned = {}
+    missing = []
+    visited = {}
+    queue = [(lib, True) for lib in libraries]
+    while queue:
+        requirement, root = queue.pop(0)
+        try:
+            req = Requirement(requirement)
+        except InvalidRequirement:
+            continue
+        name = normalize_name(req.name)
+        dist = installed.get(name)
+        if dist is None:
+            if root and requirement not in missing:
+                missing.append(requirement)
+            continue
+        extras = set(req.extras)
+        if name in visited and extras <= visited[name]:
+            continue
+        visited[name] = visited.get(name, set()) | extras
+        pinned[name] = f"{dist.metadata['Name']}=={dist.version}"
+        environments = [{"extra": extra} for extra in extras] + [{"extra": ""}]
+        for dependency in dist.requires or []:
+            dep = Requirement(dependency)
+            if not dep.marker or any(dep.marker.evaluate(env) for env in environments):
+                queue.append((str(dep).split(";")[0].strip(), False))
+    return [pinned[name] for name in sorted(pinned)] + missing
+
+
+def pending_requirements(requirements: Iterable[str],
+                         installed: Optional[Dict[str, "metadata.Distribution"]] = None) -> List[str]:
+    """Returns requirements that are missing or installed at a mismatched version"""
+    installed = installed_distributions() if installed is None else installed
+    return [req for req in requirements if not is_satisfied(req, installed)]
+
+
+def wheelhouse_dir(wheelhouse: Optional[str] = None) -> str:
+    """Returns the wheelhouse directory, `DJANGO_CLI_WHEELHOUSE` overrides the default location"""
+    return os.path.expanduser(wheelhouse or os.environ.get(WHEELHOUSE_ENV) or DEFAULT_WHEELHOUSE)
+
+
+def wheelhouse_index(wheelhouse: str) -> Dict[str, List[Version]]:
+    """Returns wheel versions in the wheelhouse mapped by their normalized project name"""
+    index = {}
+    if not os.path.isdir(wheelhouse):
+        return index
+    for file_name in os.listdir(wheelhouse):
+        if not file_name.endswith(".whl"):
+            continue
+        try:
+            name, version, _, _ = parse_wheel_filename(file_name)
+        except InvalidWheelFilename:
+            continue
+        index.setdefault(normalize_name(name), []).append(version)
+    return index
+
+
+def in_wheelhouse(requirement: str, index: Dict[str, List[Version]]) -> bool:
+    """Checks if the wheelhouse has a wheel that satisfies the requirement"""
+    try:
+        req = Requirement(requirement)
+    except InvalidRequirement:
+        return False
+    if req.marker and not req.marker.evaluate():
+        return True
+    versions = index.get(normalize_name(req.name), [])
+    return any(req.specifier.contains(version, prereleases=True) for version in versions)
+
+
+def wheelhouse_args(requirements: Iterable[str], wheelhouse: Optional[str] = None, offline: bool = False) -> List[str]:
+    """
+    Returns pip arguments to install requirements from the local wheelhouse,
+    The package index is only skipped when every requirement has a wheel
+    :raises OfflineInstallError: In offline mode, if any wheel is missing
+    """
+    wheelhouse = wheelhouse_dir(wheelhouse)
+    index = wheelhouse_index(wheelhouse)
+    missing = [req for req in requirements if not in_wheelhouse(req, index)]
+    if offline and missing:
+        raise OfflineInstallError(f"{OFFLINE_WHEEL_MISSING} [{wheelhouse}]: {', '.join(missing)}")
+    if not index:
+        return []
+    if missing:
+        return ["--find-links", wheelhouse]
+    return ["--no-index", "--find-links", wheelhouse]
+
+
+def batch_install_command(libraries: Iterable[str],
+                          req_file: str = DEFAULT_REQUIREMENT_FILE,
+                          skip_satisfied: bool = True,
+                          installed: Optional[Dict[str, "metadata.Distribution"]] = None,
+                          wheelhouse: Optional[str] = None,
+                          offline: bool = False) -> Optional[List[str]]:
+    """
+    Returns a single pip command that installs libraries and the requirements file in one resolver run
+    Returns None if there is nothing to install
+    """
+    has_requirements = os.path.isfile(req_file)
+    requirements = read_requirements(req_file) if has_requirements else []
+    libs = merge_requirements(libraries, requirements)
+    # Requirement file options (-e, -r, --index-url) can not be checked, pass the file as it is
+    use_file = has_requirements
+    if skip_satisfied:
+        installed = installed_distributions() if installed is None else installed
+        libs = pending_requirements(libs, installed)
+        if all(requirement_name(req) for req in requirements):
+            libs += pending_requirements(requirements, installed)
+            use_file = False
+
+    if not libs and not use_file:
+        return None
+    file_requirements = [req for req in requirements if requirement_name(req)] if use_file else []
+    args = [pip_name(), "install",
+            *wheelhouse_args(libs + file_requirements, wheelhouse=wheelhouse, offline=offline),
+            *libs]
+    if use_file:
+        args += ["-r", req_file]
+    return args
+
+
+def run_pip(args: List[str], timeout: Optional[float] = None) -> bool:
+    """Runs a pip command, failures are reported without aborting the caller"""
+    try:
+        result = execute(args, timeout=timeout)
+    except CommandError as e:
+        error(f"{INSTALL_FAILED} - {e.message}")
+        return False
+    if not result.ok:
+        error(f"{INSTALL_FAILED} - `{result.command}` exited with code {result.returncode}")
+    return result.ok
+
+
+def batch_install(libraries: Iterable[str], req_file: str = DEFAULT_REQUIREMENT_FILE,
+                  skip_satisfied: bool = True, wheelhouse: Optional[str] = None, offline: bool = False,
+                  timeout: Optional[float] = None) -> bool:
+    """Install libraries and requirements file using one pip call, Returns False if pip failed"""
+    command = batch_install_command(libraries, req_file=req_file, skip_satisfied=skip_satisfied,
+                                    wheelhouse=wheelhouse, offline=offline)
+    if command:
+        return run_pip(command, timeout=timeout)
+    log(LOG_LIBRARIES_SATISFIED)
+    return True
+
+
+def default_wheelhouse_libraries() -> List[str]:
+    """Libraries that are cached in the wheelhouse by default, optional libraries and their linked libraries"""
+    return merge_requirements(["django", *default_resolver().expand(LIBRARIES_OPTIONAL)])
+
+
+def fill_wheelhouse(libraries: Optional[Iterable[str]] = None, wheelhouse: Optional[str] = None,
+                    workers: int = 4) -> List[CommandResult]:
+    """Builds wheels of the libraries and their dependencies into the wheelhouse, libraries are built concurrently"""
+    wheelhouse = wheelhouse_dir(wheelhouse)
+    os.makedirs(wheelhouse, exist_ok=True)
+    libs = list(libraries) if libraries else default_wheelhouse_libraries()
+    commands = [[pip_name(), "wheel", "--wheel-dir", wheelhouse, "--find-links", wheelhouse, lib] for lib in libs]
+    results = execute_many(commands, workers=workers)
+    failed = [lib for lib, result in zip(libs, results) if not result.ok]
+    if failed:
+        error(f"{INSTALL_FAILED} - Unable to build wheels: {', '.join(failed)}")
+    else:
+        success(f"{LOG_WHEELHOUSE_READY} [{wheelhouse}]")
+    return results
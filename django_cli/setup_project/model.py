@@ -1,15 +1,41 @@
+import copy
 import dataclasses
+import itertools
 import os
 import pathlib
+import posixpath
 from abc import ABC
 from dataclasses import dataclass
 from typing import Optional, List
 
-import yaml
-
-from django_cli.config import DBEngine, INSTALLED_APP, MIDDLEWARE, EXTRA, LINKED_FILES
-from django_cli.const import FILE_EXIST_ERROR, DEFAULT_REQUIREMENT_FILE
-from django_cli.utils import create_secret_key, log, execute, pip_name, error
+from django_cli.config import DBEngine, CACHE_BACKED, CACHE_OPTIONS, DATABASE_PERFORMANCE, PROJECT_LIBRARIES
+from django_cli.core.filemap import commit_file_map, check_file_map, write_file_map, write_archive
+from django_cli.core.events import emit
+from django_cli.core.journal import Journal
+from django_cli.core.scheduler import Scheduler, Step, RUNNING, RESUMED, FAILED
+from django_cli.core.template import compile_template
+from django_cli.core.yaml_file import dump as yaml_dump
+from django_cli.core.manifest import (build_manifest,
+                                      manifest_bytes,
+                                      read_manifest,
+                                      update_file_map,
+                                      changed_fields,
+                                      atomic_write,
+                                      value_hash)
+from django_cli.const import (DEFAULT_REQUIREMENT_FILE,
+                              MANIFEST_FILE,
+                              JOURNAL_FILE,
+                              LOG_MODIFIED_BY_USER,
+                              LOG_PROJECT_UP_TO_DATE)
+from django_cli.setup_project.installer import (batch_install,
+                                                pending_requirements,
+                                                wheelhouse_args,
+                                                read_requirements,
+                                                requirement_name,
+                                                run_pip,
+                                                freeze_requirements)
+from django_cli.setup_project.resolver import resolve_libraries
+from django_cli.utils import create_secret_key, log, pip_name, error, success, warning
 
 PATH = pathlib.Path(__file__).resolve().parent
 
@@ -18,19 +44,29 @@ ENV_FILE = ".env"
 STATIC_FILE_SETTINGS = """STATICFILES_DIRS = [BASE_DIR / 'static',]"""
 MEDIA_FILE_SETTINGS = """MEDIA_ROOT = BASE_DIR / 'media'"""
 TEMPLATE_SETTINGS = """BASE_DIR / "template\""""
-
-
-def safe_create_dir(func):
-    """A decorator that enables to run function that has directory creation responsibility, without throwing
-    errors """
-
-    def wrapper(self, *args, **kwargs):
-        try:
-            func(self, *args, **kwargs)
-        except FileExistsError:
-            error(FILE_EXIST_ERROR)
-
-    return wrapper
+SESSION_CACHE_SETTINGS = """SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = '{alias}'"""
+CACHE_MIDDLEWARE_SETTINGS = """MIDDLEWARE = ['django.middleware.cache.UpdateCacheMiddleware', *MIDDLEWARE,
+              'django.middleware.cache.FetchFromCacheMiddleware']
+CACHE_MIDDLEWARE_ALIAS = '{alias}'
+CACHE_MIDDLEWARE_SECONDS = {seconds}"""
+CACHED_TEMPLATE_SETTINGS = """# Templates are compiled once per process, DEBUG builds read templates on every render
+if os.environ.get('DEBUG', '').lower() not in ('y', 'yes', 'true', '1', 'on'):
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]"""
+# Seconds of pages cached by the cache middleware when the cache has no timeout, Django's default
+CACHE_MIDDLEWARE_SECONDS = 600
+# Full engine path -> engine name of setup.yaml
+ENGINE_NAMES = {path: name for name, path in DBEngine.items()}
+# Full backend path -> backend name of setup.yaml
+BACKEND_NAMES = {path: name for name, path in CACHE_BACKED.items()}
+# Strings of prompt answers and environment variables that enable a setting
+TRUE_VALUES = ("y", "yes", "true", "1", "on")
 
 
 @dataclass
@@ -50,9 +86,14 @@ class DataClassAbstract(ABC):
         """
         _dict = {}
         for key in self.__dict__:
+            # Private attributes are caches, I.E resolved libraries
+            if key.startswith("_"):
+                continue
             if issubclass(type(self.__dict__[key]), DataClassAbstract):
                 _dict[key] = self.__dict__[key].get_dict()
-
+            elif isinstance(self.__dict__[key], list):
+                _dict[key] = [item.get_dict() if isinstance(item, DataClassAbstract) else item
+                              for item in self.__dict__[key]]
             else:
                 _dict[key] = self.__dict__[key]
         return _dict
@@ -76,6 +117,38 @@ class DataClassAbstract(ABC):
                     self.__dict__["env"][data] = os.environ.get(env[data][1:], "")
 
 
+@dataclass(init=False)
+class DBPerformanceConfig(DataClassAbstract):
+    """
+    Database Connection Config, unset fields use the defaults of the database engine, See `DATABASE_PERFORMANCE`
+    """
+    conn_max_age: Optional[int] = None
+    conn_health_checks: Optional[bool] = None
+    disable_server_side_cursors: Optional[bool] = None
+    pool: Optional[bool] = None
+    pool_min_size: Optional[int] = None
+    pool_max_size: Optional[int] = None
+
+    def __post_init__(self):
+        super().__post_init__()
+        # Prompt answers and `$VAR` values are strings, empty values use engine defaults
+        for f in dataclasses.fields(self):
+            value = self.__dict__.get(f.name)
+            if isinstance(value, str):
+                value = value.strip() or None
+                if value is not None and f.type == Optional[bool]:
+                    value = value.lower() in TRUE_VALUES
+                elif value is not None:
+                    try:
+                        value = int(value)
+                    except ValueError:
+                        raise TypeError(f"database.performance.{f.name} must be an integer, got `{value}`")
+            if value is None:
+                self.__dict__.pop(f.name, None)
+            else:
+                self.__dict__[f.name] = value
+
+
 @dataclass(init=False)
 class DBConfig(DataClassAbstract):
     """
@@ -88,15 +161,116 @@ class DBConfig(DataClassAbstract):
     host: str = ""
     port: str = ""
     option: Optional[dict] = None
+    performance: Optional[DBPerformanceConfig] = None
+
+    def __post_init__(self):
+        super().__post_init__()
+        if isinstance(self.performance, dict):
+            self.performance = DBPerformanceConfig(**self.performance)
+
+    def get_engine_name(self):
+        """Engine name of setup.yaml, full engine paths are converted I.E `django.db.backends.sqlite3` -> `sqlite3`"""
+        return ENGINE_NAMES.get(self.engine, self.engine)
+
+    def get_performance(self):
+        """
+        Connection settings of the engine, fields of `performance` override engine defaults
+        Settings that the engine does not support are dropped, persistent connections are disabled for a pool
+        :return: dict
+        """
+        defaults = DATABASE_PERFORMANCE.get(self.get_engine_name(), {})
+        performance = self.performance.get_dict() if self.performance else {}
+        settings = {key: performance.get(key, default) for key, default in defaults.items()}
+        if settings.get("pool"):
+            settings["conn_max_age"] = 0
+        return settings
+
+    def get_env_settings(self):
+        """
+        Connection settings that are written into .env, pool sizes are written when the pool is enabled
+        :return: dict, I.E {"CONN_MAX_AGE": 60, "CONN_HEALTH_CHECKS": True}
+        """
+        performance = self.get_performance()
+        pool = performance.pop("pool", False)
+        return {key.upper(): value for key, value in performance.items() if pool or not key.startswith("pool_")}
+
+
+@dataclass(init=False)
+class ReplicaConfig(DBConfig):
+    """
+    Read Replica Config, missing fields are copied from the primary database
+    Reads are spread over replicas by their weight, a replica with weight 2 serves twice the reads
+    """
+    engine: str = ""
+    weight: int = 1
+
+    def __post_init__(self):
+        super().__post_init__()
+        try:
+            self.weight = int(self.weight)
+        except (TypeError, ValueError):
+            raise TypeError(f"replicas.weight must be an integer, got `{self.weight}`")
+        if self.weight < 1:
+            raise TypeError(f"replicas.weight must be at least 1, got `{self.weight}`")
 
 
 @dataclass(init=False)
 class CacheConfig(DataClassAbstract):
     """
-    Cache Config
+    Cache Config,
+    `sessions` stores sessions in the cache and `middleware` caches every page, See `SetupProjectState.get_cache`
     """
     backend: str = ""
     location: str = ""
+    key_prefix: str = ""
+    timeout: Optional[int] = None
+    option: Optional[dict] = None
+    sessions: bool = False
+    middleware: bool = False
+
+    def __post_init__(self):
+        super().__post_init__()
+        # Prompt answers and `$VAR` values are strings, empty values are unset
+        for key in ("key_prefix", "timeout", "sessions", "middleware"):
+            value = self.__dict__.get(key)
+            if isinstance(value, str):
+                value = value.strip() or None
+                if value is None or key == "key_prefix":
+                    pass
+                elif key == "timeout":
+                    try:
+                        value = int(value)
+                    except ValueError:
+                        raise TypeError(f"cache.timeout must be an integer, got `{value}`")
+                else:
+                    value = value.lower() in TRUE_VALUES
+            if value is None or value is False:
+                self.__dict__.pop(key, None)
+            else:
+                self.__dict__[key] = value
+
+    def get_backend_name(self):
+        """Backend name of setup.yaml, full backend paths are converted"""
+        return BACKEND_NAMES.get(self.backend, self.backend)
+
+    def get_options(self):
+        """OPTIONS of the backend, fields of `option` override backend defaults, See `CACHE_OPTIONS`"""
+        return {**CACHE_OPTIONS.get(self.get_backend_name(), {}), **(self.option or {})}
+
+
+@dataclass(init=False)
+class CacheAliasConfig(CacheConfig):
+    """
+    Cache Alias Config, an additional entry of CACHES
+    Backend and location are copied from the default cache when they are missing
+    """
+    alias: str
+
+    def __post_init__(self):
+        super().__post_init__()
+        alias = self.__dict__.get("alias")
+        if not isinstance(alias, str) or not alias.isidentifier() or alias == "default":
+            raise TypeError(f"caches.alias must be a name other than default, got `{alias}`")
 
 
 DefaultDBConfig = DBConfig(engine=DBEngine["sqlite3"], name="db.sqlite3")
@@ -113,19 +287,30 @@ class SetupProjectState(DataClassAbstract):
     libraries: List[str] = None
     required: List[str] = None
     database: Optional[DBConfig] = None
+    replicas: List[ReplicaConfig] = None
     cache: Optional[CacheConfig] = None
+    caches: List[CacheAliasConfig] = None
     env: dict = None
     # docker: bool = False
     requirements: bool = False
     template: bool = True
     static: bool = True
     media_files: bool = True
+    cached_templates: bool = False
 
     ENV_SECRET = ["database", "env", "cache"]
     SOURCE_FOLDER = "src"
     IGNORE_CLASSIFY = ["env"]
-    PYTHON_ENV = ""
+    _python_env = ""
     CONFIG_PY_CLASSIFY = ["database", "cache"]
+    # Engine and backend names of setup.yaml are replaced with full paths in config.py
+    CONFIG_PATH_KEYS = ["engine", "backend"]
+    # Config keys that are not secrets, they are kept in setup.yaml and rendered into config.py as they are
+    PLAIN_KEYS = ["option", "performance", "weight", "alias", "key_prefix", "timeout", "sessions", "middleware"]
+    # Database alias of each read replica is `replica_<number>`
+    REPLICA_ALIAS = "replica_{}"
+    LIBRARY_FIELDS = ["libraries", "required", "database"]
+    _resolution = None
 
     def get_parsed_dict(self):
         """It returns complete dictionary to convert to yaml"""
@@ -155,47 +340,177 @@ class SetupProjectState(DataClassAbstract):
     def get_py_config_data(self, secret, key, cls_py, classifier):
         data = ""
         data += "'" if cls_py else ''
-        data += key if classifier in self.CONFIG_PY_CLASSIFY else secret[key][1:]
+        data += key.upper() if cls_py else secret[key][1:]
         data += "'" if cls_py else ''
         data += " : " if cls_py else " = "
-        data += f"os.environ.get('{secret[key][1:]}', '')"
+        if cls_py and key in self.CONFIG_PATH_KEYS:
+            data += f"_env_path('{secret[key][1:]}')"
+        else:
+            data += f"os.environ.get('{secret[key][1:]}', '')"
         data += ",\n" if cls_py else '\n'
         return data
 
     def get_setup_yaml_data(self):
         """Creates YAML Data and makes database, cache and env as secret"""
-        data = self.get_parsed_dict()
+        data = copy.deepcopy(self.get_parsed_dict())
         env_data = ""
         for classifier in self.ENV_SECRET:
             if classifier in data and data[classifier]:
                 cls_py = True if classifier in self.CONFIG_PY_CLASSIFY else False
                 env_data += f"{classifier.upper()}_CONFIG=" + "{\n" if cls_py else ""
-                for _id, (key, val) in enumerate(data[classifier].items()):
+                for key in data[classifier]:
+                    if cls_py and key in self.PLAIN_KEYS:
+                        continue
                     secret = self.get_data_as_secret(key, classifier)
                     data[classifier].update(secret)
                     env_data += self.get_py_config_data(secret, key, cls_py, classifier)
-                    if _id == len(data[classifier].items()) - 1 and cls_py:
-                        env_data += "}\n"
-        self.PYTHON_ENV += env_data
+                if classifier == "database":
+                    env_data += self.get_database_settings(self.database, classifier)
+                elif classifier == "cache":
+                    env_data += self.get_cache_settings(self.cache)
+                env_data += "}\n" if cls_py else ""
+        # Replicas are secret like the primary database, tests use the primary database for replicas
+        for alias, replica, config in zip(self.get_replica_aliases(), data.get("replicas", []), self.replicas or []):
+            env_data += f"{alias.upper()}_CONFIG=" + "{\n" + self.get_config_secret(replica, alias)
+            env_data += self.get_database_settings(config, alias)
+            env_data += "'TEST' : {'MIRROR': 'default'},\n}\n"
+        for classifier, cache, config in zip(self.get_cache_classifiers(), data.get("caches", []), self.caches or []):
+            env_data += f"{classifier.upper()}_CONFIG=" + "{\n" + self.get_config_secret(cache, classifier)
+            env_data += self.get_cache_settings(config) + "}\n"
+        self._python_env = env_data
+        return data
+
+    def get_config_secret(self, data, classifier):
+        """Makes config data of a database replica or cache alias secret, Returns its config.py lines"""
+        env_data = ""
+        for key in data:
+            if key in self.PLAIN_KEYS:
+                continue
+            secret = self.get_data_as_secret(key, classifier)
+            data.update(secret)
+            env_data += self.get_py_config_data(secret, key, True, classifier)
+        return env_data
+
+    @staticmethod
+    def get_cache_settings(cache):
+        """config.py lines of cache key prefix, timeout and backend OPTIONS"""
+        data = ""
+        if cache.key_prefix:
+            data += f"'KEY_PREFIX' : {cache.key_prefix!r},\n"
+        if cache.timeout is not None:
+            data += f"'TIMEOUT' : {cache.timeout!r},\n"
+        options = cache.get_options()
+        if options:
+            data += f"'OPTIONS' : {options!r},\n"
+        return data
+
+    def get_database_settings(self, database, classifier):
+        """
+        config.py lines of database connection settings and OPTIONS,
+        Connection settings are read from .env, generated values are the defaults
+        :param database: DBConfig of the primary database or a replica
+        :param classifier: Prefix of .env keys, `database` or the replica alias
+        """
+        data = ""
+        options = [f"{key!r}: {value!r}" for key, value in (database.option or {}).items()]
+        pool = []
+        for key, value in database.get_env_settings().items():
+            reader = "_env_bool" if isinstance(value, bool) else "_env_int"
+            expression = f"{reader}('{classifier.upper()}_{key}', {value!r})"
+            if key.startswith("POOL_"):
+                pool.append(f"'{key[5:].lower()}': {expression}")
+            else:
+                data += f"'{key}' : {expression},\n"
+        if pool:
+            options.append("'pool': {" + ", ".join(pool) + "}")
+        if options:
+            data += "'OPTIONS' : {" + ", ".join(options) + "},\n"
         return data
 
+    @staticmethod
+    def get_config_paths():
+        """Full paths of database engine and cache backend names, config.py resolves names read from .env"""
+        return "".join(f"    '{name}': '{path}',\n" for name, path in {**DBEngine, **CACHE_BACKED}.items())
+
+    def get_setup_yaml(self):
+        """Returns setup.yaml content"""
+        return yaml_dump(self.get_setup_yaml_data())
+
+    def get_env_secret(self):
+        """Returns .env content"""
+        data = self.get_parsed_dict()
+        lines = []
+        for e in self.ENV_SECRET:
+            if e in data and data[e]:
+                for k in data[e]:
+                    if e in self.CONFIG_PY_CLASSIFY and k in self.PLAIN_KEYS:
+                        continue
+                    if e not in self.IGNORE_CLASSIFY:
+                        lines.append(f"{e.upper()}_{k.upper()}={data[e][k]}\n")
+                    else:
+                        lines.append(f"{k.upper()}={data[e][k]}\n")
+                if e == "database":
+                    lines += [f"DATABASE_{k}={v}\n" for k, v in self.database.get_env_settings().items()]
+        for alias, replica, config in zip(self.get_replica_aliases(), data.get("replicas", []), self.replicas or []):
+            lines += [f"{alias.upper()}_{k.upper()}={v}\n" for k, v in replica.items() if k not in self.PLAIN_KEYS]
+            lines += [f"{alias.upper()}_{k}={v}\n" for k, v in config.get_env_settings().items()]
+        for classifier, cache in zip(self.get_cache_classifiers(), data.get("caches", [])):
+            lines += [f"{classifier.upper()}_{k.upper()}={v}\n" for k, v in cache.items() if k not in self.PLAIN_KEYS]
+        return "".join(lines)
+
+    def get_cache_classifiers(self):
+        """Prefix of .env keys of each cache alias, I.E ["cache_sessions"]"""
+        return [f"cache_{cache.alias}" for cache in self.caches or []]
+
+    def get_cache(self):
+        """CACHES settings, sessions and cache middleware use the cache that enables them"""
+        if not self.cache:
+            return ""
+        caches = [("default", "cache", self.cache)]
+        caches += [(cache.alias, classifier, cache) for classifier, cache in zip(self.get_cache_classifiers(),
+                                                                                 self.caches or [])]
+        lines = ["CACHES = {"] + [f"    '{alias}': {classifier.upper()}_CONFIG," for alias, classifier, _ in caches]
+        lines.append("}")
+        for alias, _, cache in caches:
+            if cache.sessions:
+                lines.append(SESSION_CACHE_SETTINGS.format(alias=alias))
+            if cache.middleware:
+                seconds = cache.timeout if cache.timeout is not None else CACHE_MIDDLEWARE_SECONDS
+                lines.append(CACHE_MIDDLEWARE_SETTINGS.format(alias=alias, seconds=seconds))
+        return "\n".join(lines)
+
+    def get_replica_aliases(self):
+        """Database aliases of read replicas, I.E ["replica_1", "replica_2"]"""
+        return [self.REPLICA_ALIAS.format(number) for number in range(1, len(self.replicas or []) + 1)]
+
+    def get_replica_databases(self):
+        """Replica entries of DATABASES settings"""
+        return "".join(f"    '{alias}': {alias.upper()}_CONFIG,\n" for alias in self.get_replica_aliases())
+
+    def get_database_routers(self):
+        """DATABASE_ROUTERS settings, reads are routed to replicas when the project has replicas"""
+        if not self.replicas:
+            return ""
+        return f"\nDATABASE_ROUTERS = ['{self.normalize_name()}.routers.ReplicaRouter']\n"
+
+    def get_replica_weights(self):
+        """Replica aliases and their weights in routers.py"""
+        return "".join(f"    '{alias}': {replica.weight},\n"
+                       for alias, replica in zip(self.get_replica_aliases(), self.replicas or []))
+
     def create_setup_yaml(self):
         """Creates setup.yaml file"""
+        content = self.get_setup_yaml()
         with open(SETUP_CONFIG_FILE, "w") as file:
-            yaml.dump(self.get_setup_yaml_data(), file, sort_keys=False)
-            file.close()
+            file.write(content)
+        emit("file_written", path=SETUP_CONFIG_FILE, bytes=len(content.encode()))
 
     def create_env_secret(self):
         """Creates .env file"""
-        data = self.get_parsed_dict()
+        content = self.get_env_secret()
         with open(ENV_FILE, "w") as env:
-            for e in self.ENV_SECRET:
-                if e in data and data[e]:
-                    for k in data[e]:
-                        if e not in self.IGNORE_CLASSIFY:
-                            env.write(f"{e.upper()}_{k.upper()}={data[e][k]}\n")
-                        else:
-                            env.write(f"{k.upper()}={data[e][k]}\n")
+            env.write(content)
+        emit("file_written", path=ENV_FILE, bytes=len(content.encode()))
 
     def generate_yaml_env(self):
         """Generate Yaml and Env File"""
@@ -206,91 +521,119 @@ class SetupProjectState(DataClassAbstract):
         """Normalize Name, Remove white spaces from name"""
         return self.name.replace(" ", "_")
 
-    def set_py_from_template(self, template_name, py_file, data=None):
-        """Create Django/Python File Using Templates"""
+    def render_template(self, template_name, data=None):
+        """Render Template Using Compiled Template"""
         _data = {"PROJECT_NAME": self.normalize_name()}
         if data:
             _data.update(**data)
+        return compile_template(template_name).render(_data)
 
-        # Read Template File
-        with open(f"{PATH.parent}/template/{template_name}", "r") as temp:
-            template_data = temp.read()
-        # Replace any variable in template file
-        for key, text in _data.items():
-            template_data = template_data.replace(f"${key}", text)
-
+    def set_py_from_template(self, template_name, py_file, data=None):
+        """Create Django/Python File Using Templates"""
         with open(py_file, "w") as file:
-            file.write(template_data)
+            file.write(self.render_template(template_name, data=data))
+
+    def get_resolution(self):
+        """
+        Return Resolved Libraries,
+        Resolution is cached on the state until libraries, required libraries, database engine or pool change
+        """
+        key = (tuple(self.libraries or ()), tuple(self.required or ()),
+               self.database.get_engine_name() if self.database else None,
+               bool(self.database and self.database.get_performance().get("pool")))
+        if self._resolution is None or self._resolution[0] != key:
+            self._resolution = (key, resolve_libraries(key[0] + key[1], engine=key[2], pool=key[3]))
+        return self._resolution[1]
 
     def get_all_libs(self):
-        """Return All Installable Libs, [Remove any duplicate by converting it to set]"""
-        libs = self.libraries if self.libraries else []
-        libs += self.required if self.required else []
-        return set(list(libs))
+        """Return All Libs and their linked libs, without duplicates in resolution order"""
+        return list(self.get_resolution().libraries)
+
+    def get_database_driver(self):
+        """Return Database Driver Library of the selected database engine"""
+        return self.get_resolution().driver
 
-    def install_libraries(self, req_file=DEFAULT_REQUIREMENT_FILE):
-        """Pip Install Libraries"""
-        for lib in self.get_all_libs():
-            execute(f"{pip_name()} install {lib}")
+    def get_installable_libs(self):
+        """Return All Installable Libs including the database driver"""
+        return list(self.get_resolution().installable)
+
+    def install_libraries(self, req_file=DEFAULT_REQUIREMENT_FILE, batched=True, skip_satisfied=True,
+                          wheelhouse=None, offline=False, timeout=None):
+        """
+        Pip Install Libraries,
+        In batched mode libraries, database driver and requirements file are installed in one pip call
+        Libraries that are already installed at a compatible version are skipped
+        Libraries are installed from the local wheelhouse when it has the required wheels
+        Failures are reported without aborting, Returns False if any pip call failed
+        """
+        if batched:
+            return batch_install(self.get_installable_libs(), req_file=req_file, skip_satisfied=skip_satisfied,
+                                 wheelhouse=wheelhouse, offline=offline, timeout=timeout)
+
+        ok = True
+        libs = self.get_installable_libs()
+        for lib in pending_requirements(libs) if skip_satisfied else libs:
+            ok = run_pip([pip_name(), "install", *wheelhouse_args([lib], wheelhouse=wheelhouse, offline=offline),
+                          lib], timeout=timeout) and ok
 
-        current_dir = os.getcwd()
         file_name = req_file
-        has_requirements = os.path.isfile("{}/{}".format(current_dir, file_name))
+        has_requirements = os.path.isfile(file_name)
         if has_requirements:
-            execute("pip3 install -r requirements.txt")
+            requirements = [req for req in read_requirements(file_name) if requirement_name(req)]
+            ok = run_pip([pip_name(), "install", *wheelhouse_args(requirements, wheelhouse=wheelhouse,
+                                                                  offline=offline),
+                          "-r", file_name], timeout=timeout) and ok
+        return ok
 
     def get_settings_installed_app(self):
         """Get Required Installed Libs in INSTALLED_APP Settings"""
-        return "".join([f"    {INSTALLED_APP[lib]},\n" for lib in self.get_all_libs() if lib in INSTALLED_APP])
+        return "".join([f"    {app},\n" for app in self.get_resolution().installed_apps])
 
     def get_middlewares(self):
         """Set required middlewares in Middleware Settings"""
-        return "".join([f"    {MIDDLEWARE[lib]},\n" for lib in self.get_all_libs() if lib in MIDDLEWARE])
+        return "".join([f"    {middleware},\n" for middleware in self.get_resolution().middlewares])
 
     def get_extra(self):
         """Any Extra Settings"""
-        return "".join([f"{EXTRA[lib]}\n".replace("$PROJECT_NAME", self.normalize_name())
-                        for lib in self.get_all_libs()
-                        if lib in EXTRA])
+        return "".join([f"{extra}\n".replace("$PROJECT_NAME", self.normalize_name())
+                        for extra in self.get_resolution().extra])
 
-    def create_required_directory(self):
-        """Create Folders That are required"""
-        folders_to_create = [self.SOURCE_FOLDER,
-                             f"{self.SOURCE_FOLDER}/{self.normalize_name()}"]
+    def get_required_directories(self):
+        """Folders That are required"""
+        folders = [self.SOURCE_FOLDER,
+                   f"{self.SOURCE_FOLDER}/{self.normalize_name()}"]
 
         if self.static:
-            folders_to_create += [f"{self.SOURCE_FOLDER}/static", ]
+            folders += [f"{self.SOURCE_FOLDER}/static", ]
 
         if self.media_files:
-            folders_to_create += [f"{self.SOURCE_FOLDER}/media", ]
+            folders += [f"{self.SOURCE_FOLDER}/media", ]
 
         if self.template:
-            folders_to_create += [f"{self.SOURCE_FOLDER}/template", ]
+            folders += [f"{self.SOURCE_FOLDER}/template", ]
 
-        for folder in folders_to_create:
-            os.mkdir(folder)
+        return folders
 
-    def create_python_file(self):
-        """Create Required Python Files"""
+    def get_project_files(self):
+        """Required Python Files, locations are relative to the project root"""
         APP_LOC = f"{self.SOURCE_FOLDER}/{self.normalize_name()}"
 
-        def django_location(root_location, file_name, extension=".py", suffix=""):
-            return f"{root_location}/{suffix}{file_name}{extension}"
-
         files = [
             {
                 "name": "asgi",
                 "dj_loc": APP_LOC,
                 "data": {},
                 "extension": ".py",
-                "suffix": ""
+                "suffix": "",
+                "depends": ["name"]
             },
             {
                 "name": "wsgi",
                 "dj_loc": APP_LOC,
                 "data": {},
                 "extension": ".py",
-                "suffix": ""
+                "suffix": "",
+                "depends": ["name"]
             },
             {
                 "name": "settings",
@@ -299,96 +642,279 @@ class SetupProjectState(DataClassAbstract):
                     "INSTALLED_APPS": self.get_settings_installed_app(),
                     "MIDDLEWARES": self.get_middlewares(),
                     "EXTRA": self.get_extra(),
-                    "CACHE": """CACHE = {'default': CACHE_CONFIG}""" if self.cache else "",
+                    "CACHE": self.get_cache(),
+                    "TEMPLATE_LOADERS": f"\n{CACHED_TEMPLATE_SETTINGS}\n" if self.cached_templates else "",
+                    "REPLICA_DATABASES": self.get_replica_databases(),
+                    "DATABASE_ROUTERS": self.get_database_routers(),
                     "STATIC_SETTINGS": STATIC_FILE_SETTINGS if self.static else "",
                     "MEDIA_SETTINGS": MEDIA_FILE_SETTINGS if self.media_files else "",
                     "TEMPLATE_SETTINGS": TEMPLATE_SETTINGS if self.template else ""
                 },
                 "extension": ".py",
-                "suffix": ""
+                "suffix": "",
+                "depends": ["name", "libraries", "required", "cache", "caches", "replicas", "static", "media_files",
+                            "template", "cached_templates"]
             },
             {
                 "name": "urls",
                 "dj_loc": APP_LOC,
                 "data": {},
                 "extension": ".py",
-                "suffix": ""
+                "suffix": "",
+                "depends": []
             },
             {
                 "name": "manage",
                 "dj_loc": self.SOURCE_FOLDER,
                 "data": {},
                 "extension": ".py",
-                "suffix": ""
+                "suffix": "",
+                "depends": ["name"]
             },
             {
                 "name": "config",
                 "dj_loc": APP_LOC,
                 "data": {
-                    "CONFIG_VARS": self.PYTHON_ENV
+                    "CONFIG_PATHS": self.get_config_paths(),
+                    "CONFIG_VARS": self._python_env
                 },
                 "extension": ".py",
-                "suffix": ""
+                "suffix": "",
+                "depends": list(self.ENV_SECRET) + ["replicas", "caches"]
             },
             {
                 "name": "readme",
-                "dj_loc": os.getcwd(),
+                "dj_loc": "",
                 "data": {},
                 "extension": ".md",
-                "suffix": ""
+                "suffix": "",
+                "depends": ["name"]
             },
             {
                 "name": "gitignore",
-                "dj_loc": os.getcwd(),
+                "dj_loc": "",
                 "data": {},
                 "extension": "",
-                "suffix": "."
+                "suffix": ".",
+                "depends": []
             }
         ]
-        for lib in self.get_all_libs():
-            if lib in LINKED_FILES:
-                data = {k: v.replace("$SOURCE_FOLDER", self.SOURCE_FOLDER).replace("$APP_LOC", APP_LOC)
-                        for k, v in LINKED_FILES[lib].items()
-                        }
-                files.append(data)
-        for file in files:
-            f_name = file.get("name")
-            location = file.get("dj_loc")
-            data = file.get("data")
-            ext = file.get("extension")
-            suf = file.get("suffix")
-            self.set_py_from_template(
-                f_name + ".template",
-                django_location(file_name=f_name, root_location=location, extension=ext, suffix=suf),
-                data=data
-            )
+        if self.replicas:
+            files.append({
+                "name": "routers",
+                "dj_loc": APP_LOC,
+                "data": {"REPLICAS": self.get_replica_weights()},
+                "extension": ".py",
+                "suffix": "",
+                "depends": ["replicas"]
+            })
+        for linked_file in self.get_resolution().linked_files:
+            data = {k: v.replace("$SOURCE_FOLDER", self.SOURCE_FOLDER).replace("$APP_LOC", APP_LOC)
+                    for k, v in linked_file.items()
+                    }
+            data["depends"] = ["name", "libraries"]
+            files.append(data)
+        return files
 
     @staticmethod
-    def create_requirements_file():
-        execute("pip3 freeze > requirements.txt")
+    def get_file_location(file):
+        """Relative Location of a Project File"""
+        return posixpath.join(file.get("dj_loc"), f"{file.get('suffix')}{file.get('name')}{file.get('extension')}")
+
+    def render_python_files(self):
+        """Render Required Python Files, Returns File Map of relative path and content"""
+        files = {}
+        for file in self.get_project_files():
+            files[self.get_file_location(file)] = self.render_template(file.get("name") + ".template",
+                                                                       data=file.get("data")).encode()
+        return files
+
+    def get_file_dependencies(self, setup_files=True):
+        """State fields that each rendered file depends on"""
+        dependencies = {self.get_file_location(file): file.get("depends", []) for file in self.get_project_files()}
+        if setup_files:
+            dependencies[SETUP_CONFIG_FILE] = [f.name for f in dataclasses.fields(self)]
+            dependencies[ENV_FILE] = list(self.ENV_SECRET) + ["replicas", "caches"]
+        return dependencies
+
+    def get_field_hashes(self):
+        """Hash of each state field, Hashed from setup.yaml data so secrets are never part of it"""
+        data = self.get_setup_yaml_data()
+        return {f.name: value_hash(data.get(f.name)) for f in dataclasses.fields(self)}
+
+    def get_manifest(self, files, setup_files=True):
+        """Manifest of rendered files"""
+        return build_manifest(files, self.get_file_dependencies(setup_files=setup_files), self.get_field_hashes())
+
+    def render_project(self, setup_files=True):
+        """
+        Render Complete Project In Memory, Nothing is written to disk
+        :param setup_files: Include setup.yaml and .env files
+        :return: FileMap, relative path and content, directories end with `/`
+        """
+        files = {}
+        if setup_files:
+            files[SETUP_CONFIG_FILE] = self.get_setup_yaml().encode()
+            files[ENV_FILE] = self.get_env_secret().encode()
+        else:
+            # Config file variables are created with setup.yaml data
+            self.get_setup_yaml_data()
+        for folder in self.get_required_directories():
+            files[f"{folder}/"] = b""
+        files.update(self.render_python_files())
+        return files
+
+    def archive_project(self, stream, archive="gz"):
+        """
+        Streams Complete Project Into a zip/tar Archive, Nothing is written to the working directory
+        :param stream: Binary output stream
+        :param archive: Archive format, see `write_archive`
+        """
+        files = self.render_project()
+        files[MANIFEST_FILE] = manifest_bytes(self.get_manifest(files))
+        write_archive(files, stream, archive)
 
-    @safe_create_dir
-    def create_project(self):
-        self.generate_yaml_env()
-        tasks = [
-            {
-                "title": "Creating Source Folder",
-                "task": self.create_required_directory
-            },
-            {
-                "title": "Installing Libraries",
-                "task": self.install_libraries
-            },
-            {
-                "title": "Creating Project File",
-                "task": self.create_python_file
-            },
-            {
-                "title": "Creating Requirement File",
-                "task": self.create_requirements_file
-            }
+    def create_required_directory(self):
+        """Create Folders That are required"""
+        for folder in self.get_required_directories():
+            os.mkdir(folder)
+
+    def create_python_file(self):
+        """Create Required Python Files"""
+        write_file_map(self.render_python_files(), os.getcwd())
+
+    def get_project_requirements(self):
+        """Return pinned requirements of the project libraries and their dependencies"""
+        return freeze_requirements(PROJECT_LIBRARIES + self.get_installable_libs())
+
+    def create_requirements_file(self, req_file=DEFAULT_REQUIREMENT_FILE):
+        """Creates requirements file from installed project libraries"""
+        content = "\n".join(self.get_project_requirements()) + "\n"
+        with open(req_file, "w") as file:
+            file.write(content)
+        emit("file_written", path=os.path.normpath(req_file), bytes=len(content.encode()))
+
+    def write_project(self, target="."):
+        """
+        Renders Project And Writes It Into Target Directory along with the manifest, Libraries are not installed
+        :param target: Project Root Directory
+        :return: FileMap, Written files
+        """
+        files = self.render_project()
+        commit_file_map(files, target)
+        atomic_write(os.path.join(target, MANIFEST_FILE), manifest_bytes(self.get_manifest(files)))
+        return files
+
+    def get_project_steps(self, target=".", resume=False, **install_options):
+        """
+        Steps of project creation,
+        Libraries are installed while project files are written, both wait for rendering only
+        Inputs of steps are hashed into the journal, a step is resumed while its inputs do not change
+        :param target: Project Root Directory
+        :param resume: Project may already exist, it is written by a resumed step or updated
+        :param install_options: Options passed to `install_libraries`
+        :return: List[Step]
+        """
+        rendered = {}
+        manifest = {}
+        manifest_location = os.path.join(target, MANIFEST_FILE)
+        req_file = os.path.join(target, DEFAULT_REQUIREMENT_FILE)
+        fields = self.get_field_hashes()
+        libraries = self.get_installable_libs()
+
+        def render():
+            rendered.update(self.render_project())
+            # Fail before anything is installed if the project exists
+            if not resume:
+                check_file_map(rendered, target)
+
+        def write():
+            if not resume:
+                commit_file_map(rendered, target)
+                return
+            # Project may be written by the interrupted run, files are updated as `update_project` does
+            report = update_file_map(rendered, target, read_manifest(manifest_location),
+                                     self.get_file_dependencies(), fields)
+            for path in report.modified:
+                warning(f"{LOG_MODIFIED_BY_USER}: {path}")
+            manifest.update(report.manifest)
+
+        return [
+            Step("render", render, title="Rendering Project Files"),
+            Step("write", write, depends=["render"], title="Writing Project Files", inputs=fields),
+            Step("manifest", lambda: atomic_write(manifest_location,
+                                                  manifest_bytes(manifest or self.get_manifest(rendered))),
+                 depends=["write"], title="Creating Manifest", inputs=fields),
+            # A failed pip call is not fatal, the step returns False and runs again on resume
+            Step("install", lambda: self.install_libraries(**{"req_file": req_file, **install_options}),
+                 depends=["render"], title="Installing Libraries",
+                 inputs={"libraries": libraries, "options": install_options}),
+            Step("requirements", lambda: self.create_requirements_file(req_file), depends=["install"],
+                 title="Creating Requirement File", inputs={"libraries": libraries}),
         ]
 
-        for key, task in enumerate(tasks):
-            log(f"{key + 1}.. {task['title']}")
-            task["task"]()
+    def create_project(self, target=".", resume=False, **install_options):
+        """
+        Creates Project, Independent steps run concurrently, See `get_project_steps`
+        Project files are rendered in memory and moved into target directory at once
+        A failed step cancels the steps that did not finish, I.E a running pip install
+        Completed steps are recorded in the journal, with `resume` steps that are done with the same inputs are skipped
+        :param target: Project Root Directory
+        :param resume: Continue an interrupted run from the journal
+        :param install_options: Options passed to `install_libraries`
+        :return: StepResult of the first step that failed or did not finish its work, None if the project is complete
+        """
+        location = os.path.join(target, JOURNAL_FILE)
+        journal = Journal.load(location) if resume else Journal(location)
+        scheduler = Scheduler(self.get_project_steps(target, resume=resume, **install_options), journal=journal)
+        counter = itertools.count(1)
+
+        def log_step(result):
+            if result.status == RUNNING:
+                log(f"{next(counter)}.. {result.title}")
+            elif result.status == RESUMED:
+                log(f"{next(counter)}.. {result.title} [Done, Resumed]")
+
+        scheduler.add_listener(log_step)
+        try:
+            scheduler.run()
+        except Exception:
+            # The error is kept in the result of the failed step
+            pass
+        results = [scheduler.results[name] for name in scheduler.order]
+        return next((result for result in results if result.status == FAILED),
+                    next((result for result in results if not result.ok or result.value is False), None))
+
+    def update_project(self, target=".", force=False, **install_options):
+        """
+        Regenerates Project Incrementally, Only files whose output changed are written
+        Files that were edited by hand are reported and kept unless `force`
+        setup.yaml and .env are not rewritten, setup.yaml is the input and .env holds the secrets
+        :param target: Project Root Directory
+        :param force: Overwrite files that were edited by hand
+        :param install_options: Options passed to `install_libraries`
+        :return: UpdateReport
+        """
+        manifest_location = os.path.join(target, MANIFEST_FILE)
+        manifest = read_manifest(manifest_location)
+        files = self.render_project(setup_files=False)
+        fields = self.get_field_hashes()
+        report = update_file_map(files, target, manifest, self.get_file_dependencies(setup_files=False), fields,
+                                 force=force, preserve=[SETUP_CONFIG_FILE, ENV_FILE])
+        atomic_write(manifest_location, manifest_bytes(report.manifest))
+
+        for path in report.added + report.updated:
+            reasons = report.reasons.get(path)
+            success(f"Updated: {path}" + (f" [{', '.join(reasons)}]" if reasons else ""))
+        for path in report.removed:
+            success(f"Removed: {path}")
+        for path in report.modified:
+            warning(f"{LOG_MODIFIED_BY_USER}: {path}")
+        if not report.written:
+            log(LOG_PROJECT_UP_TO_DATE)
+
+        if set(changed_fields(manifest, fields)) & set(self.LIBRARY_FIELDS):
+            req_file = os.path.join(target, DEFAULT_REQUIREMENT_FILE)
+            self.install_libraries(**{"req_file": req_file, **install_options})
+            self.create_requirements_file(req_file)
+        return report
@@ -7,6 +7,7 @@ import click
 
 from django_cli.config import LIBRARIES_OPTIONAL, DBEngine, CACHE_BACKED
 from django_cli.setup_project.model import DefaultDBConfig
+from django_cli import utils
 from django_cli.utils import log, success
 
 
@@ -71,9 +72,9 @@ class QuestionAbstract:
         data_type = self.type if not data_type else data_type
 
         if data_type is bool:
-            return click.confirm(text)
+            return click.confirm(text, err=utils.stderr_output())
 
-        user_input = click.prompt(text, type=data_type, default=default, )
+        user_input = click.prompt(text, type=data_type, default=default, err=utils.stderr_output())
         # Enforce Default Value
         return self.default if not user_input else user_input
 
@@ -186,6 +187,14 @@ class PromptConfig:
             default=True,
             type=bool
         ),
+        Question(
+            input_type=InputType.BOOLEAN,
+            title="Template Cache",
+            name="Cache Compiled Templates When DEBUG Is Off [Skip To Disable]",
+            var="cached_templates",
+            default=False,
+            type=bool
+        ),
         Question(
             input_type=InputType.BOOLEAN,
             title="Media File",
@@ -239,6 +248,52 @@ class PromptConfig:
                     name="Database Port",
                     type=str,
                     var="port"
+                ),
+                Question(
+                    input_type=InputType.GROUP,
+                    name="Tune Connections [Skip To Use Engine Defaults]",
+                    var="performance",
+                    default=None,
+                    type=dict,
+                    required=False,
+                    children=[
+                        Question(
+                            input_type=InputType.STRING,
+                            name="Persistent Connection Seconds [CONN_MAX_AGE, Skip For Default]",
+                            type=str,
+                            var="conn_max_age"
+                        ),
+                        Question(
+                            input_type=InputType.STRING,
+                            name="Check Persistent Connections [y/n, Skip For Default]",
+                            type=str,
+                            var="conn_health_checks"
+                        ),
+                        Question(
+                            input_type=InputType.STRING,
+                            name="Disable Server Side Cursors [y/n, postgresql, Skip For Default]",
+                            type=str,
+                            var="disable_server_side_cursors"
+                        ),
+                        Question(
+                            input_type=InputType.STRING,
+                            name="Use Connection Pool [y/n, postgresql, Skip For Default]",
+                            type=str,
+                            var="pool"
+                        ),
+                        Question(
+                            input_type=InputType.STRING,
+                            name="Pool Min Size [Skip For Default]",
+                            type=str,
+                            var="pool_min_size"
+                        ),
+                        Question(
+                            input_type=InputType.STRING,
+                            name="Pool Max Size [Skip For Default]",
+                            type=str,
+                            var="pool_max_size"
+                        ),
+                    ]
                 )
             ]
         ),
@@ -264,6 +319,30 @@ class PromptConfig:
                     type=str,
                     var="location"
                 ),
+                Question(
+                    input_type=InputType.STRING,
+                    name="Cache Key Prefix [Skip For None]",
+                    type=str,
+                    var="key_prefix"
+                ),
+                Question(
+                    input_type=InputType.STRING,
+                    name="Cache Timeout Seconds [Skip For Default]",
+                    type=str,
+                    var="timeout"
+                ),
+                Question(
+                    input_type=InputType.STRING,
+                    name="Store Sessions In Cache [y/n, Skip For No]",
+                    type=str,
+                    var="sessions"
+                ),
+                Question(
+                    input_type=InputType.STRING,
+                    name="Cache Every Page [y/n, Skip For No]",
+                    type=str,
+                    var="middleware"
+                ),
             ]
         ),
     ]
@@ -271,6 +350,9 @@ class PromptConfig:
 
     def __init__(self, project_name):
         self.project_name = project_name
+        # Instance copies, class level questions and answers are shared by every prompt
+        self.PROMPT_QUES = list(self.PROMPT_QUES)
+        self.answer = {}
         if self.project_name:
             self.PROMPT_QUES.pop(0)
             self.PROMPT_QUES.insert(0, PromptLog(title="Project Name", text=f"Project Name :- {self.project_name}"))
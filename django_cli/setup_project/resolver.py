@@ -0,0 +1,139 @@
+import functools
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple, Union, List
+
+from django_cli.config import (LIBRARIES_OPTIONAL,
+                               LINKED_LIBRARY,
+                               DATABASE_DRIVERS,
+                               DATABASE_POOL_DRIVERS,
+                               INSTALLED_APP,
+                               MIDDLEWARE,
+                               EXTRA,
+                               LINKED_FILES)
+
+
+class LibraryCycleError(ValueError):
+    """Raised when linked libraries link back to themselves"""
+
+
+def linked_tuple(linked: Union[str, Iterable[str], None]) -> Tuple[str, ...]:
+    """Linked libraries of a `LINKED_LIBRARY` entry, a single library or a list of libraries"""
+    if not linked:
+        return ()
+    return (linked,) if isinstance(linked, str) else tuple(linked)
+
+
+def unique(libraries: Iterable[str]) -> Tuple[str, ...]:
+    """Removes duplicate libraries, first occurrence wins"""
+    return tuple(dict.fromkeys(libraries))
+
+
+@dataclass(frozen=True)
+class Resolution:
+    """
+    Resolved libraries of a project and their settings contributions
+    :arg
+        libraries: Requested libraries followed by their linked libraries, depth first
+        driver: Database driver library of the database engine, the pool driver when the connection pool is enabled
+        installable: Libraries, database driver and its linked libraries
+        installed_apps: INSTALLED_APPS entries
+        middlewares: MIDDLEWARE entries
+        extra: Extra settings
+        linked_files: Specs of files that libraries add to the project
+    """
+    libraries: Tuple[str, ...] = ()
+    driver: Optional[str] = None
+    installable: Tuple[str, ...] = ()
+    installed_apps: Tuple[str, ...] = ()
+    middlewares: Tuple[str, ...] = ()
+    extra: Tuple[str, ...] = ()
+    linked_files: Tuple[dict, ...] = ()
+
+
+class LibraryResolver:
+    """
+    Resolves libraries into the transitive closure of their linked libraries,
+    Closures of known libraries are computed once, resolutions are memoized
+    :raises LibraryCycleError: If linked libraries form a cycle
+    """
+
+    def __init__(self,
+                 links: Dict[str, Union[str, List[str]]] = None,
+                 drivers: Dict[str, str] = None,
+                 pool_drivers: Dict[str, str] = None,
+                 known: Iterable[str] = None,
+                 installed_apps: Dict[str, str] = None,
+                 middlewares: Dict[str, str] = None,
+                 extra: Dict[str, str] = None,
+                 linked_files: Dict[str, dict] = None):
+        self.links = {lib: linked_tuple(linked) for lib, linked in (LINKED_LIBRARY if links is None else links).items()}
+        self.drivers = dict(DATABASE_DRIVERS if drivers is None else drivers)
+        self.pool_drivers = dict(DATABASE_POOL_DRIVERS if pool_drivers is None else pool_drivers)
+        self.installed_apps = dict(INSTALLED_APP if installed_apps is None else installed_apps)
+        self.middlewares = dict(MIDDLEWARE if middlewares is None else middlewares)
+        self.extra = dict(EXTRA if extra is None else extra)
+        self.linked_files = dict(LINKED_FILES if linked_files is None else linked_files)
+        self.closures: Dict[str, Tuple[str, ...]] = {}
+        self.resolve = functools.lru_cache(maxsize=256)(self._resolve)
+        for library in [*(LIBRARIES_OPTIONAL if known is None else known), *self.links, *self.drivers.values(),
+                        *self.pool_drivers.values()]:
+            self.closure(library)
+
+    def closure(self, library: str, path: Tuple[str, ...] = ()) -> Tuple[str, ...]:
+        """
+        Library followed by its linked libraries, depth first in `LINKED_LIBRARY` order
+        :param library: Library name
+        :param path: Libraries that are being resolved, used to detect cycles
+        :return: Tuple[str, ...]
+        """
+        if library in self.closures:
+            return self.closures[library]
+        if library in path:
+            raise LibraryCycleError(f"Linked libraries form a cycle: {' -> '.join(path + (library,))}")
+        path = path + (library,)
+        resolved = unique([library, *(item for linked in self.links.get(library, ())
+                                      for item in self.closure(linked, path))])
+        self.closures[library] = resolved
+        return resolved
+
+    def expand(self, libraries: Iterable[str]) -> Tuple[str, ...]:
+        """Closure of every library, in the order of libraries"""
+        return unique(item for library in libraries for item in self.closure(library))
+
+    def _resolve(self, libraries: Tuple[str, ...], engine: Optional[str] = None, pool: bool = False) -> Resolution:
+        """
+        Resolves libraries, use `resolve` which is memoized
+        :param libraries: Tuple of library names
+        :param engine: Database engine
+        :param pool: Connection pool is enabled, engines with a pool driver use it instead of their driver
+        :return: Resolution
+        """
+        resolved = self.expand(libraries)
+        driver = (pool and self.pool_drivers.get(engine)) or (self.drivers.get(engine) if engine else None)
+        installable = unique(resolved + (self.expand([driver]) if driver else ()))
+        return Resolution(
+            libraries=resolved,
+            driver=driver,
+            installable=installable,
+            installed_apps=tuple(self.installed_apps[lib] for lib in installable if lib in self.installed_apps),
+            middlewares=tuple(self.middlewares[lib] for lib in installable if lib in self.middlewares),
+            extra=tuple(self.extra[lib] for lib in installable if lib in self.extra),
+            linked_files=tuple(self.linked_files[lib] for lib in installable if lib in self.linked_files),
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def default_resolver() -> LibraryResolver:
+    """Resolver of the library tables in `django_cli.config`"""
+    return LibraryResolver()
+
+
+def resolve_libraries(libraries: Iterable[str], engine: Optional[str] = None, pool: bool = False) -> Resolution:
+    """
+    Resolves project libraries using the default resolver
+    :param libraries: Library names
+    :param engine: Database engine, its driver is part of the installable libraries
+    :param pool: Connection pool is enabled, See `LibraryResolver.resolve`
+    :return: Resolution
+    """
+    return default_resolver().resolve(tuple(libraries), engine, pool)
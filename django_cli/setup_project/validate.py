@@ -0,0 +1,386 @@
+import dataclasses
+import difflib
+import functools
+import os
+import typing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from django_cli.config import (DBEngine,
+                               CACHE_BACKED,
+                               CACHE_DRIVERS,
+                               DATABASE_DRIVERS,
+                               DATABASE_PERFORMANCE,
+                               DATABASE_POOL_DRIVERS,
+                               INSTALLED_APP,
+                               LIBRARIES_OPTIONAL,
+                               LINKED_LIBRARY,
+                               PROJECT_LIBRARIES,
+                               SQLITE)
+from django_cli.setup_project.batch import load_specs, spec_files, valid_project_name
+from django_cli.setup_project.installer import normalize_name
+from django_cli.setup_project.model import (SetupProjectState,
+                                            DBConfig,
+                                            DBPerformanceConfig,
+                                            ReplicaConfig,
+                                            CacheConfig,
+                                            CacheAliasConfig,
+                                            ENGINE_NAMES)
+from django_cli.setup_project.resolver import default_resolver
+from django_cli.utils import success, error, log
+
+# Accepted values of config fields, short names and full paths
+FIELD_CHOICES = {
+    DBConfig: {"engine": frozenset(DBEngine) | frozenset(DBEngine.values())},
+    ReplicaConfig: {"engine": frozenset(DBEngine) | frozenset(DBEngine.values())},
+    CacheConfig: {"backend": frozenset(CACHE_BACKED) | frozenset(CACHE_BACKED.values())},
+    CacheAliasConfig: {"backend": frozenset(CACHE_BACKED) | frozenset(CACHE_BACKED.values())},
+}
+
+# Fields that are read from config files but are not state fields
+IGNORED_FIELDS = frozenset({"required"})
+
+# Scalars that are written into settings as they are
+SCALAR_TYPES = {str: (str, int, float), bool: (bool,), dict: (dict,), list: (list,)}
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """
+    Compiled rule of a config field
+    :arg
+        name: Field name
+        types: Accepted value types
+        required: Field has no default value
+        nullable: None is accepted
+        item_types: Accepted item types of a list
+        schema: Rules of a nested config, or of each item of a list of configs
+        choices: Accepted values
+    """
+    name: str
+    types: Tuple[type, ...]
+    required: bool = False
+    nullable: bool = True
+    item_types: Tuple[type, ...] = ()
+    schema: Optional[Dict[str, "FieldRule"]] = None
+    choices: FrozenSet[str] = frozenset()
+
+
+@dataclass(frozen=True)
+class Issue:
+    """Validation error or warning of a config field, field is a dotted path I.E `database.engine`"""
+    field: str
+    message: str
+
+
+@dataclass
+class ValidationResult:
+    """
+    Validation result of a spec
+    :arg
+        source: Spec file and document index, I.E `services.yaml#2`
+        name: Project name
+        errors: Issues that make generation fail or produce a broken project
+        warnings: Issues that are ignored during generation, I.E unknown fields or libraries
+    """
+    source: str
+    name: str = ""
+    errors: List[Issue] = field(default_factory=list)
+    warnings: List[Issue] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> dict:
+        return {"source": self.source, "name": self.name, "ok": self.ok,
+                "errors": [dataclasses.asdict(issue) for issue in self.errors],
+                "warnings": [dataclasses.asdict(issue) for issue in self.warnings]}
+
+
+def _origin(hint: Any) -> Any:
+    """Origin of a generic hint, I.E `List[str]` -> `list`, `typing.get_origin` requires Python 3.8"""
+    return getattr(hint, "__origin__", None)
+
+
+def _args(hint: Any) -> Tuple[Any, ...]:
+    """Arguments of a generic hint, I.E `List[str]` -> `(str,)`, `typing.get_args` requires Python 3.8"""
+    return tuple(getattr(hint, "__args__", None) or ())
+
+
+def _unwrap(hint: Any) -> Tuple[Any, bool]:
+    """Returns the type of an Optional hint and if None is accepted"""
+    if _origin(hint) is typing.Union:
+        args = [arg for arg in _args(hint) if arg is not type(None)]
+        return args[0], True
+    return hint, False
+
+
+@functools.lru_cache(maxsize=None)
+def compile_schema(config_class: type) -> Dict[str, FieldRule]:
+    """
+    Compiles field rules of a config dataclass from its type hints, compiled schema is cached
+    :param config_class: SetupProjectState, DBConfig or CacheConfig
+    :return: Dict of field name and rule
+    """
+    hints = typing.get_type_hints(config_class)
+    choices = FIELD_CHOICES.get(config_class, {})
+    schema = {}
+    for config_field in dataclasses.fields(config_class):
+        hint, nullable = _unwrap(hints[config_field.name])
+        required = config_field.default is dataclasses.MISSING and config_field.default_factory is dataclasses.MISSING
+        nullable = nullable or config_field.default is None
+        origin = _origin(hint)
+        if dataclasses.is_dataclass(hint):
+            rule = FieldRule(config_field.name, (dict,), required, nullable, schema=compile_schema(hint))
+        elif origin is list:
+            item, = _args(hint) or (str,)
+            if dataclasses.is_dataclass(item):
+                rule = FieldRule(config_field.name, (list,), required, nullable, item_types=(dict,),
+                                 schema=compile_schema(item))
+            else:
+                rule = FieldRule(config_field.name, (list,), required, nullable, item_types=(item,))
+        else:
+            rule = FieldRule(config_field.name, SCALAR_TYPES.get(origin or hint, (origin or hint,)), required,
+                             nullable, choices=choices.get(config_field.name, frozenset()))
+        schema[config_field.name] = rule
+    return schema
+
+
+@functools.lru_cache(maxsize=None)
+def known_libraries() -> FrozenSet[str]:
+    """Normalized names of libraries in the library tables"""
+    resolver = default_resolver()
+    libraries = [*PROJECT_LIBRARIES, *LIBRARIES_OPTIONAL, *INSTALLED_APP, *DATABASE_DRIVERS.values(),
+                 *DATABASE_POOL_DRIVERS.values(), *CACHE_DRIVERS.values(), *resolver.expand(LINKED_LIBRARY)]
+    return frozenset(normalize_name(lib) for lib in libraries)
+
+
+def _suggest(value: str, options: Iterable[str]) -> str:
+    matches = difflib.get_close_matches(value, list(options), n=1)
+    return f", did you mean `{matches[0]}`?" if matches else ""
+
+
+def _type_names(types: Tuple[type, ...]) -> str:
+    return " or ".join(sorted({item.__name__ for item in types}))
+
+
+def check_fields(config: dict, schema: Dict[str, FieldRule], prefix: str = "") -> Tuple[List[Issue], List[Issue]]:
+    """
+    Checks config data against a compiled schema,
+    `$VAR` values are expanded from the environment during generation, their type is not checked
+    :return: Errors and warnings
+    """
+    errors, warnings = [], []
+    for name in config:
+        if name not in schema and name not in IGNORED_FIELDS:
+            warnings.append(Issue(f"{prefix}{name}", f"Unknown field, it is ignored{_suggest(str(name), schema)}"))
+
+    for name, rule in schema.items():
+        path = f"{prefix}{name}"
+        value = config.get(name)
+        if value is None:
+            if rule.required or (name in config and not rule.nullable):
+                errors.append(Issue(path, "Field is required"))
+            continue
+        # Environment values are strings, they are converted to the type of the field
+        if isinstance(value, str) and value.startswith("$"):
+            continue
+        if not isinstance(value, rule.types) or (bool not in rule.types and isinstance(value, bool)):
+            errors.append(Issue(path, f"Expected {_type_names(rule.types)}, got {type(value).__name__}"))
+            continue
+        if rule.item_types:
+            for index, item in enumerate(value):
+                if not isinstance(item, rule.item_types):
+                    errors.append(Issue(f"{path}[{index}]", f"Expected {_type_names(rule.item_types)}, "
+                                                            f"got {type(item).__name__}"))
+                elif rule.schema is not None:
+                    nested_errors, nested_warnings = check_fields(item, rule.schema, f"{path}[{index}].")
+                    errors += nested_errors
+                    warnings += nested_warnings
+        elif rule.schema is not None:
+            nested_errors, nested_warnings = check_fields(value, rule.schema, f"{path}.")
+            errors += nested_errors
+            warnings += nested_warnings
+        elif rule.choices and not str(value).startswith("$") and value not in rule.choices:
+            short_names = sorted(choice for choice in rule.choices if "." not in choice)
+            errors.append(Issue(path, f"Unknown value `{value}`, use one of {', '.join(short_names)}"
+                                      f"{_suggest(str(value), short_names)}"))
+    return errors, warnings
+
+
+def check_performance(database: dict, prefix: str = "database",
+                      engine: Any = None) -> Tuple[List[Issue], List[Issue]]:
+    """
+    Checks connection settings of a database config against its engine, See `DATABASE_PERFORMANCE`
+    :param database: Database or replica config
+    :param prefix: Field path of the config
+    :param engine: Engine of the config when it does not set one, replicas use the engine of the database
+    :return: Errors and warnings
+    """
+    errors, warnings = [], []
+    performance = database["performance"]
+    if performance.get("pool") is True and performance.get("conn_max_age"):
+        errors.append(Issue(f"{prefix}.performance.conn_max_age", "Persistent connections can not be used with pool"))
+    engine = database.get("engine") or engine
+    if not isinstance(engine, str) or engine.startswith("$"):
+        return errors, warnings
+    name = ENGINE_NAMES.get(engine, engine)
+    supported = DATABASE_PERFORMANCE.get(name, {})
+    for key in performance:
+        if key in compile_schema(DBPerformanceConfig) and key not in supported:
+            warnings.append(Issue(f"{prefix}.performance.{key}", f"Not supported by {name}, it is ignored"))
+    return errors, warnings
+
+
+def check_replicas(config: dict) -> List[Issue]:
+    """
+    Checks read replicas against the database, the driver of the database engine is installed for replicas too
+    :return: Errors
+    """
+    errors = []
+    database = config.get("database") if isinstance(config.get("database"), dict) else {}
+    primary = database.get("engine") or SQLITE
+    for index, replica in enumerate(config["replicas"]):
+        if not isinstance(replica, dict):
+            continue
+        weight = replica.get("weight")
+        if isinstance(weight, int) and weight < 1:
+            errors.append(Issue(f"replicas[{index}].weight", "Weight must be at least 1"))
+        engine = replica.get("engine")
+        if not all(isinstance(value, str) and not value.startswith("$") for value in (engine, primary)):
+            continue
+        if ENGINE_NAMES.get(engine, engine) != ENGINE_NAMES.get(primary, primary):
+            errors.append(Issue(f"replicas[{index}].engine", f"Replicas must use the engine of the database "
+                                                            f"`{ENGINE_NAMES.get(primary, primary)}`"))
+    return errors
+
+
+def check_caches(config: dict) -> List[Issue]:
+    """
+    Checks cache aliases, Django requires a default cache and sessions and pages are stored in a single cache
+    :return: Errors
+    """
+    errors = []
+    cache = config.get("cache") if isinstance(config.get("cache"), dict) else None
+    if cache is None:
+        errors.append(Issue("caches", "Cache aliases can not be used without cache"))
+    aliases = set()
+    for index, cache_alias in enumerate(config["caches"]):
+        alias = cache_alias.get("alias") if isinstance(cache_alias, dict) else None
+        if not isinstance(alias, str):
+            continue
+        if not alias.isidentifier() or alias == "default":
+            errors.append(Issue(f"caches[{index}].alias", f"Alias must be a name other than default, got `{alias}`"))
+        elif alias.lower() in aliases:
+            errors.append(Issue(f"caches[{index}].alias", f"Alias `{alias}` is used more than once"))
+        aliases.add(alias.lower())
+    for flag in ("sessions", "middleware"):
+        enabled = [item for item in [cache, *config["caches"]] if isinstance(item, dict) and item.get(flag) is True]
+        if len(enabled) > 1:
+            errors.append(Issue("caches", f"`{flag}` can be enabled for a single cache"))
+    return errors
+
+
+def validate_config(config: dict, source: str = "") -> ValidationResult:
+    """
+    Validates project config data of a setup.yaml / spec document
+    :param config: Config data, top level keys are lowercased
+    :param source: Spec source
+    :return: ValidationResult
+    """
+    result = ValidationResult(source=source, name=str(config.get("name") or ""))
+    result.errors, result.warnings = check_fields(config, compile_schema(SetupProjectState))
+    name = config.get("name")
+    if isinstance(name, str) and name and not name.startswith("$") and not valid_project_name(name):
+        result.errors.append(Issue("name", "Project name must be a Python identifier, spaces are replaced with `_`"))
+
+    env = config.get("env")
+    if isinstance(env, dict):
+        for key, value in env.items():
+            if not isinstance(value, str):
+                result.errors.append(Issue(f"env.{key}", f"Expected str, got {type(value).__name__}"))
+
+    database = config.get("database")
+    if isinstance(database, dict) and isinstance(database.get("performance"), dict):
+        errors, warnings = check_performance(database)
+        result.errors += errors
+        result.warnings += warnings
+
+    if isinstance(config.get("replicas"), list):
+        result.errors += check_replicas(config)
+        engine = database.get("engine") if isinstance(database, dict) else None
+        for index, replica in enumerate(config["replicas"]):
+            if isinstance(replica, dict) and isinstance(replica.get("performance"), dict):
+                errors, warnings = check_performance(replica, f"replicas[{index}]", engine=engine or SQLITE)
+                result.errors += errors
+                result.warnings += warnings
+
+    if isinstance(config.get("caches"), list):
+        result.errors += check_caches(config)
+
+    libraries = [lib for lib in config.get("libraries") or [] if isinstance(lib, str)]
+    if isinstance(config.get("libraries"), list):
+        known = known_libraries()
+        for index, lib in enumerate(libraries):
+            if normalize_name(lib) not in known:
+                result.warnings.append(Issue(f"libraries[{index}]", f"Unknown library `{lib}`, it is installed but "
+                                                                    f"not configured{_suggest(lib, known)}"))
+    return result
+
+
+def validate_file(file_name: str) -> List[ValidationResult]:
+    """Validates every document of a spec file, it never raises"""
+    results = []
+    for spec in load_specs(file_name):
+        if spec.error:
+            results.append(ValidationResult(source=spec.source, errors=[Issue("", spec.error)]))
+        else:
+            results.append(validate_config(spec.config, source=spec.source))
+    return results
+
+
+def validate_paths(paths: Iterable[str], workers: Optional[int] = None) -> List[ValidationResult]:
+    """
+    Validates spec files and directories of spec files in parallel
+    :param paths: Spec files or directories, directories are searched recursively
+    :param workers: Number of worker processes, defaults to the number of CPUs, `1` validates in this process
+    :return: List[ValidationResult], in the order of files
+    """
+    files = list(dict.fromkeys(file_name for path in paths for file_name in spec_files(path)))
+    if workers == 1 or len(files) < 2:
+        return [result for file_name in files for result in validate_file(file_name)]
+    workers = min(workers or os.cpu_count() or 1, len(files))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = executor.map(validate_file, files, chunksize=max(1, len(files) // (workers * 4)))
+        return [result for chunk in chunks for result in chunk]
+
+
+def validation_report(results: List[ValidationResult], strict: bool = False) -> dict:
+    """Machine readable report of validation results, warnings fail validation when strict"""
+    errors = sum(len(result.errors) for result in results)
+    warnings = sum(len(result.warnings) for result in results)
+    return {
+        "ok": not errors and not (strict and warnings),
+        "specs": len(results),
+        "invalid": len([result for result in results if not result.ok]),
+        "errors": errors,
+        "warnings": warnings,
+        "results": [result.to_dict() for result in results],
+    }
+
+
+def log_validation_summary(results: List[ValidationResult]) -> None:
+    """Logs per spec result and totals"""
+    for result in results:
+        if result.ok:
+            success(f"OK       {result.source}")
+        else:
+            error(f"INVALID  {result.source}")
+        for issue in result.errors:
+            error(f"    error    {issue.field or '-'}: {issue.message}")
+        for issue in result.warnings:
+            log(f"    warning  {issue.field or '-'}: {issue.message}")
+    invalid = len([result for result in results if not result.ok])
+    log(f"{len(results) - invalid} valid, {invalid} invalid")
@@ -1,19 +1,62 @@
-import os
-import random
+import secrets
+import shlex
 import string
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Union, IO
+
 import click
 
+from django_cli.core.events import emit, events_enabled
+from django_cli.core.profiler import span, SUBPROCESS
+from django_cli.core.scheduler import cancel_event
+
+# Serializes output of concurrently running commands, one line at a time
+OUTPUT_LOCK = threading.Lock()
+
+# Seconds between checks of the cancel event of a running command
+CANCEL_POLL_INTERVAL = 0.1
+
+# Messages are written to stderr when stdout carries data, I.E an archive
+STDERR_OUTPUT = False
+
+
+def log_to_stderr(enabled: bool = True) -> None:
+    global STDERR_OUTPUT
+    STDERR_OUTPUT = enabled
+
+
+def stderr_output() -> bool:
+    """Terminal output goes to stderr when stdout carries an archive or the event stream"""
+    return STDERR_OUTPUT or events_enabled()
+
+
+def _message(event, text, color, kwargs):
+    # Messages are events of the event stream, without terminal styling
+    if events_enabled():
+        emit(event, message=str(text))
+        return
+    kwargs.setdefault("err", STDERR_OUTPUT)
+    click.secho(text, fg=color, **kwargs)
+
 
 def error(text, **kwargs):
-    click.secho(text, fg="red", **kwargs)
+    _message("error", text, "red", kwargs)
+
+
+def warning(text, **kwargs):
+    _message("warning", text, "yellow", kwargs)
 
 
 def log(test, **kwargs):
-    click.secho(test, fg="cyan", **kwargs)
+    _message("log", test, "cyan", kwargs)
 
 
 def success(text, **kwargs):
-    click.secho(text, fg="green", **kwargs)
+    _message("success", text, "green", kwargs)
 
 
 def pip_name() -> str:
@@ -22,11 +65,143 @@ def pip_name() -> str:
     return "pip3"
 
 
+@dataclass
+class CommandResult:
+    """
+    Result of an executed command
+    :arg
+        args: Command arguments
+        returncode: Exit code, None if the command did not finish
+        stdout: Output lines
+        stderr: Error output lines
+    """
+    args: List[str]
+    returncode: Optional[int] = None
+    stdout: List[str] = field(default_factory=list)
+    stderr: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+    @property
+    def command(self) -> str:
+        return " ".join(shlex.quote(arg) for arg in self.args)
+
+
+class CommandError(click.ClickException):
+    """Raised when a command fails, times out or can not be started"""
+
+    def __init__(self, message: str, result: CommandResult):
+        super().__init__(message)
+        self.result = result
+
+
+def _stream(pipe: IO[str], lines: List[str], err: bool, echo: bool) -> None:
+    for line in iter(pipe.readline, ""):
+        line = line.rstrip("\n")
+        lines.append(line)
+        if echo:
+            with OUTPUT_LOCK:
+                click.echo(line, err=err or stderr_output())
+    pipe.close()
+
+
+def _run(result: CommandResult,
+         timeout: Optional[float],
+         cwd: Optional[str],
+         echo: bool,
+         cancel: Optional[threading.Event]) -> None:
+    """Runs the command of the result until it exits, is cancelled or times out, see `execute`"""
+    try:
+        process = subprocess.Popen(result.args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=cwd,
+                                   universal_newlines=True, errors="replace", bufsize=1)
+    except OSError as e:
+        raise CommandError(f"Unable to execute `{result.command}`: {e}", result)
+
+    readers = [threading.Thread(target=_stream, args=(process.stdout, result.stdout, False, echo), daemon=True),
+               threading.Thread(target=_stream, args=(process.stderr, result.stderr, True, echo), daemon=True)]
+    for reader in readers:
+        reader.start()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        while result.returncode is None:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if cancel is not None:
+                remaining = CANCEL_POLL_INTERVAL if remaining is None else min(remaining, CANCEL_POLL_INTERVAL)
+            try:
+                result.returncode = process.wait(timeout=remaining)
+            except subprocess.TimeoutExpired:
+                if cancel is not None and cancel.is_set():
+                    process.kill()
+                    process.wait()
+                    raise CommandError(f"`{result.command}` was cancelled", result)
+                if deadline is not None and time.monotonic() >= deadline:
+                    process.kill()
+                    process.wait()
+                    raise CommandError(f"`{result.command}` timed out after {timeout} seconds", result)
+    finally:
+        for reader in readers:
+            reader.join()
+
+
 # Terminal Execution
-def execute(terminal_command: str) -> None:
-    os.system(terminal_command)
+def execute(command: Union[str, Sequence[str]],
+            timeout: Optional[float] = None,
+            check: bool = False,
+            cwd: Optional[str] = None,
+            echo: bool = True,
+            cancel: Optional[threading.Event] = None) -> CommandResult:
+    """
+    Executes a command without a shell, stdout and stderr are streamed line by line
+    :param command: Command arguments, a string is split into arguments
+    :param timeout: Seconds to wait before the command is killed
+    :param check: Raise CommandError if the command exits with a non zero code
+    :param cwd: Working directory of the command
+    :param echo: Print output lines, output is captured in the result either way
+    :param cancel: Command is killed when the event is set, defaults to the cancel event of the running scheduler step
+    :raises CommandError: If the command times out, is cancelled, can not be started or fails with `check`
+    :return: CommandResult
+    """
+    args = shlex.split(command) if isinstance(command, str) else list(command)
+    result = CommandResult(args=args)
+    cancel = cancel or cancel_event()
+    emit("subprocess_start", command=result.command)
+    start = time.perf_counter()
+    with span(result.command, SUBPROCESS) as item:
+        try:
+            _run(result, timeout=timeout, cwd=cwd, echo=echo, cancel=cancel)
+        finally:
+            item.args["returncode"] = result.returncode
+            emit("subprocess_exit", command=result.command, returncode=result.returncode,
+                 seconds=round(time.perf_counter() - start, 6))
+
+    if check and not result.ok:
+        raise CommandError(f"`{result.command}` exited with code {result.returncode}", result)
+    return result
+
+
+def execute_many(commands: Sequence[Union[str, Sequence[str]]], workers: int = 4, **kwargs) -> List[CommandResult]:
+    """
+    Executes independent commands concurrently, at most `workers` at a time
+    Accepts same keyword arguments as `execute`, results are returned in the order of the commands
+    A command that fails, times out or can not be started does not stop the others,
+    its result is not `ok` and the error message is the last line of its stderr
+    """
+    # Worker threads do not see the cancel event of the calling scheduler step
+    kwargs.setdefault("cancel", cancel_event())
+
+    def run(command):
+        try:
+            return execute(command, **kwargs)
+        except CommandError as e:
+            e.result.stderr.append(e.message)
+            return e.result
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return list(executor.map(run, commands))
 
 
 def create_secret_key():
     chars = string.ascii_letters + string.digits
-    return "_" + "".join([random.choice(chars) for i in range(64)])
+    return "_" + "".join([secrets.choice(chars) for i in range(64)])
@@ -0,0 +1,6 @@
+import os
+
+from django_cli.const import CONFIG_CACHE_ENV
+
+# Parsed config files are not cached into the cache directory of the user
+os.environ[CONFIG_CACHE_ENV] = ""
@@ -1,7 +1,32 @@
+import os
 import unittest
+
+from django_cli.const import CONFIG_CACHE_ENV
+
+# Parsed config files are not cached into the cache directory of the user, set before the tests are imported
+os.environ[CONFIG_CACHE_ENV] = ""
+
 from test_model import DataStateTest
 from test_cli import TestCLI, TestCliWithArgs
 from test_errors import ErrorTest
+from test_installer import InstallerTest
+from test_utils import ExecuteTest
+from test_template import TemplateTest
+from test_filemap import FileMapTest
+from test_manifest import ManifestTest
+from test_batch import BatchTest
+from test_api import ApiTest
+from test_server import ServerTest
+from test_startup import StartupTest
+from test_resolver import ResolverTest
+from test_yaml_file import YamlFileTest
+from test_validate import ValidateTest
+from test_scheduler import SchedulerTest
+from test_journal import JournalTest
+from test_profiler import ProfilerTest
+from test_events import EventsTest
+from test_bench import BenchTest
+from test_benchmarks import BenchmarksTest
 
 if __name__ == "__main__":
     unittest.main()
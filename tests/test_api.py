@@ -0,0 +1,54 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from django_cli.api import generate, ConfigError
+from django_cli.setup_project.prompt import PromptConfig, Question
+
+CONFIG = {
+    "name": "Api Project",
+    "libraries": ["django-channels"],
+    "database": {"engine": "postgresql", "name": "api", "password": "password"},
+}
+
+
+class ApiTest(TestCase):
+
+    def test_generate(self):
+        cwd = sorted(os.listdir("."))
+        files = generate(CONFIG)
+        self.assertEqual(sorted(os.listdir(".")), cwd)
+        self.assertIn("src/Api_Project/routing.py", files)
+        self.assertIn(b"DATABASE_PASSWORD=password", files[".env"])
+        self.assertIn(b"password: $DATABASE_PASSWORD", files["setup.yaml"])
+        # Config is not modified
+        self.assertEqual(CONFIG["libraries"], ["django-channels"])
+        self.assertIn("database", CONFIG)
+
+    def test_no_leaking_state(self):
+        first = generate(CONFIG)
+        second = generate(CONFIG)
+        self.assertEqual(first["src/Api_Project/config.py"], second["src/Api_Project/config.py"])
+        self.assertEqual(first["src/Api_Project/settings.py"], second["src/Api_Project/settings.py"])
+
+    def test_threads(self):
+        configs = [{"name": f"Project {i}", "libraries": ["djangorestframework"] if i % 2 else []} for i in range(16)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(generate, configs))
+        for i, files in enumerate(results):
+            settings = files[f"src/Project_{i}/settings.py"]
+            self.assertEqual(b"'rest_framework'" in settings, bool(i % 2))
+            self.assertIn(f"'Project_{i}.urls'".encode(), settings)
+
+    def test_invalid_config(self):
+        with self.assertRaises(ConfigError):
+            generate({"libraries": []})
+        with self.assertRaises(ConfigError):
+            generate({"name": "Invalid", "database": "DATABASE"})
+
+    def test_prompt_state(self):
+        PromptConfig(project_name="First")
+        prompt = PromptConfig(project_name="Second")
+        self.assertIsInstance(PromptConfig.PROMPT_QUES[0], Question)
+        self.assertEqual(PromptConfig.answer, {})
+        self.assertEqual(prompt.answer, {"name": "Second"})
@@ -0,0 +1,66 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from click.testing import CliRunner
+
+from django_cli.cli import batch
+from django_cli.const import MANIFEST_FILE
+from django_cli.setup_project.batch import load_specs, run_batch, BatchSpec
+
+SPECS = """name: Billing Service
+libraries:
+- djangorestframework
+---
+name: Chat
+libraries:
+- django-channels
+cache:
+  backend: redis
+  location: localhost:6379
+---
+description: project without a name
+---
+name: Chat
+"""
+
+
+class BatchTest(TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.spec = os.path.join(self.directory.name, "services.yaml")
+        with open(self.spec, "w") as file:
+            file.write(SPECS)
+        self.out = os.path.join(self.directory.name, "out")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_load_specs(self):
+        specs = load_specs(self.spec)
+        self.assertEqual([spec.source for spec in specs], [f"{self.spec}#{i}" for i in range(1, 5)])
+        self.assertEqual(specs[0].config["name"], "Billing Service")
+        # Directory of specs
+        self.assertEqual(len(load_specs(self.directory.name)), 4)
+
+    def test_run_batch(self):
+        results = run_batch(load_specs(self.spec), self.out, workers=2)
+        self.assertEqual([result.ok for result in results], [True, True, False, False])
+        self.assertTrue(os.path.isfile(os.path.join(self.out, "Billing_Service", "src", "Billing_Service",
+                                                    "settings.py")))
+        self.assertTrue(os.path.isfile(os.path.join(self.out, "Chat", "src", "Chat", "routing.py")))
+        self.assertTrue(os.path.isfile(os.path.join(self.out, "Chat", MANIFEST_FILE)))
+        self.assertIn("Duplicate", results[3].error)
+
+        results = run_batch([BatchSpec(source="a", config={"name": "../escape"}),
+                             BatchSpec(source="b", config={"name": os.path.join(self.out, "absolute")}),
+                             BatchSpec(source="c", config={"name": "my-service"})], self.out, workers=1)
+        self.assertEqual([result.ok for result in results], [False, False, False])
+        self.assertIn("Invalid project name", results[0].error)
+        self.assertFalse(os.path.exists(os.path.join(os.path.dirname(self.out), "escape")))
+
+    def test_batch_cli(self):
+        result = CliRunner().invoke(batch, [self.spec, "--out", self.out, "--workers", "2"])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("2 generated, 2 failed", result.output)
@@ -0,0 +1,76 @@
+import json
+from unittest import TestCase
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from django_cli.api import generate
+from django_cli.cli import cli
+from django_cli.config import DBEngine, LOC_MEM_CACHE
+from django_cli.setup_project.bench import bench_config, bench_project, percentile, PHASES
+from django_cli.utils import CommandResult
+
+
+class BenchTest(TestCase):
+
+    def test_percentile(self):
+        values = [0.4, 0.1, 0.3, 0.2]
+        self.assertAlmostEqual(percentile(values, 50), 0.25)
+        self.assertAlmostEqual(percentile(values, 0), 0.1)
+        self.assertAlmostEqual(percentile(values, 100), 0.4)
+        self.assertEqual(percentile([0.5], 99), 0.5)
+
+    def test_bench_config(self):
+        config = {"name": "Bench", "libraries": ["celery"], "required": ["redis"],
+                  "database": {"engine": "postgresql", "name": "bench"},
+                  "cache": {"backend": "redis", "sessions": True},
+                  "caches": [{"alias": "pages", "location": "redis://pages"}], "replicas": [{"host": "replica"}]}
+        bench = bench_config(config, libraries=[])
+        self.assertEqual(bench["database"]["engine"], "sqlite3")
+        self.assertEqual(bench["cache"], {"sessions": True, "backend": LOC_MEM_CACHE})
+        self.assertEqual(bench["caches"], [{"alias": "pages", "backend": LOC_MEM_CACHE}])
+        self.assertEqual(bench["libraries"], [])
+        self.assertNotIn("required", bench)
+        self.assertNotIn("replicas", bench)
+        self.assertEqual(config["libraries"], ["celery"])
+
+    def test_database_config(self):
+        files = generate({"name": "Bench", "database": {"engine": "postgresql", "name": "bench"}})
+        config = files["src/Bench/config.py"].decode()
+        self.assertIn("'ENGINE' : _env_path('DATABASE_ENGINE')", config)
+        self.assertIn(f"'postgresql': '{DBEngine['postgresql']}'", config)
+        self.assertIn(b"DATABASE_ENGINE=postgresql", files[".env"])
+        self.assertIn(b"MEDIA_URL = '/media/'", files["src/Bench/settings.py"])
+
+    def test_bench_project(self):
+        result = bench_project({"name": "Bench Project", "cache": {"backend": "redis"}}, "Bench Project", 2,
+                               "/admin/login/")
+        self.assertTrue(result.ok, result.error)
+        self.assertEqual(result.status, 200)
+        self.assertEqual(len(result.samples), 2)
+        summary = result.summary()
+        self.assertEqual(list(summary), PHASES)
+        self.assertGreater(summary["process"]["p50"], summary["django_setup"]["p50"])
+
+        # Project of a library that is not installed does not start
+        missing = CommandResult(args=[], returncode=1,
+                                stderr=["ModuleNotFoundError: No module named 'rest_framework'"])
+        with patch("django_cli.setup_project.bench.execute", return_value=missing) as execute:
+            result = bench_project({"name": "Bench Project"}, "missing", 2, "/", libraries=["djangorestframework"])
+        execute.assert_called_once()
+        self.assertFalse(result.ok)
+        self.assertEqual(result.error, "ModuleNotFoundError: No module named 'rest_framework', "
+                                       "install libraries of the project into this environment")
+        self.assertEqual(result.samples, [])
+        self.assertEqual(result.libraries, ["djangorestframework"])
+
+    def test_cli(self):
+        runner = CliRunner(mix_stderr=False)
+        with runner.isolated_filesystem():
+            with open("setup.yaml", "w") as file:
+                file.write("name: Bench\n")
+            result = runner.invoke(cli, ["bench-project", "--repeat", "1", "--format", "json"])
+            self.assertEqual(result.exit_code, 0, result.stderr)
+            report = json.loads(result.stdout)
+            self.assertEqual([item["name"] for item in report["results"]], ["Bench"])
+            self.assertEqual(report["results"][0]["runs"], 1)
@@ -0,0 +1,40 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from benchmarks.runner import Measurement, Results, compare, comparison_table
+
+
+def measurement(median):
+    return Measurement(median=median, min=median, mean=median, stdev=0.0, rounds=3, number=1)
+
+
+class BenchmarksTest(TestCase):
+
+    def setUp(self) -> None:
+        self.baseline = Results(benchmarks={"render": measurement(1.0), "parse": measurement(1.0),
+                                            "state": measurement(1.0), "limited": measurement(1.0)})
+
+    def test_compare(self):
+        results = Results(benchmarks={"render": measurement(1.3), "parse": measurement(1.2),
+                                      "state": measurement(0.7), "limited": measurement(1.3),
+                                      "startproject": measurement(2.0)})
+        comparisons = compare(results, self.baseline, {"limited": 0.5}, default_threshold=0.25)
+        self.assertEqual([item.name for item in comparisons], ["render", "parse", "state", "limited", "startproject"])
+        self.assertEqual([item.status for item in comparisons], ["REGRESSED", "ok", "improved", "ok", "new"])
+        self.assertEqual([item.regressed for item in comparisons], [True, False, False, False, False])
+        self.assertAlmostEqual(comparisons[0].change, 0.3)
+        self.assertEqual(comparisons[3].threshold, 0.5)
+        self.assertIsNone(comparisons[4].change)
+        self.assertIn("startproject", comparison_table(comparisons))
+
+        # Without a baseline every benchmark is new
+        comparisons = compare(results, None, {})
+        self.assertEqual({item.status for item in comparisons}, {"new"})
+        self.assertFalse(any(item.regressed for item in comparisons))
+
+    def test_results(self):
+        with tempfile.TemporaryDirectory() as directory:
+            location = os.path.join(directory, "baseline.json")
+            self.baseline.save(location)
+            self.assertEqual(Results.load(location).benchmarks, self.baseline.benchmarks)
@@ -1,10 +1,13 @@
 import os
 import shutil
 from unittest import TestCase
+from unittest.mock import patch
 from click.testing import CliRunner
 from django_cli.cli import make_generate, start_project, install_libraries
+from django_cli.const import FILE_EXIST_ERROR, LOG_SUCCESS_PROJECT_COMPLETE
+from django_cli.setup_project.model import SetupProjectState
 
-GENERATE_TEST_INPUT = "Test\nA\nB\nn\ny\ny\ny\ny\n2\nA\nB\nC\nD\nE\nn"
+GENERATE_TEST_INPUT = "Test\nA\nB\nn\ny\ny\nn\ny\ny\n2\nA\nB\nC\nD\nE\nn\nn"
 
 
 class TestCLI(TestCase):
@@ -22,25 +25,39 @@ class TestCLI(TestCase):
         self.assertEqual(result.exit_code, 0)
         self.delete_requirement()
 
-    def test_generate_project(self):
+    @patch.object(SetupProjectState, "install_libraries", return_value=True)
+    def test_generate_project(self, install):
         runner = CliRunner()
         result = runner.invoke(start_project, input=GENERATE_TEST_INPUT)
-        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn(LOG_SUCCESS_PROJECT_COMPLETE, result.output)
         result = runner.invoke(install_libraries)
         self.assertEqual(result.exit_code, 0)
         self.delete_requirement()
 
-
     def test_regenerate(self):
         self.test_generate_project()
-        self.test_generate_project()
+        # Source directory exists
+        with patch.object(SetupProjectState, "install_libraries", return_value=True):
+            result = CliRunner().invoke(start_project, input=GENERATE_TEST_INPUT)
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn(FILE_EXIST_ERROR, result.output)
+        self.assertNotIn(LOG_SUCCESS_PROJECT_COMPLETE, result.output)
         self.delete_requirement()
 
+    @patch.object(SetupProjectState, "install_libraries", return_value=False)
+    def test_install_failed(self, install):
+        result = CliRunner().invoke(start_project, input=GENERATE_TEST_INPUT)
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("Installing Libraries did not finish", result.output)
+        self.assertNotIn(LOG_SUCCESS_PROJECT_COMPLETE, result.output)
+
     def tearDown(self) -> None:
         os.remove(f"{self.path}/setup.yaml")
         os.remove(f"{self.path}/.env")
         if os.path.isdir(f"{self.path}/src"):
             shutil.rmtree(self.path + "/src")
+        shutil.rmtree(f"{self.path}/.django-cli", ignore_errors=True)
 
 
 class TestCliWithArgs(TestCase):
@@ -57,6 +74,7 @@ class TestCliWithArgs(TestCase):
         os.remove(f"{self.path}/.env")
         if os.path.isdir(f"{self.path}/src"):
             shutil.rmtree(self.path + "/src")
+        shutil.rmtree(f"{self.path}/.django-cli", ignore_errors=True)
 
     def test_generate(self):
         runner = CliRunner()
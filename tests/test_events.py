@@ -0,0 +1,94 @@
+import io
+import json
+import sys
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from django_cli.cli import cli
+from django_cli.core.events import EventWriter, start_events, stop_events, events_enabled
+from django_cli.setup_project.model import SetupProjectState
+from django_cli.utils import execute, log
+
+
+class EventsTest(TestCase):
+
+    def tearDown(self) -> None:
+        stop_events()
+
+    def test_buffered_writer(self):
+        stream = io.StringIO()
+        writer = EventWriter(stream, buffer_size=1024, flush_interval=60)
+        writer.emit("log", message="buffered")
+        self.assertEqual(stream.getvalue(), "")
+        writer.emit("log", message="x" * 1024)
+        self.assertEqual(len(stream.getvalue().splitlines()), 2)
+        writer.emit("log", message="last")
+        writer.flush()
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([event["message"][:8] for event in events], ["buffered", "x" * 8, "last"])
+
+    def test_flush_interval(self):
+        stream = io.StringIO()
+        writer = EventWriter(stream, buffer_size=1024, flush_interval=0.05)
+        writer.emit("task_start", task="install")
+        self.assertEqual(stream.getvalue(), "")
+        # No other event follows, the line is written by the timer
+        deadline = time.monotonic() + 5
+        while not stream.getvalue() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(json.loads(stream.getvalue())["task"], "install")
+        self.assertIsNone(writer.timer)
+
+    def test_messages_and_subprocess(self):
+        stream = io.StringIO()
+        start_events(stream)
+        log("Installing")
+        execute([sys.executable, "-c", "print('output')"], echo=False)
+        stop_events()
+        self.assertFalse(events_enabled())
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([event["event"] for event in events], ["log", "subprocess_start", "subprocess_exit"])
+        self.assertEqual(events[0]["message"], "Installing")
+        self.assertEqual(events[2]["returncode"], 0)
+
+    @patch.object(SetupProjectState, "create_requirements_file")
+    @patch.object(SetupProjectState, "install_libraries", return_value=True)
+    def test_cli(self, install, requirements):
+        runner = CliRunner(mix_stderr=False)
+        with runner.isolated_filesystem():
+            with open("setup.yaml", "w") as file:
+                file.write("name: Streamed\n")
+            result = runner.invoke(cli, ["--output", "jsonl", "startproject"])
+            self.assertEqual(result.exit_code, 0, result.stderr)
+            events = [json.loads(line) for line in result.stdout.splitlines()]
+            self.assertEqual(result.stderr, "")
+
+            names = [event["event"] for event in events]
+            self.assertEqual((names[0], names[-1]), ("command_start", "command_end"))
+            self.assertEqual(names.count("task_start"), 5)
+            ends = [event for event in events if event["event"] == "task_end"]
+            self.assertTrue(all(event["status"] == "done" and event["seconds"] >= 0 for event in ends))
+            written = {event["path"]: event["bytes"] for event in events if event["event"] == "file_written"}
+            with open("src/manage.py", "rb") as file:
+                self.assertEqual(written["src/manage.py"], len(file.read()))
+            self.assertIn("success", names)
+
+            result = runner.invoke(cli, ["--output", "jsonl", "startproject", "--archive", "-"])
+            self.assertEqual(result.exit_code, 2)
+
+    def test_json_report(self):
+        runner = CliRunner(mix_stderr=False)
+        with runner.isolated_filesystem():
+            with open("setup.yaml", "w") as file:
+                file.write("name: Streamed\n")
+            result = runner.invoke(cli, ["--output", "jsonl", "validate", "--format", "json", "setup.yaml"])
+            self.assertEqual(result.exit_code, 0, result.stderr)
+            # Report is an event of the stream
+            events = [json.loads(line) for line in result.stdout.splitlines()]
+            self.assertEqual([event["event"] for event in events],
+                             ["command_start", "validation_report", "command_end"])
+            self.assertTrue(events[1]["ok"])
+            self.assertEqual(events[1]["specs"], 1)
@@ -0,0 +1,78 @@
+import io
+import os
+import tarfile
+import tempfile
+import zipfile
+from unittest import TestCase
+
+from click.testing import CliRunner
+
+from django_cli.cli import start_project
+from django_cli.const import MANIFEST_FILE
+from django_cli.core.filemap import commit_file_map, top_level_entries, write_archive, archive_format
+from django_cli.setup_project.model import SetupProjectState, SETUP_CONFIG_FILE, ENV_FILE
+
+
+class FileMapTest(TestCase):
+
+    def setUp(self) -> None:
+        self.state = SetupProjectState(name="Test Project", libraries=["django-channels"], media_files=False)
+
+    def test_render_project(self):
+        files = self.state.render_project()
+        self.assertIn(SETUP_CONFIG_FILE, files)
+        self.assertIn(ENV_FILE, files)
+        self.assertIn("src/Test_Project/", files)
+        self.assertIn("src/static/", files)
+        self.assertNotIn("src/media/", files)
+        self.assertIn("src/Test_Project/routing.py", files)
+        self.assertIn(b"'Test_Project.settings'", files["src/manage.py"])
+        self.assertEqual(top_level_entries(files), [SETUP_CONFIG_FILE, ENV_FILE, "src/", "readme.md", ".gitignore"])
+
+    def test_commit_file_map(self):
+        files = self.state.render_project()
+        with tempfile.TemporaryDirectory() as target:
+            commit_file_map(files, target)
+            self.assertTrue(os.path.isfile(os.path.join(target, "src", "Test_Project", "settings.py")))
+            self.assertTrue(os.path.isdir(os.path.join(target, "src", "template")))
+            self.assertTrue(os.path.isfile(os.path.join(target, ".gitignore")))
+            # No staging directory is left behind
+            self.assertEqual(sorted(os.listdir(target)), sorted(["setup.yaml", ".env", "src", "readme.md", ".gitignore"]))
+
+    def test_commit_conflict(self):
+        with tempfile.TemporaryDirectory() as target:
+            os.mkdir(os.path.join(target, "src"))
+            with self.assertRaises(FileExistsError):
+                commit_file_map(self.state.render_project(), target)
+            self.assertEqual(os.listdir(target), ["src"])
+
+    def test_write_archive(self):
+        files = self.state.render_project()
+        stream = io.BytesIO()
+        write_archive(files, stream, "gz")
+        stream.seek(0)
+        with tarfile.open(fileobj=stream, mode="r:gz") as archive:
+            self.assertEqual(archive.getnames(), [path.rstrip("/") for path in files])
+            self.assertTrue(archive.getmember("src").isdir())
+            self.assertEqual(archive.extractfile("src/manage.py").read(), files["src/manage.py"])
+
+        stream = io.BytesIO()
+        write_archive(files, stream, archive_format("project.zip"))
+        with zipfile.ZipFile(stream) as archive:
+            self.assertEqual(archive.read("src/Test_Project/settings.py"), files["src/Test_Project/settings.py"])
+
+        with self.assertRaises(ValueError):
+            archive_format("project.rar")
+
+    def test_archive_cli(self):
+        runner = CliRunner(mix_stderr=False)
+        with runner.isolated_filesystem():
+            with open(SETUP_CONFIG_FILE, "w") as file:
+                file.write("name: Archived\nlibraries:\n- celery\n")
+            result = runner.invoke(start_project, ["--archive", "-"])
+            self.assertEqual(result.exit_code, 0)
+            # Nothing is written to the working directory
+            self.assertEqual(os.listdir("."), [SETUP_CONFIG_FILE])
+            with tarfile.open(fileobj=io.BytesIO(result.stdout_bytes), mode="r:gz") as archive:
+                self.assertIn("src/Archived/settings.py", archive.getnames())
+                self.assertIn(MANIFEST_FILE, archive.getnames())
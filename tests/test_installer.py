@@ -0,0 +1,87 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from django_cli.setup_project.installer import (merge_requirements,
+                                                requirement_name,
+                                                batch_install_command,
+                                                installed_distributions,
+                                                is_satisfied,
+                                                pending_requirements,
+                                                wheelhouse_args,
+                                                OfflineInstallError,
+                                                freeze_requirements)
+
+
+class InstallerTest(TestCase):
+
+    def test_requirement_name(self):
+        self.assertEqual(requirement_name("Django_Filter>=2.0"), "django-filter")
+        self.assertEqual(requirement_name("celery[redis]==5.2.3"), "celery")
+        self.assertIsNone(requirement_name("-r base.txt"))
+        self.assertIsNone(requirement_name("# comment"))
+
+    def test_merge_requirements(self):
+        libs = ["djangorestframework", "celery", "django_filter", "django-filter", "psycopg2-binary"]
+        merged = merge_requirements(libs, pinned=["celery==5.2.3"])
+        self.assertEqual(merged, ["djangorestframework", "django_filter", "psycopg2-binary"])
+
+    def test_batch_install_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            req_file = os.path.join(directory, "requirements.txt")
+            command = batch_install_command(["celery"], req_file=req_file, skip_satisfied=False)
+            self.assertEqual(command, ["pip3", "install", "celery"])
+            self.assertIsNone(batch_install_command([], req_file=req_file))
+            with open(req_file, "w") as file:
+                file.write("celery==5.2.3\nDjango>=3.2  # pinned\n")
+            command = batch_install_command(["celery", "django", "whitenoise"], req_file=req_file,
+                                            skip_satisfied=False)
+            self.assertEqual(command, ["pip3", "install", "whitenoise", "-r", req_file])
+
+    def test_is_satisfied(self):
+        installed = installed_distributions()
+        self.assertTrue(is_satisfied("Django>=1.0", installed))
+        self.assertTrue(is_satisfied("click; python_version < '3'", installed))
+        self.assertFalse(is_satisfied("django<1.0", installed))
+        self.assertFalse(is_satisfied("not-a-real-django-cli-package", installed))
+        self.assertFalse(is_satisfied("django >>> 1", installed))
+
+    def test_skip_satisfied(self):
+        self.assertEqual(pending_requirements(["django", "not-a-real-django-cli-package"]),
+                         ["not-a-real-django-cli-package"])
+        with tempfile.TemporaryDirectory() as directory:
+            req_file = os.path.join(directory, "requirements.txt")
+            with open(req_file, "w") as file:
+                file.write("django>=1.0\nclick\n")
+            self.assertIsNone(batch_install_command(["pyyaml"], req_file=req_file))
+            with open(req_file, "a") as file:
+                file.write("not-a-real-django-cli-package==1.0\n")
+            command = batch_install_command(["django", "pyyaml"], req_file=req_file)
+            self.assertEqual(command, ["pip3", "install", "not-a-real-django-cli-package==1.0"])
+
+    def test_wheelhouse(self):
+        with tempfile.TemporaryDirectory() as wheelhouse:
+            self.assertEqual(wheelhouse_args(["celery"], wheelhouse=wheelhouse), [])
+            for wheel in ["celery-5.2.3-py3-none-any.whl", "django_filter-21.1-py3-none-any.whl", "broken.whl"]:
+                open(os.path.join(wheelhouse, wheel), "w").close()
+
+            self.assertEqual(wheelhouse_args(["celery", "Django-Filter>=21"], wheelhouse=wheelhouse),
+                             ["--no-index", "--find-links", wheelhouse])
+            self.assertEqual(wheelhouse_args(["celery<5", "whitenoise"], wheelhouse=wheelhouse),
+                             ["--find-links", wheelhouse])
+            with self.assertRaises(OfflineInstallError):
+                wheelhouse_args(["celery", "whitenoise"], wheelhouse=wheelhouse, offline=True)
+
+            command = batch_install_command(["celery"], req_file=os.path.join(wheelhouse, "requirements.txt"),
+                                            skip_satisfied=False, wheelhouse=wheelhouse, offline=True)
+            self.assertEqual(command, ["pip3", "install", "--no-index", "--find-links", wheelhouse, "celery"])
+
+    def test_freeze_requirements(self):
+        installed = installed_distributions()
+        frozen = freeze_requirements(["Django", "not-a-real-django-cli-package"], installed)
+        names = [requirement_name(req) for req in frozen]
+        self.assertIn("django", names)
+        self.assertIn("asgiref", names)
+        self.assertNotIn("pyyaml", names)
+        self.assertEqual(frozen[-1], "not-a-real-django-cli-package")
+        self.assertIn(f"Django=={installed['django'].version}", frozen)
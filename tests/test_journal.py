@@ -0,0 +1,124 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from click.testing import CliRunner
+from dotenv import dotenv_values
+
+from django_cli.api import generate
+from django_cli.cli import start_project
+from django_cli.const import JOURNAL_FILE, MANIFEST_FILE
+from django_cli.core.journal import Journal
+from django_cli.core.scheduler import Scheduler, Step, DONE, RESUMED
+from django_cli.setup_project.model import SetupProjectState
+
+
+class JournalTest(TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.target = self.directory.name
+        self.location = os.path.join(self.target, JOURNAL_FILE)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_resumed_steps(self):
+        calls = []
+        steps = [
+            Step("download", lambda: calls.append("download"), inputs=["celery"]),
+            Step("render", lambda: calls.append("render")),
+            Step("write", lambda: calls.append("write"), depends=["render"], inputs={"name": "Test"}),
+            Step("install", lambda: calls.append("install") or False, depends=["download", "render"], inputs=[]),
+        ]
+        Scheduler(steps, journal=Journal(self.location)).run()
+        self.assertEqual(set(Journal.load(self.location).steps), {"download", "write"})
+
+        calls.clear()
+        scheduler = Scheduler(steps, journal=Journal.load(self.location))
+        self.assertEqual(scheduler.resumed_steps(), ["download", "write"])
+        results = scheduler.run()
+        # Render runs again, install depends on it
+        self.assertEqual(sorted(calls), ["install", "render"])
+        self.assertEqual(results["write"].status, RESUMED)
+        self.assertEqual(results["install"].status, DONE)
+
+        # Changed inputs run the step and its dependents again
+        steps[0].inputs = ["celery", "redis"]
+        self.assertEqual(Scheduler(steps, journal=Journal.load(self.location)).resumed_steps(), ["write"])
+
+    @patch.object(SetupProjectState, "create_requirements_file")
+    @patch.object(SetupProjectState, "install_libraries", side_effect=[False, True])
+    def test_resume_project(self, install, requirements):
+        state = SetupProjectState(name="Test Project", libraries=["celery"])
+        state.create_project(self.target)
+        self.assertTrue(os.path.isfile(os.path.join(self.target, "src", "Test_Project", "settings.py")))
+        with open(self.location) as file:
+            self.assertEqual(set(json.load(file)["steps"]), {"write", "manifest", "requirements"})
+
+        # Project is not written again, failed install and the requirement file are
+        state = SetupProjectState(name="Test Project", libraries=["celery"])
+        with patch("django_cli.setup_project.model.commit_file_map") as commit:
+            state.create_project(self.target, resume=True)
+            commit.assert_not_called()
+        self.assertEqual(install.call_count, 2)
+        self.assertEqual(requirements.call_count, 2)
+        self.assertEqual(set(Journal.load(self.location).steps), {"write", "manifest", "install", "requirements"})
+        self.assertTrue(os.path.isfile(os.path.join(self.target, MANIFEST_FILE)))
+
+    @patch.object(SetupProjectState, "create_requirements_file")
+    @patch.object(SetupProjectState, "install_libraries", return_value=True)
+    def test_resume_updates_project(self, install, requirements):
+        SetupProjectState(name="Test Project").create_project(self.target)
+
+        # Project exists, files of the new state are written over the previous ones
+        state = SetupProjectState(name="Test Project", libraries=["djangorestframework"])
+        self.assertIsNone(state.create_project(self.target, resume=True))
+        with open(os.path.join(self.target, "src", "Test_Project", "settings.py")) as file:
+            self.assertIn("'rest_framework'", file.read())
+        with open(os.path.join(self.target, MANIFEST_FILE)) as file:
+            self.assertEqual(json.load(file)["fields"], state.get_field_hashes())
+
+    @staticmethod
+    @contextlib.contextmanager
+    def clean_env(env):
+        """Environment without the variables of the .env file, each run loads them like a new process"""
+        with patch.dict(os.environ):
+            for key in dotenv_values(stream=io.StringIO(env.decode())):
+                os.environ.pop(key, None)
+            yield
+
+    @patch.object(SetupProjectState, "create_requirements_file")
+    @patch.object(SetupProjectState, "install_libraries", side_effect=[False, True])
+    def test_resume_generated_project(self, install, requirements):
+        runner = CliRunner(mix_stderr=False)
+        with runner.isolated_filesystem(temp_dir=self.target):
+            # setup.yaml of `generate` reads database engine and credentials from .env
+            files = generate({"name": "Test", "database": {"engine": "postgresql", "name": "test",
+                                                           "performance": {"pool": True}}})
+            for name in ("setup.yaml", ".env"):
+                with open(name, "wb") as file:
+                    file.write(files[name])
+            self.assertIn(b"$DATABASE_ENGINE", files["setup.yaml"])
+
+            with self.clean_env(files[".env"]):
+                result = runner.invoke(start_project)
+            self.assertEqual(result.exit_code, 1)
+            self.assertIn("Installing Libraries did not finish", result.stderr)
+
+            with self.clean_env(files[".env"]), patch("django_cli.setup_project.model.commit_file_map") as commit:
+                result = runner.invoke(start_project, ["--resume"])
+                commit.assert_not_called()
+            self.assertEqual(result.exit_code, 0, result.stderr)
+            self.assertIn("Writing Project Files [Done, Resumed]", result.output + result.stderr)
+            self.assertEqual(install.call_count, 2)
+            with open(os.path.join("src", "Test", "config.py")) as file:
+                self.assertIn("'pool'", file.read())
+
+    def test_cli_options(self):
+        result = CliRunner().invoke(start_project, ["--resume", "--update"])
+        self.assertEqual(result.exit_code, 2)
@@ -0,0 +1,123 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from django_cli.api import generate
+from django_cli.cli import start_project
+from django_cli.const import MANIFEST_FILE, LOG_PROJECT_UP_TO_DATE
+from django_cli.core.filemap import commit_file_map
+from django_cli.core.manifest import manifest_bytes, read_manifest, atomic_write
+from django_cli.setup_project.handler import ProjectInitializer, create_state
+from django_cli.setup_project.model import SetupProjectState
+
+
+@patch.object(SetupProjectState, "create_requirements_file")
+@patch.object(SetupProjectState, "install_libraries")
+class ManifestTest(TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.target = self.directory.name
+        state = SetupProjectState(name="Test Project", libraries=["celery"])
+        files = state.render_project()
+        commit_file_map(files, self.target)
+        atomic_write(os.path.join(self.target, MANIFEST_FILE), manifest_bytes(state.get_manifest(files)))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def path(self, *args):
+        return os.path.join(self.target, "src", "Test_Project", *args)
+
+    def test_unchanged(self, install, requirements):
+        report = SetupProjectState(name="Test Project", libraries=["celery"]).update_project(self.target)
+        self.assertEqual(report.written, [])
+        self.assertEqual(report.modified, [])
+        install.assert_not_called()
+
+    def test_update(self, install, requirements):
+        state = SetupProjectState(name="Test Project", libraries=["celery", "django-channels"])
+        report = state.update_project(self.target)
+        self.assertEqual(report.added, ["src/Test_Project/routing.py"])
+        self.assertEqual(report.updated, ["src/Test_Project/settings.py"])
+        self.assertEqual(report.reasons["src/Test_Project/settings.py"], ["libraries"])
+        install.assert_called_once()
+        with open(self.path("settings.py")) as file:
+            self.assertIn("'channels'", file.read())
+        manifest = read_manifest(os.path.join(self.target, MANIFEST_FILE))
+        self.assertIn("src/Test_Project/routing.py", manifest["files"])
+        self.assertIn("setup.yaml", manifest["files"])
+
+        # Removing the library removes the linked file
+        report = SetupProjectState(name="Test Project", libraries=["celery"]).update_project(self.target)
+        self.assertEqual(report.removed, ["src/Test_Project/routing.py"])
+        self.assertFalse(os.path.exists(self.path("routing.py")))
+
+    def test_modified_by_hand(self, install, requirements):
+        with open(self.path("settings.py"), "a") as file:
+            file.write("\nDEBUG = True\n")
+        state = SetupProjectState(name="Test Project", libraries=["celery", "django-filter"])
+        report = state.update_project(self.target)
+        self.assertEqual(report.modified, ["src/Test_Project/settings.py"])
+        # Edited file stays flagged on the next run
+        self.assertEqual(state.update_project(self.target).modified, ["src/Test_Project/settings.py"])
+
+        report = state.update_project(self.target, force=True)
+        self.assertEqual(report.updated, ["src/Test_Project/settings.py"])
+        with open(self.path("settings.py")) as file:
+            self.assertNotIn("DEBUG = True", file.read())
+
+    def start_generated_project(self, spec):
+        """
+        Writes setup.yaml and .env of `generate` and starts the project,
+        setup.yaml reads engine and backend names from .env
+        :return: config.py of the project and libraries that are installed
+        """
+        files = generate(spec)
+        for name in ("setup.yaml", ".env"):
+            with open(name, "wb") as file:
+                file.write(files[name])
+        # Each run reads .env like a new process
+        with patch.dict(os.environ, clear=True):
+            result = CliRunner(mix_stderr=False).invoke(start_project)
+            libraries = create_state(ProjectInitializer.get_yaml_config("setup.yaml")).get_installable_libs()
+        self.assertEqual(result.exit_code, 0, result.stderr)
+        with open(os.path.join("src", spec["name"], "config.py")) as file:
+            return file.read(), libraries
+
+    def assert_up_to_date(self, config, name):
+        with patch.dict(os.environ, clear=True):
+            result = CliRunner(mix_stderr=False).invoke(start_project, ["--update"])
+        self.assertEqual(result.exit_code, 0, result.stderr)
+        self.assertIn(LOG_PROJECT_UP_TO_DATE, result.output + result.stderr)
+        with open(os.path.join("src", name, "config.py")) as file:
+            self.assertEqual(file.read(), config)
+
+    def test_generated_database_update(self, install, requirements):
+        with CliRunner().isolated_filesystem(temp_dir=self.target):
+            config, libraries = self.start_generated_project(
+                {"name": "Pool", "database": {"engine": "postgresql", "name": "pool", "performance": {"pool": True}}})
+            self.assertIn("$DATABASE_ENGINE", open("setup.yaml").read())
+            self.assertIn("'CONN_HEALTH_CHECKS' : _env_bool('DATABASE_CONN_HEALTH_CHECKS', True),", config)
+            self.assertIn("'OPTIONS' : {'pool': {'min_size': _env_int('DATABASE_POOL_MIN_SIZE', 2), ", config)
+            self.assertIn("psycopg[binary,pool]", libraries)
+            # Engine defaults and pool options are kept by an update of the unchanged project
+            self.assert_up_to_date(config, "Pool")
+        install.assert_called_once()
+
+    def test_generated_cache_update(self, install, requirements):
+        with CliRunner().isolated_filesystem(temp_dir=self.target):
+            config, libraries = self.start_generated_project(
+                {"name": "Shop", "cache": {"backend": "redis", "location": "localhost"},
+                 "caches": [{"alias": "sessions", "backend": "pymemcache"}]})
+            self.assertIn("$CACHE_BACKEND", open("setup.yaml").read())
+            self.assertIn("'OPTIONS' : {'pool_class': 'redis.BlockingConnectionPool', 'max_connections': 50},",
+                          config)
+            self.assertIn("'OPTIONS' : {'use_pooling': True, 'max_pool_size': 10, 'no_delay': True},", config)
+            self.assertIn("redis", libraries)
+            self.assertIn("pymemcache", libraries)
+            # Backend OPTIONS are kept by an update of the unchanged project
+            self.assert_up_to_date(config, "Shop")
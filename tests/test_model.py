@@ -1,7 +1,9 @@
 import os.path
 
+from django_cli.api import generate
 from django_cli.setup_project.model import DBConfig, CacheConfig, SetupProjectState, SETUP_CONFIG_FILE, ENV_FILE
 from unittest import TestCase
+from unittest.mock import patch
 
 
 class DataStateTest(TestCase):
@@ -80,3 +82,89 @@ class DataStateTest(TestCase):
             self.assertEqual(env["CACHE_BACKEND"], self.project_config.cache.backend)
             self.assertIsNotNone(data)
 
+    def test_setup_yaml_has_no_private_data(self):
+        # Field hashes render config.py secrets, they must not leak into setup.yaml
+        self.project_config.get_field_hashes()
+        self.assertNotIn("PYTHON_ENV", self.project_config.get_setup_yaml())
+        self.assertNotIn(b"PYTHON_ENV", generate(self.PROJECT_CONFIG)["setup.yaml"])
+
+    def test_database_performance(self):
+        with patch.dict(os.environ, {"POOL_SIZE": "20"}):
+            db_config = DBConfig(**self.DB_CONFIG, performance={"pool": "y", "pool_max_size": "$POOL_SIZE",
+                                                                "conn_health_checks": ""})
+        self.assertEqual(db_config.performance.get_dict(), {"pool": True, "pool_max_size": 20})
+        self.assertEqual(db_config.get_env_settings(), {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": True,
+                                                        "DISABLE_SERVER_SIDE_CURSORS": False,
+                                                        "POOL_MIN_SIZE": 2, "POOL_MAX_SIZE": 20})
+        state = SetupProjectState(name="Pool", database=db_config, required=[])
+        self.assertIn("psycopg[binary,pool]", state.get_installable_libs())
+        self.assertNotIn("psycopg2-binary", state.get_installable_libs())
+
+        files = generate({"name": "Pool", "database": {**self.DB_CONFIG, "performance": {"pool": True}}})
+        config = files["src/Pool/config.py"].decode()
+        self.assertIn("'CONN_MAX_AGE' : _env_int('DATABASE_CONN_MAX_AGE', 0),", config)
+        self.assertIn("'OPTIONS' : {'CONFIG': 'CONFIG', 'pool': {'min_size': _env_int('DATABASE_POOL_MIN_SIZE', 2), "
+                      "'max_size': _env_int('DATABASE_POOL_MAX_SIZE', 10)}},", config)
+        self.assertIn(b"DATABASE_POOL_MAX_SIZE=10\n", files[".env"])
+        self.assertIn(b"  performance:\n    pool: true\n", files["setup.yaml"])
+
+        # Engine defaults, sqlite has no server side cursors and pool
+        files = generate({"name": "Default"})
+        self.assertIn(b"DATABASE_CONN_MAX_AGE=0\nDATABASE_CONN_HEALTH_CHECKS=False\n", files[".env"])
+        self.assertNotIn(b"DISABLE_SERVER_SIDE_CURSORS", files["src/Default/config.py"])
+
+    def test_replicas(self):
+        files = generate({"name": "Shop", "database": self.DB_CONFIG,
+                          "replicas": [{"host": "replica-1"}, {"host": "replica-2", "weight": 2}]})
+        setup_yaml = files["setup.yaml"].decode()
+        self.assertIn("replicas:\n- engine: $REPLICA_1_ENGINE\n", setup_yaml)
+        self.assertIn("  host: $REPLICA_2_HOST\n", setup_yaml)
+        self.assertIn("  weight: 2\n", setup_yaml)
+        env = files[".env"].decode()
+        self.assertIn("REPLICA_1_HOST=replica-1\nREPLICA_1_PORT=5432\n", env)
+        self.assertIn("REPLICA_2_CONN_MAX_AGE=60\n", env)
+        self.assertNotIn("WEIGHT", env)
+
+        config = files["src/Shop/config.py"].decode()
+        self.assertIn("REPLICA_2_CONFIG={\n'ENGINE' : _env_path('REPLICA_2_ENGINE'),\n", config)
+        self.assertIn("'OPTIONS' : {'CONFIG': 'CONFIG'},\n'TEST' : {'MIRROR': 'default'},\n}", config)
+        settings = files["src/Shop/settings.py"].decode()
+        self.assertIn("    'replica_2': REPLICA_2_CONFIG,\n}", settings)
+        self.assertIn("DATABASE_ROUTERS = ['Shop.routers.ReplicaRouter']", settings)
+
+        namespace = {}
+        exec(files["src/Shop/routers.py"].decode(), namespace)
+        self.assertEqual(namespace["REPLICAS"], {"replica_1": 1, "replica_2": 2})
+        router = namespace["ReplicaRouter"]()
+        self.assertEqual([router.db_for_read(None) for _ in range(6)], ["replica_2", "replica_1", "replica_2"] * 2)
+        self.assertEqual(router.db_for_write(None), "default")
+        self.assertFalse(router.allow_migrate("replica_1", "auth"))
+
+        files = generate({"name": "Shop"})
+        self.assertNotIn("src/Shop/routers.py", files)
+        self.assertNotIn(b"DATABASE_ROUTERS", files["src/Shop/settings.py"])
+
+    def test_caches(self):
+        files = generate({"name": "Shop", "cached_templates": True,
+                          "cache": {**self.CACHE_CONFIG, "key_prefix": "shop", "timeout": "120", "middleware": "y"},
+                          "caches": [{"alias": "sessions", "backend": "pymemcache", "sessions": True,
+                                      "option": {"max_pool_size": 4}}]})
+        self.assertIn(b"CACHE_SESSIONS_BACKEND=pymemcache\nCACHE_SESSIONS_LOCATION=localhost\n", files[".env"])
+        self.assertIn(b"- alias: sessions\n  backend: $CACHE_SESSIONS_BACKEND\n", files["setup.yaml"])
+        config = files["src/Shop/config.py"].decode()
+        self.assertIn("'KEY_PREFIX' : 'shop',\n'TIMEOUT' : 120,\n'OPTIONS' : {'pool_class': "
+                      "'redis.BlockingConnectionPool', 'max_connections': 50},\n}", config)
+        self.assertIn("CACHE_SESSIONS_CONFIG={\n'BACKEND' : _env_path('CACHE_SESSIONS_BACKEND'),", config)
+        self.assertIn("'OPTIONS' : {'use_pooling': True, 'max_pool_size': 4, 'no_delay': True},", config)
+
+        settings = files["src/Shop/settings.py"].decode()
+        self.assertIn("CACHES = {\n    'default': CACHE_CONFIG,\n    'sessions': CACHE_SESSIONS_CONFIG,\n}", settings)
+        self.assertIn("SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'\nSESSION_CACHE_ALIAS = 'sessions'",
+                      settings)
+        self.assertIn("CACHE_MIDDLEWARE_ALIAS = 'default'\nCACHE_MIDDLEWARE_SECONDS = 120", settings)
+        self.assertIn("'django.template.loaders.cached.Loader'", settings)
+        self.assertNotIn("CACHE = ", settings)
+
+        settings = generate({"name": "Shop"})["src/Shop/settings.py"].decode()
+        self.assertNotIn("CACHES", settings)
+        self.assertNotIn("loaders", settings)
@@ -0,0 +1,59 @@
+import json
+import os
+import pstats
+import sys
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from django_cli.cli import cli
+from django_cli.core.profiler import start_profiling, stop_profiling, span, COMMAND, STEP, SUBPROCESS, HOOK
+from django_cli.core.scheduler import Scheduler, Step
+from django_cli.setup_project.model import SetupProjectState
+from django_cli.utils import execute
+
+
+class ProfilerTest(TestCase):
+
+    def tearDown(self) -> None:
+        stop_profiling("test")
+
+    def test_spans(self):
+        with span("not profiled", STEP) as item:
+            item.args["ignored"] = True
+        profiler = start_profiling()
+        Scheduler([Step("sleep", lambda: execute([sys.executable, "-c", "pass"], echo=False), title="Sleep")]).run()
+        stop_profiling("test")
+        categories = [(item.name.split(" ")[0], item.category) for item in profiler.sorted_spans()]
+        self.assertEqual(categories, [("test", COMMAND), ("Sleep", STEP), (sys.executable, SUBPROCESS)])
+        subprocess_span = profiler.sorted_spans()[2]
+        self.assertEqual(subprocess_span.args, {"returncode": 0})
+        self.assertIn("Sleep", profiler.table())
+
+        events = profiler.trace_events()["traceEvents"]
+        self.assertEqual(len([event for event in events if event["ph"] == "X"]), 3)
+        self.assertTrue(all(event["dur"] >= 0 for event in events if event["ph"] == "X"))
+
+    @patch.object(SetupProjectState, "create_requirements_file")
+    @patch.object(SetupProjectState, "install_libraries", return_value=True)
+    def test_cli(self, install, requirements):
+        runner = CliRunner(mix_stderr=False)
+        with runner.isolated_filesystem(), tempfile.TemporaryDirectory() as directory:
+            with open("setup.yaml", "w") as file:
+                file.write("name: Profiled\nlibraries:\n- celery\n")
+            trace = os.path.join(directory, "trace.json")
+            stats = os.path.join(directory, "profile.pstats")
+            result = runner.invoke(cli, ["--profile-trace", trace, "--profile-stats", stats, "startproject"])
+            self.assertEqual(result.exit_code, 0, result.stderr)
+            self.assertIn("Rendering Project Files", result.stderr)
+            self.assertIn("ProjectInitializer.enquire", result.stderr)
+
+            with open(trace) as file:
+                events = json.load(file)["traceEvents"]
+            categories = {event["cat"] for event in events if event["ph"] == "X"}
+            self.assertEqual(categories, {COMMAND, HOOK, STEP})
+            self.assertIn("startproject", [event["name"] for event in events])
+            if sys.version_info < (3, 12):
+                self.assertGreater(pstats.Stats(stats).total_calls, 0)
@@ -0,0 +1,81 @@
+from unittest import TestCase
+
+from django_cli.config import CHANNELS, CHANNELS_REDIS, CORSHEADER, DJANGO_REST_FRAMEWORK, POSTGRES
+from django_cli.setup_project.handler import create_state, ConfigError
+from django_cli.setup_project.model import SetupProjectState
+from django_cli.setup_project.resolver import LibraryResolver, LibraryCycleError
+
+LINKS = {
+    "a": ["b", "c"],
+    "b": "d",
+    "c": ["d", "e"],
+    "e": "f",
+}
+
+
+class ResolverTest(TestCase):
+
+    def test_transitive_closure(self):
+        resolver = LibraryResolver(links=LINKS, drivers={}, known=[])
+        self.assertEqual(resolver.closure("a"), ("a", "b", "d", "c", "e", "f"))
+        self.assertEqual(resolver.resolve(("x", "e", "a"), None).libraries, ("x", "e", "f", "a", "b", "d", "c"))
+
+    def test_cycle(self):
+        with self.assertRaises(LibraryCycleError) as context:
+            LibraryResolver(links={"a": "b", "b": ["c"], "c": "a"}, drivers={}, known=["a"])
+        self.assertIn("a -> b -> c -> a", str(context.exception))
+
+    def test_contributions(self):
+        resolver = LibraryResolver(links=LINKS, drivers={"db": "driver"}, known=[],
+                                   installed_apps={"f": "'f'", "driver": "'driver'", "b": "'b'"},
+                                   middlewares={"d": "'d.Middleware'"}, extra={}, linked_files={})
+        resolution = resolver.resolve(("a",), "db")
+        self.assertEqual(resolution.driver, "driver")
+        self.assertEqual(resolution.installable[-1], "driver")
+        self.assertEqual(resolution.installed_apps, ("'b'", "'f'", "'driver'"))
+        self.assertEqual(resolution.middlewares, ("'d.Middleware'",))
+        self.assertIs(resolver.resolve(("a",), "db"), resolution)
+
+    def test_state_libraries(self):
+        state = SetupProjectState(name="Test", libraries=[DJANGO_REST_FRAMEWORK, CHANNELS], required=[])
+        self.assertEqual(state.get_all_libs(), [DJANGO_REST_FRAMEWORK, CORSHEADER, CHANNELS, CHANNELS_REDIS])
+        # Resolving does not grow the libraries
+        state.get_all_libs()
+        self.assertEqual(state.libraries, [DJANGO_REST_FRAMEWORK, CHANNELS])
+        self.assertIn("corsheaders.middleware.CorsMiddleware", state.get_middlewares())
+        self.assertNotIn("_resolution", state.get_dict())
+
+        resolution = state.get_resolution()
+        self.assertIs(state.get_resolution(), resolution)
+        state.libraries.remove(CHANNELS)
+        self.assertEqual(state.get_all_libs(), [DJANGO_REST_FRAMEWORK, CORSHEADER])
+
+    def test_create_state(self):
+        state = create_state({"name": "Test", "libraries": [CHANNELS, DJANGO_REST_FRAMEWORK],
+                              "database": {"engine": POSTGRES}})
+        self.assertEqual(state.required, [CHANNELS_REDIS, CORSHEADER, "psycopg2-binary"])
+        self.assertEqual(state.get_installable_libs()[-1], "psycopg2-binary")
+
+        state = create_state({"name": "Test", "database": {"engine": POSTGRES, "performance": {"pool": True}}})
+        self.assertEqual(state.required, ["psycopg[binary,pool]"])
+        with self.assertRaises(ConfigError):
+            create_state({"name": "Test", "database": {"engine": POSTGRES, "performance": {"pool": True,
+                                                                                         "conn_max_age": 60}}},
+                         strict=True)
+
+        with self.assertRaises(ConfigError):
+            create_state({"name": "Test", "database": {"engine": POSTGRES}, "replicas": [{"engine": "mysql"}]},
+                         strict=True)
+        state = create_state({"name": "Test", "database": {"engine": POSTGRES, "host": "primary"},
+                              "replicas": [{"host": "replica"}]}, strict=True)
+        self.assertEqual((state.replicas[0].engine, state.replicas[0].host), (POSTGRES, "replica"))
+
+        state = create_state({"name": "Test", "cache": {"backend": "redis"},
+                              "caches": [{"alias": "pages", "backend": "pymemcache"}, {"alias": "local"}]})
+        self.assertEqual(state.required, ["redis", "pymemcache"])
+        self.assertEqual(state.caches[1].backend, "redis")
+        for config in ({"caches": [{"alias": "pages"}]},
+                       {"cache": {"backend": "redis"}, "caches": [{"alias": "default"}]},
+                       {"cache": {"backend": "redis", "sessions": True}, "caches": [{"alias": "a", "sessions": "y"}]}):
+            with self.assertRaises(ConfigError):
+                create_state({"name": "Test", **config}, strict=True)
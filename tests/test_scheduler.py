@@ -0,0 +1,85 @@
+import sys
+import threading
+import time
+from unittest import TestCase
+
+from django_cli.core.BaseCommand import TaskQueue
+from django_cli.core.scheduler import (Scheduler,
+                                       SchedulerError,
+                                       Step,
+                                       DONE,
+                                       FAILED,
+                                       SKIPPED,
+                                       CANCELLED)
+from django_cli.utils import execute, CommandError
+
+
+class SchedulerTest(TestCase):
+
+    def test_concurrent_steps(self):
+        events = []
+
+        def step(name, seconds=0.0):
+            def func():
+                events.append(f"start {name}")
+                time.sleep(seconds)
+                events.append(f"end {name}")
+                return name
+            return func
+
+        scheduler = Scheduler([
+            Step("requirements", step("requirements"), depends=["install"]),
+            Step("install", step("install", 0.4), depends=["render"]),
+            Step("render", step("render")),
+            Step("write", step("write", 0.4), depends=["render"]),
+        ])
+        start = time.perf_counter()
+        results = scheduler.run()
+        self.assertLess(time.perf_counter() - start, 0.75)
+        self.assertEqual(scheduler.order, ["render", "install", "requirements", "write"])
+        self.assertEqual(events[:2], ["start render", "end render"])
+        self.assertLess(events.index("end install"), events.index("start requirements"))
+        self.assertEqual({name: result.value for name, result in results.items()},
+                         {name: name for name in results})
+
+    def test_invalid_graph(self):
+        with self.assertRaises(SchedulerError):
+            Scheduler([Step("a", lambda: None, depends=["b"]), Step("b", lambda: None, depends=["a"])])
+        with self.assertRaises(SchedulerError):
+            Scheduler([Step("a", lambda: None, depends=["missing"])])
+        with self.assertRaises(SchedulerError):
+            Scheduler([Step("a", lambda: None), Step("a", lambda: None)])
+
+    def test_failure(self):
+        started = threading.Event()
+
+        def fail():
+            started.wait(5)
+            raise FileExistsError("src")
+
+        scheduler = Scheduler([
+            Step("render", fail),
+            Step("write", lambda: None, depends=["render"]),
+            Step("install", lambda: started.set() or execute([sys.executable, "-c", "import time; time.sleep(10)"],
+                                                                echo=False)),
+            Step("requirements", lambda: None, depends=["install"]),
+        ])
+        start = time.perf_counter()
+        with self.assertRaises(FileExistsError):
+            scheduler.run()
+        self.assertLess(time.perf_counter() - start, 5)
+        self.assertEqual({name: result.status for name, result in scheduler.results.items()},
+                         {"render": FAILED, "write": SKIPPED, "install": CANCELLED, "requirements": CANCELLED})
+        self.assertIsInstance(scheduler.results["install"].error, CommandError)
+
+    def test_without_fail_fast(self):
+        scheduler = Scheduler([Step("a", lambda: 1 / 0), Step("b", lambda: None, depends=["a"]),
+                               Step("c", lambda: None)], fail_fast=False, workers=1)
+        with self.assertRaises(ZeroDivisionError):
+            scheduler.run()
+        self.assertEqual([result.status for result in scheduler.results.values()], [FAILED, SKIPPED, DONE])
+
+    def test_task_queue(self):
+        calls = []
+        TaskQueue([lambda: calls.append(1), lambda: calls.append(2), lambda: calls.append(3)]).execute()
+        self.assertEqual(calls, [1, 2, 3])
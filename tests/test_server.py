@@ -0,0 +1,74 @@
+import os
+import socket
+import tarfile
+import io
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from django_cli.server import create_server, request, ServerError
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets are not available")
+class ServerTest(TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "server.sock")
+        self.server = create_server(self.path)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def test_files(self):
+        response = request({"name": "Served", "libraries": ["celery"]}, path=self.path, timeout=10)
+        self.assertTrue(response["ok"])
+        self.assertIn(b"'Served.settings'", response["files"]["src/manage.py"])
+
+    def test_archive(self):
+        response = request({"name": "Served"}, output="gz", path=self.path, timeout=10)
+        with tarfile.open(fileobj=io.BytesIO(response["archive"]), mode="r:gz") as archive:
+            self.assertIn("src/Served/settings.py", archive.getnames())
+
+    def test_errors(self):
+        self.assertFalse(request({"libraries": []}, path=self.path, timeout=10)["ok"])
+        self.assertFalse(request({"name": "Served"}, output="rar", path=self.path, timeout=10)["ok"])
+
+    def test_concurrent_requests(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(lambda i: request({"name": f"Served{i}"}, path=self.path, timeout=10),
+                                          range(16)))
+        for i, response in enumerate(responses):
+            self.assertIn(f"src/Served{i}/settings.py", response["files"])
+
+    def test_socket(self):
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+        # Running server keeps its socket
+        with self.assertRaisesRegex(ServerError, "already running"):
+            create_server(self.path)
+        self.assertTrue(request({"name": "Served"}, path=self.path, timeout=10)["ok"])
+
+        # Regular files are never removed
+        location = os.path.join(self.directory.name, "file.sock")
+        with open(location, "w") as file:
+            file.write("data")
+        with self.assertRaisesRegex(ServerError, "not a socket"):
+            create_server(location)
+        self.assertTrue(os.path.isfile(location))
+
+    def test_stale_socket(self):
+        location = os.path.join(self.directory.name, "stale.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(location)
+        stale.close()
+        server = create_server(location)
+        try:
+            self.assertTrue(os.path.exists(location))
+        finally:
+            server.server_close()
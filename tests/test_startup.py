@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+from click.testing import CliRunner
+
+# Cumulative import time budget of `django_cli.cli` in microseconds
+IMPORT_BUDGET_ENV = "DJANGO_CLI_IMPORT_BUDGET_US"
+IMPORT_BUDGET = 200000
+
+# Modules that must only be imported when a command runs
+LAZY_MODULES = [
+    "yaml",
+    "dotenv",
+    "packaging",
+    "tarfile",
+    "zipfile",
+    "concurrent.futures",
+    "socketserver",
+    "django_cli.utils",
+    "django_cli.core.filemap",
+    "django_cli.setup_project",
+    "django_cli.server",
+]
+
+
+def import_times(module):
+    """Returns cumulative import time of every module imported by `module`, using `-X importtime`"""
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class StartupTest(TestCase):
+
+    def test_lazy_imports(self):
+        times = import_times("django_cli.cli")
+        self.assertIn("django_cli.cli", times)
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, times, f"{module} is imported when the CLI starts")
+
+    def test_import_budget(self):
+        budget = int(os.environ.get(IMPORT_BUDGET_ENV, IMPORT_BUDGET))
+        # Best of three, the first run may pay for a cold disk cache
+        cumulative = min(import_times("django_cli.cli")["django_cli.cli"] for _ in range(3))
+        self.assertLess(cumulative, budget, f"django_cli.cli took {cumulative}us to import")
+
+    def test_help(self):
+        from django_cli.cli import cli
+        result = CliRunner().invoke(cli, ["--help"])
+        self.assertEqual(result.exit_code, 0)
+        for command in ["generate", "startproject", "batch", "serve", "client", "install", "wheelhouse"]:
+            self.assertIn(command, result.output)
@@ -0,0 +1,25 @@
+from unittest import TestCase
+
+from django_cli.core.template import compile_source, compile_template, compile_all, TemplateError
+
+
+class TemplateTest(TestCase):
+
+    def test_compile_all(self):
+        templates = compile_all()
+        self.assertIn("settings.template", templates)
+        self.assertIn("PROJECT_NAME", templates["settings.template"].variables)
+        # Compiled once, cached afterwards
+        self.assertIs(templates["settings.template"], compile_template("settings.template"))
+
+    def test_render(self):
+        template = compile_source("test", "$PROJECT_NAME.settings *$py.class $EXTRA $CACHE")
+        rendered = template.render({"PROJECT_NAME": "app", "EXTRA": "$PROJECT_NAME"})
+        # Substituted values are not scanned again, missing values are kept
+        self.assertEqual(rendered, "app.settings *$py.class $PROJECT_NAME $CACHE")
+
+    def test_unknown_placeholder(self):
+        with self.assertRaises(TemplateError):
+            compile_source("test", "$PROJECT_NAME $UNKNOWN")
+        with self.assertRaises(TemplateError):
+            compile_template("missing.template")
@@ -0,0 +1,43 @@
+import sys
+from unittest import TestCase
+
+from django_cli.utils import execute, execute_many, CommandError
+
+SCRIPT = "import sys; print('out'); print('err', file=sys.stderr); sys.exit({})"
+
+
+class ExecuteTest(TestCase):
+
+    def test_execute(self):
+        result = execute([sys.executable, "-c", SCRIPT.format(0)], echo=False)
+        self.assertTrue(result.ok)
+        self.assertEqual(result.stdout, ["out"])
+        self.assertEqual(result.stderr, ["err"])
+
+    def test_return_code(self):
+        result = execute([sys.executable, "-c", SCRIPT.format(3)], echo=False)
+        self.assertEqual(result.returncode, 3)
+        with self.assertRaises(CommandError) as context:
+            execute([sys.executable, "-c", SCRIPT.format(3)], echo=False, check=True)
+        self.assertEqual(context.exception.result.returncode, 3)
+
+    def test_timeout(self):
+        with self.assertRaises(CommandError):
+            execute([sys.executable, "-c", "import time; time.sleep(10)"], timeout=0.2, echo=False)
+
+    def test_missing_executable(self):
+        with self.assertRaises(CommandError):
+            execute(["django-cli-command-that-does-not-exist"], echo=False)
+
+    def test_execute_many(self):
+        commands = [[sys.executable, "-c", f"print({i})"] for i in range(6)]
+        results = execute_many(commands, workers=3, echo=False)
+        self.assertEqual([result.stdout for result in results], [[str(i)] for i in range(6)])
+
+        # Failures are returned with the results of the other commands
+        commands = [["django-cli-command-that-does-not-exist"], [sys.executable, "-c", "import time; time.sleep(10)"],
+                    [sys.executable, "-c", "print('done')"]]
+        results = execute_many(commands, workers=3, echo=False, timeout=0.5)
+        self.assertEqual([result.ok for result in results], [False, False, True])
+        self.assertIn("Unable to execute", results[0].stderr[-1])
+        self.assertEqual(results[2].stdout, ["done"])
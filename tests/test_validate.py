@@ -0,0 +1,125 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from click.testing import CliRunner
+
+from django_cli.cli import validate
+from django_cli.setup_project.validate import validate_config, validate_paths, compile_schema
+from django_cli.setup_project.model import SetupProjectState
+
+VALID = """name: Billing
+libraries:
+- djangorestframework
+database:
+  engine: postgresql
+  user: $DATABASE_USER
+  port: 5432
+cache:
+  backend: redis
+  location: localhost:6379
+"""
+
+INVALID = """name: Chat
+media: false
+libraries:
+- django-rest-framework
+- 3
+database:
+  engine: postgres
+cache:
+  backend: memcache
+env:
+  DEBUG: true
+---
+description: project without a name
+"""
+
+
+def fields(issues):
+    return [issue.field for issue in issues]
+
+
+class ValidateTest(TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.directory.name, "services", "nested"))
+        for index in range(6):
+            with open(os.path.join(self.directory.name, "services", f"service_{index}.yaml"), "w") as file:
+                file.write(VALID.replace("Billing", f"Service {index}"))
+        self.invalid = os.path.join(self.directory.name, "services", "nested", "chat.yml")
+        with open(self.invalid, "w") as file:
+            file.write(INVALID)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_schema(self):
+        schema = compile_schema(SetupProjectState)
+        self.assertTrue(schema["name"].required)
+        self.assertTrue(schema["database"].schema["engine"].required)
+        self.assertIn("postgresql", schema["database"].schema["engine"].choices)
+        self.assertIs(compile_schema(SetupProjectState), schema)
+
+    def test_validate_config(self):
+        result = validate_config({"name": "Test", "database": {"engine": "$DATABASE_ENGINE"}})
+        self.assertTrue(result.ok)
+        self.assertEqual(result.warnings, [])
+
+        result = validate_config({"name": "Test", "database": {"name": "db"}, "static": "yes"})
+        self.assertEqual(fields(result.errors), ["database.engine", "static"])
+
+        result = validate_config({"name": "../Test"})
+        self.assertEqual(fields(result.errors), ["name"])
+
+        result = validate_config({"name": "Test", "database": {"engine": "mysql", "performance": {
+            "conn_max_age": 60, "pool": True, "pool_max_size": "10"}}})
+        self.assertEqual(fields(result.errors), ["database.performance.pool_max_size",
+                                                 "database.performance.conn_max_age"])
+        self.assertEqual(fields(result.warnings), ["database.performance.pool", "database.performance.pool_max_size"])
+
+        result = validate_config({"name": "Test", "database": {"engine": "postgresql"}, "replicas": [
+            {"host": "replica", "weight": 0}, {"engine": "mysql", "port": []}, "replica",
+            {"performance": {"pool": True, "conn_max_age": 60}}]})
+        self.assertEqual(fields(result.errors), ["replicas[1].port", "replicas[2]", "replicas[0].weight",
+                                                 "replicas[1].engine", "replicas[3].performance.conn_max_age"])
+
+        # Numbers and flags read from the environment
+        result = validate_config({"name": "Test", "database": {"engine": "postgresql", "performance": {
+            "pool": "$POOL", "pool_max_size": "$POOL_SIZE", "conn_max_age": "$CONN_MAX_AGE"}},
+                                  "replicas": [{"host": "replica", "weight": "$WEIGHT"}]})
+        self.assertTrue(result.ok, result.errors)
+
+        result = validate_config({"name": "Test", "cache": {"backend": "redis", "middleware": True, "timeout": "1"},
+                                  "caches": [{"alias": "default"}, {"backend": "redis"},
+                                             {"alias": "a", "middleware": True}, {"alias": "A"}]})
+        self.assertEqual(fields(result.errors), ["cache.timeout", "caches[1].alias", "caches[0].alias",
+                                                 "caches[3].alias", "caches"])
+
+        result = validate_config({"name": "Test", "cache": {"backend": "$CACHE_BACKEND", "timeout": "$TIMEOUT",
+                                                            "sessions": "$SESSIONS"},
+                                  "caches": [{"alias": "pages", "timeout": "$PAGES_TIMEOUT"}]})
+        self.assertTrue(result.ok, result.errors)
+
+    def test_validate_paths(self):
+        results = validate_paths([os.path.join(self.directory.name, "services")], workers=2)
+        self.assertEqual(len(results), 8)
+        invalid = [result for result in results if not result.ok]
+        self.assertEqual([result.source for result in invalid], [f"{self.invalid}#1", f"{self.invalid}#2"])
+        self.assertEqual(fields(invalid[0].errors), ["libraries[1]", "database.engine", "cache.backend", "env.DEBUG"])
+        self.assertEqual(fields(invalid[0].warnings), ["media", "libraries[0]"])
+        self.assertIn("postgresql", invalid[0].errors[1].message)
+        self.assertEqual(fields(invalid[1].errors), ["name"])
+
+    def test_cli(self):
+        runner = CliRunner(mix_stderr=False)
+        result = runner.invoke(validate, ["--format", "json", os.path.join(self.directory.name, "services")])
+        self.assertEqual(result.exit_code, 1)
+        report = json.loads(result.stdout)
+        self.assertFalse(report["ok"])
+        self.assertEqual((report["specs"], report["invalid"]), (8, 2))
+
+        valid = os.path.join(self.directory.name, "services", "service_0.yaml")
+        self.assertEqual(runner.invoke(validate, ["--workers", "1", valid]).exit_code, 0)
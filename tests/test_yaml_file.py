@@ -0,0 +1,63 @@
+import datetime
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import yaml
+
+from django_cli.const import CONFIG_CACHE_ENV
+from django_cli.core import yaml_file
+from django_cli.core.yaml_file import load_config_file, dump, SafeLoader, SafeDumper
+
+SPEC = "NAME: Cached\nLibraries:\n- celery\n---\nname: Second\n"
+
+
+class YamlFileTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = os.path.join(self.directory, "cache")
+        self.spec = os.path.join(self.directory, "spec.yaml")
+        with open(self.spec, "w") as file:
+            file.write(SPEC)
+        environ = patch.dict(os.environ, {CONFIG_CACHE_ENV: self.cache})
+        environ.start()
+        self.addCleanup(environ.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_libyaml(self):
+        if yaml.__with_libyaml__:
+            self.assertIs(SafeLoader, yaml.CSafeLoader)
+            self.assertIs(SafeDumper, yaml.CSafeDumper)
+        data = {"name": "Test", "libraries": ["celery"], "database": {"engine": "sqlite3"}}
+        self.assertTrue(dump(data).startswith("name: Test\n"))
+        self.assertEqual(yaml.safe_load(dump(data)), data)
+
+    def test_cache(self):
+        documents = load_config_file(self.spec)
+        self.assertEqual(documents, [{"name": "Cached", "libraries": ["celery"]}, {"name": "Second"}])
+        self.assertEqual(len(os.listdir(self.cache)), 1)
+        with patch.object(yaml_file.yaml, "load_all") as load_all:
+            self.assertEqual(load_config_file(self.spec), documents)
+            # Same content with a new modification time is served from cache
+            os.utime(self.spec, ns=(0, 0))
+            self.assertEqual(load_config_file(self.spec), documents)
+            load_all.assert_not_called()
+
+    def test_invalidation(self):
+        load_config_file(self.spec)
+        with open(self.spec, "w") as file:
+            file.write("name: Changed\n")
+        self.assertEqual(load_config_file(self.spec), [{"name": "Changed"}])
+
+    def test_not_cached(self):
+        with open(self.spec, "w") as file:
+            file.write("name: Dated\ncreated: 2021-01-01\n")
+        self.assertEqual(load_config_file(self.spec), [{"name": "Dated", "created": datetime.date(2021, 1, 1)}])
+        self.assertFalse(os.path.exists(self.cache) and os.listdir(self.cache))
+        with patch.dict(os.environ, {CONFIG_CACHE_ENV: ""}):
+            self.assertEqual(load_config_file(self.spec)[0]["name"], "Dated")